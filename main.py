@@ -1,12 +1,30 @@
 import os
 import sys
 import time
+import argparse
+import shutil
 import subprocess
 import re 
 import matplotlib.colors as mcolors
-from simulator.parser import carregar_configuracao_arquivo, carregar_plugins
-from simulator.gantt import gerar_imagem_gantt
+from simulator.parser import carregar_configuracao_arquivo, carregar_plugins_detalhado
+from simulator.plugins import formatar_relatorio_plugins
+from simulator.gantt import gerar_imagem_gantt, gerar_imagem_comparativa
+from simulator.comparacao import comparar_algoritmos, formatar_relatorio
+from simulator.montecarlo import analisar_sementes, formatar_montecarlo, AMOSTRAS_PADRAO
 from simulator.core import TCB
+from simulator.depurador import VisaoDepurador
+from simulator.checkpoint import GerenciadorCheckpoint
+from simulator.incremental import HistoricoIncremental
+from simulator.registros import criar_destinos_log, DestinoJSONL
+from simulator.fluxo import carregar_fluxo
+from simulator.cache import CacheResultados, chave_simulacao
+from simulator.metricas import calcular_metricas, extrair_intervalos, formatar_metricas
+from simulator.analise_logs import analisar_logs, exportar_tabelas, formatar_analise
+from simulator.vetorizado import motivo_inelegivel, simular_simulador, LIMITE_TICKS_GANTT
+from simulator.escala import verificar_escala, formatar_escala, TAMANHOS_PADRAO
+
+# Semente do desempate passada por linha de comando (--semente); sobrepõe a do config
+SEMENTE_CLI = None
 
 # --- Funções Auxiliares de UI ---
 
@@ -29,15 +47,18 @@ def exibir_menu(arquivo_carregado, qtd_plugins):
     print("  [3] Executar Simulação (Modo Passo-a-Passo)")
     print("  [4] Editar Arquivo de Configuração (Nano)")
     print("  [5] Carregar Plugins Externos (pasta /extensions)")
-    print("  [6] Sair")
+    print("  [6] Retomar Simulação Interrompida (Checkpoint)")
+    print("  [7] Comparar Todos os Algoritmos")
+    print("  [8] Análise Monte Carlo (Várias Sementes)")
+    print("  [9] Sair")
     print("-" * 60)
 
-def exibir_debugger(simulador):
+def exibir_debugger(simulador, visao):
     limpar_tela()
     print("="*60)
     print(f"MODO DEBUGGER (PASSO-A-PASSO) - {simulador.escalonador.__class__.__name__}")
     print("="*60)
-    print(simulador.get_debug_info())
+    print(visao.renderizar(simulador))
     print("\n" + "="*60)
 
 def pausar_e_continuar():
@@ -50,7 +71,7 @@ def carregar_novo_arquivo(plugins_ativos):
     if not os.path.exists(arquivo):
         print(f"\nErro: Arquivo '{arquivo}' não encontrado.")
         return None
-    simulador_teste = carregar_configuracao_arquivo(arquivo, plugins_ativos)
+    simulador_teste = carregar_configuracao_arquivo(arquivo, plugins_ativos, SEMENTE_CLI)
     if simulador_teste is None:
         print("\nErro: Falha ao processar o arquivo.")
         return None
@@ -67,7 +88,7 @@ def editar_arquivo_config(arquivo_atual, plugins_ativos):
         print(f"\nEdição de '{arquivo_alvo}' concluída.")
         if os.path.exists(arquivo_alvo):
             print("Validando alterações...")
-            sim = carregar_configuracao_arquivo(arquivo_alvo, plugins_ativos)
+            sim = carregar_configuracao_arquivo(arquivo_alvo, plugins_ativos, SEMENTE_CLI)
             if sim:
                 print("Arquivo válido! Carregado automaticamente.")
                 return arquivo_alvo
@@ -78,63 +99,323 @@ def editar_arquivo_config(arquivo_atual, plugins_ativos):
         print(f"Erro ao abrir editor: {e}")
         return arquivo_atual
 
+def _diretorio_checkpoint(arquivo_config):
+    return f"{arquivo_config}.checkpoint"
+
+def _diretorio_logs(arquivo_config):
+    return f"{arquivo_config}.logs"
+
+def _diretorio_incremental(arquivo_config):
+    return f"{arquivo_config}.incremental"
+
+def _configurar_destinos_log(simulador, arquivo_config, retomar=False):
+    """Com LOG=CSV/JSONL/BINARIO no config, os logs vão para arquivos em vez de ficar em memória."""
+    if simulador.formato_log == 'MEMORIA' or simulador.so_metricas: return
+    diretorio = _diretorio_logs(arquivo_config)
+    simulador.usar_destinos_log(criar_destinos_log(simulador.formato_log, diretorio, retomar,
+                                                   tamanho_max=simulador.tamanho_max_log))
+    print(f"Logs em '{diretorio}' (formato {simulador.formato_log}).")
+
+def _simular_com_checkpoint(simulador, gerenciador, historico=None):
+    """Roda até o fim gravando checkpoints periódicos. Retorna False se interrompida."""
+    try:
+        while not simulador.terminou():
+            simulador.tick()
+            gerenciador.verificar(simulador)
+            if historico: historico.verificar(simulador)
+            if simulador.relogio_global % 50 == 0:
+                print(f"  ... simulando tick {simulador.relogio_global}", end='\r')
+    except KeyboardInterrupt:
+        # O estado pode estar no meio de um tick: vale o último checkpoint periódico
+        print("\nSimulação interrompida. Use a opção [6] para retomar do último checkpoint.")
+        return False
+    return True
+
+def _finalizar_simulacao(simulador, nome_saida, tempo_total, chave_cache, metricas=None, intervalos=None):
+    if metricas is None:
+        metricas = calcular_metricas(simulador)
+    if intervalos is None:
+        intervalos = extrair_intervalos(simulador.gantt_log)
+    print("\n" + "="*60)
+    print("Simulação concluída.")
+    print(f"Tempo total: {tempo_total:.4f}s. Tick Final: {simulador.relogio_global - 1}. Semente: {simulador.semente}")
+    print(formatar_metricas(metricas))
+    analise = analisar_logs(simulador) if simulador.gantt_log else None
+    if analise:
+        print("-"*60)
+        print(formatar_analise(analise))
+    print("="*60)
+    if analise:
+        diretorio = f"{os.path.splitext(nome_saida)[0]}_analise"
+        exportar_tabelas(analise, diretorio)
+        print(f"Tabelas da análise (estados, janelas, mutex) em '{diretorio}'.")
+
+    if not simulador.gantt_log:
+        if simulador.so_metricas:
+            print("Gráfico não gerado: REGISTRO=METRICAS guarda só os contadores.")
+        else:
+            print(f"Gráfico não gerado: a linha do tempo passa de {LIMITE_TICKS_GANTT} ticks.")
+        CacheResultados().guardar(chave_cache, metricas, intervalos)
+        return
+
+    try:
+        print(f"Gerando gráfico em '{nome_saida}'...")
+        gerar_imagem_gantt(
+            simulador.gantt_log,
+            simulador.tarefas,
+            nome_saida,
+            simulador.nome_algoritmo_config,
+            simulador.bloqueio_log,
+            simulador.mutex_event_log,
+            simulador.io_log,
+            simulador.semente
+        )
+        print(f"Gráfico salvo com sucesso.")
+    except Exception as e:
+        print(f"Erro crítico ao gerar o gráfico: {e}", file=sys.stderr)
+        return
+
+    if os.path.exists(nome_saida):
+        CacheResultados().guardar(chave_cache, metricas, intervalos, nome_saida)
+
+def _simular_vetorizado(simulador, nome_saida, chave_cache):
+    """Carga sem E/S e sem mutex: calcula a linha do tempo inteira com NumPy, sem ticks."""
+    print("Carga sem ações: usando o motor vetorizado (NumPy).")
+    start_time = time.time()
+    resultado = simular_simulador(simulador)
+    resultado.aplicar(simulador, com_gantt=not simulador.so_metricas and resultado.makespan <= LIMITE_TICKS_GANTT)
+    metricas = resultado.metricas()
+    intervalos = resultado.intervalos()
+    _finalizar_simulacao(simulador, nome_saida, time.time() - start_time, chave_cache, metricas, intervalos)
+
+def _usar_resultado_em_cache(chave_cache, nome_saida):
+    """Se a mesma simulação já foi feita, copia a imagem e mostra as métricas salvas."""
+    start_time = time.time()
+    resultado = CacheResultados().buscar(chave_cache)
+    if resultado is None: return False
+    if resultado['imagem']:
+        shutil.copyfile(resultado['imagem'], nome_saida)
+    print("\n" + "="*60)
+    print(f"Resultado recuperado do cache em {time.time() - start_time:.4f}s.")
+    print(formatar_metricas(resultado['metricas']))
+    print("="*60)
+    if resultado['imagem']:
+        print(f"Gráfico salvo em '{nome_saida}'.")
+    return True
+
 def rodar_modo_completo(arquivo_config, plugins_ativos):
     print(f"Iniciando simulação (Modo Completo) de '{arquivo_config}'...")
     
-    simulador = carregar_configuracao_arquivo(arquivo_config, plugins_ativos)
+    simulador = carregar_configuracao_arquivo(arquivo_config, plugins_ativos, SEMENTE_CLI)
     if simulador is None:
         print("Erro fatal: Falha ao recarregar o simulador.")
         return
+    simulador.semear_random_global()
 
     nome_saida = input("Digite o nome do arquivo de imagem de saída (ex: gantt.png): ").strip()
     if not nome_saida:
         nome_saida = "gantt_resultado.png"
+
+    # Ninguém volta no tempo no Modo Completo: sem keyframes (a menos que o config peça só métricas)
+    if simulador.nivel_registro == 'COMPLETO':
+        simulador.definir_nivel_registro('LINHA_DO_TEMPO')
+    chave_cache = chave_simulacao(simulador)
+    if _usar_resultado_em_cache(chave_cache, nome_saida):
+        return
+
+    if motivo_inelegivel(simulador) is None:
+        _simular_vetorizado(simulador, nome_saida, chave_cache)
+        return
     
+    gerenciador = GerenciadorCheckpoint(_diretorio_checkpoint(arquivo_config), arquivo_config)
+    gerenciador.iniciar()
+    historico = HistoricoIncremental(_diretorio_incremental(arquivo_config))
+    # Com um histórico da execução anterior, os logs em arquivo são reabertos para reaproveitar o prefixo
+    _configurar_destinos_log(simulador, arquivo_config, retomar=historico.existe())
+
     start_time = time.time()
-    
-    while not simulador.terminou():
-        simulador.tick()
-        if simulador.relogio_global % 50 == 0:
-            print(f"  ... simulando tick {simulador.relogio_global}", end='\r')
+    try:
+        tick_inicial = historico.preparar(simulador)
+        if tick_inicial:
+            print(f"Edição afeta a partir do tick {historico.divergencia}: "
+                  f"retomando a execução anterior no tick {tick_inicial}.")
+        if not _simular_com_checkpoint(simulador, gerenciador, historico):
+            return
+        end_time = time.time()
+        gerenciador.limpar()
+        historico.concluir(simulador)
+
+        _finalizar_simulacao(simulador, nome_saida, end_time - start_time, chave_cache)
+    finally:
+        simulador.fechar_logs()
+
+def rodar_modo_fluxo(origem, plugins_ativos, diretorio_metricas=None):
+    """
+    Modo fluxo (--fluxo): a linha de sistema e as tarefas chegam de stdin ('-'),
+    de um arquivo/FIFO, em ordem de ingresso. As concluídas saem da memória; com
+    diretorio_metricas as métricas de cada uma vão para um JSONL rotativo.
+    Ctrl+C encerra mostrando as métricas do que já foi simulado.
+    """
+    destino = DestinoJSONL(diretorio_metricas, 'metricas_tarefas') if diretorio_metricas else None
+    simulador = carregar_fluxo(origem, plugins_ativos, SEMENTE_CLI, destino)
+    if simulador is None:
+        return
+    simulador.semear_random_global()
+    fonte = simulador.fonte_tarefas
+
+    start_time = time.time()
+    try:
+        while not simulador.terminou():
+            simulador.tick()
+            if simulador.relogio_global % 1000 == 0:
+                print(f"  ... tick {simulador.relogio_global} | admitidas: {fonte.admitidas} | "
+                      f"em memória: {len(simulador.tarefas)}", end='\r')
+    except KeyboardInterrupt:
+        print("\nFluxo interrompido: métricas até o tick atual.")
+    except ValueError as e:
+        print(f"\nErro no fluxo: {e}")
+    finally:
+        fonte.remover_concluidas(simulador)
+        if destino: destino.fechar()
+
+    print("\n" + "="*60)
+    print(f"Tempo total: {time.time() - start_time:.4f}s. Tick Final: {simulador.relogio_global - 1}. "
+          f"Semente: {simulador.semente}")
+    print(f"Tarefas admitidas: {fonte.admitidas} | Ainda em memória: {len(simulador.tarefas)}")
+    print(formatar_metricas(calcular_metricas(simulador)))
+    if destino: print(f"Métricas por tarefa em '{diretorio_metricas}'.")
+    print("="*60)
+
+def retomar_modo_completo(arquivo_config, plugins_ativos):
+    gerenciador = GerenciadorCheckpoint(_diretorio_checkpoint(arquivo_config), arquivo_config)
+    if not gerenciador.existe():
+        print(f"\nNenhum checkpoint encontrado para '{arquivo_config}'.")
+        return
+
+    simulador = carregar_configuracao_arquivo(arquivo_config, plugins_ativos, SEMENTE_CLI)
+    if simulador is None:
+        print("Erro fatal: Falha ao recarregar o simulador.")
+        return
+    simulador.semear_random_global()
+    if simulador.nivel_registro == 'COMPLETO':
+        simulador.definir_nivel_registro('LINHA_DO_TEMPO')
+    chave_cache = chave_simulacao(simulador)
+    # Os arquivos de log são reabertos; restaurar() os corta no tamanho do checkpoint
+    _configurar_destinos_log(simulador, arquivo_config, retomar=True)
+    try:
+        if not gerenciador.restaurar(simulador):
+            print("\nErro: o arquivo de configuração mudou desde o checkpoint. Execute do início.")
+            return
+        print(f"Checkpoint restaurado no tick {simulador.relogio_global}.")
+
+        nome_saida = input("Digite o nome do arquivo de imagem de saída (ex: gantt.png): ").strip()
+        if not nome_saida:
+            nome_saida = "gantt_resultado.png"
+
+        start_time = time.time()
+        if not _simular_com_checkpoint(simulador, gerenciador):
+            return
+        end_time = time.time()
+        gerenciador.limpar()
+
+        _finalizar_simulacao(simulador, nome_saida, end_time - start_time, chave_cache)
+    finally:
+        simulador.fechar_logs()
+
+def rodar_comparacao(arquivo_config, plugins_ativos):
+    print(f"Comparando algoritmos para '{arquivo_config}'...")
 
+    simulador = carregar_configuracao_arquivo(arquivo_config, plugins_ativos, SEMENTE_CLI)
+    if simulador is None:
+        print("Erro fatal: Falha ao recarregar o simulador.")
+        return
+
+    nome_saida = input("Digite o nome do arquivo de imagem comparativa (ex: comparacao.png): ").strip()
+    if not nome_saida:
+        nome_saida = "gantt_comparativo.png"
+
+    start_time = time.time()
+    resultados = comparar_algoritmos(simulador, plugins_ativos)
     end_time = time.time()
-    
+
+    relatorio = formatar_relatorio(resultados)
     print("\n" + "="*60)
-    print("Simulação concluída.")
-    print(f"Tempo total: {end_time - start_time:.4f}s. Tick Final: {simulador.relogio_global - 1}")
+    print(f"Comparação concluída em {end_time - start_time:.4f}s. Semente: {simulador.semente}")
+    print(relatorio)
     print("="*60)
 
+    nome_relatorio = os.path.splitext(nome_saida)[0] + ".txt"
+    with open(nome_relatorio, 'w') as f:
+        f.write(f"Config: {arquivo_config} | Semente: {simulador.semente}\n{relatorio}\n")
+
+    if simulador.so_metricas:
+        print(f"Relatório salvo em '{nome_relatorio}' (REGISTRO=METRICAS: sem gráfico).")
+        return
     try:
-        print(f"Gerando gráfico em '{nome_saida}'...")
-        gerar_imagem_gantt(
-            simulador.gantt_log,
-            simulador.tarefas,
+        print(f"Gerando gráfico comparativo em '{nome_saida}'...")
+        gerar_imagem_comparativa(
+            [r for r in resultados if 'erro' not in r],
             nome_saida,
-            simulador.nome_algoritmo_config,
-            simulador.bloqueio_log,
-            simulador.mutex_event_log,
-            simulador.io_log 
+            f"Comparação de Algoritmos - {arquivo_config} (Semente: {simulador.semente})"
         )
-        print(f"Gráfico salvo com sucesso.")
+        print(f"Gráfico e relatório ('{nome_relatorio}') salvos com sucesso.")
     except Exception as e:
         print(f"Erro crítico ao gerar o gráfico: {e}", file=sys.stderr)
 
+def rodar_montecarlo(arquivo_config, plugins_ativos):
+    print(f"Análise Monte Carlo de '{arquivo_config}'...")
+
+    simulador = carregar_configuracao_arquivo(arquivo_config, plugins_ativos, SEMENTE_CLI)
+    if simulador is None:
+        print("Erro fatal: Falha ao recarregar o simulador.")
+        return
+
+    try:
+        texto = input(f"Número de sementes (amostras) [{AMOSTRAS_PADRAO}]: ").strip()
+        amostras = int(texto) if texto else AMOSTRAS_PADRAO
+    except ValueError:
+        print(">> Número inválido.")
+        return
+
+    start_time = time.time()
+    try:
+        resultado = analisar_sementes(simulador, amostras)
+    except Exception as e:
+        print(f"Erro na análise: {e}", file=sys.stderr)
+        return
+    end_time = time.time()
+
+    relatorio = formatar_montecarlo(resultado)
+    print("\n" + "="*60)
+    print(f"Análise concluída em {end_time - start_time:.4f}s ({simulador.nome_algoritmo_config}).")
+    print(relatorio)
+    print("="*60)
+
+    nome_relatorio = f"{os.path.splitext(arquivo_config)[0]}_montecarlo.txt"
+    with open(nome_relatorio, 'w') as f:
+        f.write(f"Config: {arquivo_config} | Algoritmo: {simulador.nome_algoritmo_config}\n{relatorio}\n")
+    print(f"Relatório salvo em '{nome_relatorio}'.")
+
 def rodar_modo_passo_a_passo(arquivo_config, plugins_ativos):
     print(f"Iniciando simulação (Passo-a-Passo) de '{arquivo_config}'...")
     
-    simulador = carregar_configuracao_arquivo(arquivo_config, plugins_ativos)
+    simulador = carregar_configuracao_arquivo(arquivo_config, plugins_ativos, SEMENTE_CLI)
     if simulador is None:
         print("Erro fatal: Falha ao recarregar o simulador.")
         return
+    simulador.semear_random_global()
 
     nome_saida = input("Digite o nome do arquivo de imagem (será atualizado a cada passo): ").strip()
     if not nome_saida:
         nome_saida = "gantt_passo_atual.png"
-        
+
+    # Voltar no tempo e o Gantt a cada passo precisam de tudo, seja qual for o REGISTRO do config
+    simulador.definir_nivel_registro('COMPLETO')
+    visao = VisaoDepurador()
     try:
         while True:
             # 1. Exibir Estado
-            exibir_debugger(simulador)
+            exibir_debugger(simulador, visao)
             
             # 2. Gerar Gráfico
             try:
@@ -145,7 +426,8 @@ def rodar_modo_passo_a_passo(arquivo_config, plugins_ativos):
                     simulador.nome_algoritmo_config,
                     simulador.bloqueio_log,
                     simulador.mutex_event_log,
-                    simulador.io_log 
+                    simulador.io_log,
+                    simulador.semente
                 )
                 print(f"Gráfico atualizado em '{nome_saida}'")
             except Exception as e:
@@ -159,7 +441,11 @@ def rodar_modo_passo_a_passo(arquivo_config, plugins_ativos):
             print("\nComandos:")
             print(" [Enter] Avançar Tick")
             print(" [v]     Voltar Tick (Desfazer)")
+            print(" [g]     Ir para o Tick N (Viagem no Tempo)")
             print(" [n]     Inserir Nova Tarefa Agora")
+            print(" [f]     Filtrar Tarefas (id e estado)")
+            print(" [o]     Observar/Deixar de Observar Tarefa")
+            print(" [l]     Mostrar/Ocultar Lista de Tarefas  ([+]/[-] troca a página)")
             print(" [s]     Sair")
             
             comando = input("Opção: ").lower().strip()
@@ -174,12 +460,45 @@ def rodar_modo_passo_a_passo(arquivo_config, plugins_ativos):
                 else:
                     print(">> Você já está no início (ou no limite do histórico).")
                     time.sleep(1.5)
+
+            elif comando == 'g':
+                try:
+                    alvo = int(input("Ir para o tick: ").strip())
+                    tick_final = simulador.ir_para_tick(alvo)
+                    if tick_final > alvo:
+                        print(f">> Sem keyframe até o tick {alvo}: continua no tick {tick_final}.")
+                        time.sleep(1.5)
+                    elif tick_final != alvo:
+                        print(f">> Simulação terminou antes do tick {alvo} (parou em {tick_final}).")
+                        time.sleep(1.5)
+                except ValueError:
+                    print(">> Tick inválido.")
+                    time.sleep(1.5)
             
+            elif comando == 'f':
+                padrao = input("Padrão de id (ex: T1*) [Enter p/ todos]: ").strip()
+                estados = input("Estados separados por vírgula (ex: PRONTA,BLOQUEADA) [Enter p/ todos]: ")
+                try:
+                    visao.definir_filtro(padrao, estados.split(','))
+                except ValueError as e:
+                    print(f">> {e}")
+                    time.sleep(1.5)
+
+            elif comando == 'o':
+                t_id = input("ID da tarefa: ").strip()
+                if t_id:
+                    visao.alternar_observada(t_id)
+
+            elif comando == 'l':
+                visao.mostrar_lista = not visao.mostrar_lista
+
+            elif comando in ('+', '-'):
+                visao.mostrar_lista = True
+                visao.mudar_pagina(1 if comando == '+' else -1)
+
             elif comando == 'n': # insercao dinamica
                 print("\n--- INSERIR TAREFA DINÂMICA ---")
                 try:
-                    simulador.salvar_estado()
-                    
                     t_id = input("ID da Tarefa (ex: T_Extra): ").strip()
                     
                     # VALIDAÇÃO DE COR
@@ -222,17 +541,15 @@ def rodar_modo_passo_a_passo(arquivo_config, plugins_ativos):
                     nova_tcb = TCB(t_id, t_cor, t_ingresso, t_dur, t_prio)
                     nova_tcb.acoes = t_acoes_parsed
                     
-                    if simulador.adicionar_tarefa(nova_tcb):
+                    if simulador.inserir_tarefa_dinamica(nova_tcb):
                         print(f"\nSucesso! Tarefa {t_id} inserida.")
                     else:
                         print(f"\nErro: ID duplicado.")
-                        simulador.historico.pop()
                     
                     time.sleep(1.5)
                     
                 except ValueError as ve:
                     print(f"Erro: {ve}")
-                    simulador.historico.pop()
                     time.sleep(2.0)
 
             else:
@@ -252,7 +569,7 @@ def main():
     
     while True:
         exibir_menu(arquivo_carregado, len(plugins_carregados))
-        escolha = input("Escolha uma opção [1-6]: ").strip()
+        escolha = input("Escolha uma opção [1-9]: ").strip()
         
         if escolha == '1':
             novo = carregar_novo_arquivo(plugins_carregados)
@@ -282,15 +599,40 @@ def main():
 
         elif escolha == '5':
             print("\nCarregando plugins da pasta /extensions...")
-            novos_plugins = carregar_plugins()
-            if novos_plugins:
-                plugins_carregados.update(novos_plugins)
-                print(f"\nSucesso! {len(novos_plugins)} plugins carregados/atualizados.")
+            inicio = time.perf_counter()
+            plugins_carregados, relatorio = carregar_plugins_detalhado()
+            print(formatar_relatorio_plugins(relatorio))
+            alterados = sum(1 for item in relatorio if item['situacao'] in ('carregado', 'recarregado'))
+            erros = sum(1 for item in relatorio if item['erro'])
+            if plugins_carregados:
+                print(f"\n{len(plugins_carregados)} plugins ativos ({alterados} arquivos recarregados, "
+                      f"{erros} com erro) em {time.perf_counter() - inicio:.3f}s.")
             else:
                 print("\nNenhum plugin válido encontrado na pasta 'extensions'.")
             pausar_e_continuar()
 
         elif escolha == '6':
+            if arquivo_carregado is None:
+                print("\nErro: Nenhum arquivo carregado.")
+            else:
+                retomar_modo_completo(arquivo_carregado, plugins_carregados)
+            pausar_e_continuar()
+
+        elif escolha == '7':
+            if arquivo_carregado is None:
+                print("\nErro: Nenhum arquivo carregado.")
+            else:
+                rodar_comparacao(arquivo_carregado, plugins_carregados)
+            pausar_e_continuar()
+
+        elif escolha == '8':
+            if arquivo_carregado is None:
+                print("\nErro: Nenhum arquivo carregado.")
+            else:
+                rodar_montecarlo(arquivo_carregado, plugins_carregados)
+            pausar_e_continuar()
+
+        elif escolha == '9':
             print("Saindo do simulador.")
             break
             
@@ -299,4 +641,26 @@ def main():
             pausar_e_continuar()
 
 if __name__ == "__main__":
-    main()
+    parser_args = argparse.ArgumentParser(description="Simulador de Escalonador de Processos")
+    parser_args.add_argument('--semente', type=int, default=None,
+                             help="Semente do desempate (sobrepõe SEMENTE=n do config)")
+    parser_args.add_argument('--fluxo', metavar='ORIGEM', default=None,
+                             help="Modo fluxo: lê o config (sistema + tarefas em ordem de ingresso) "
+                                  "de um arquivo/FIFO ou da entrada padrão ('-') e simula sem o menu")
+    parser_args.add_argument('--metricas-tarefas', metavar='DIRETORIO', default=None,
+                             help="No modo fluxo, grava as métricas de cada tarefa concluída (JSONL)")
+    parser_args.add_argument('--escala', action='store_true',
+                             help="Mede o custo por tick do MLFQ e do CFS com filas de prontos crescentes "
+                                  "e sai com erro se ele crescer com a fila")
+    args = parser_args.parse_args()
+    SEMENTE_CLI = args.semente
+    if args.escala:
+        print(f"Custo por tick com {' e '.join(map(str, TAMANHOS_PADRAO))} tarefas prontas...")
+        resultados = verificar_escala()
+        print(formatar_escala(resultados))
+        sys.exit(0 if all(r['plano'] for r in resultados) else 1)
+    elif args.fluxo:
+        plugins, _ = carregar_plugins_detalhado()
+        rodar_modo_fluxo(args.fluxo, plugins, args.metricas_tarefas)
+    else:
+        main()
@@ -0,0 +1,255 @@
+import os
+import csv
+from operator import itemgetter
+import numpy as np
+
+# Quantidade de janelas em que a linha do tempo é dividida (uso da CPU e trocas por janela)
+JANELAS_PADRAO = 100
+TIPOS_MUTEX = ('ML', 'ML_FAIL', 'MU')
+_ML, _ML_FAIL, _MU = range(len(TIPOS_MUTEX))
+
+class LogsVetorizados:
+    """
+    Os logs de uma simulação convertidos uma única vez em arrays NumPy (sem listas
+    de dicionários intermediárias, o que serve também para os logs em arquivo).
+    Tarefas viram índices em ids (-1 é a CPU ociosa); fim é o primeiro tick não simulado.
+    """
+    def __init__(self, simulador):
+        self.ids = [t.id for t in simulador.tarefas]
+        codigos = {task_id: i for i, task_id in enumerate(self.ids)}
+        codigos['idle'] = -1
+        tipos = {tipo: i for i, tipo in enumerate(TIPOS_MUTEX)}
+        self.ingresso = np.array([t.ingresso for t in simulador.tarefas], dtype=np.int64)
+        self.conclusao = np.array([t.tick_conclusao for t in simulador.tarefas], dtype=np.int64)
+        self.num_cpus = getattr(simulador, 'num_cpus', 1)
+        self.fim = simulador.relogio_global
+
+        tick, tarefa = ('tick', np.int64, None), ('task_id', np.int32, codigos)
+        gantt = [tick, tarefa] + ([('cpu', np.int32, None)] if self.num_cpus > 1 else [])
+        self.gantt = _converter(simulador.gantt_log, gantt)
+        if self.num_cpus == 1:
+            self.gantt['cpu'] = np.zeros(len(self.gantt['tick']), dtype=np.int32)
+        self.io = _converter(simulador.io_log, [tick, tarefa])
+        self.bloqueio = _converter(simulador.bloqueio_log, [tick, tarefa])
+        self.mutex = _converter(simulador.mutex_event_log,
+                                [tick, tarefa, ('tipo', np.int8, tipos), ('mutex', np.int64, None)])
+
+def _converter(log, colunas):
+    """
+    colunas: [(campo, dtype, mapa)], com mapa opcional (ex.: task_id -> índice).
+    Logs em memória são lidos uma vez por coluna com map/itemgetter (o laço fica
+    em C); logs em arquivo numa passada só, para não ler os arquivos de novo.
+    Retorna {campo: array} ('task_id' vira 'tarefa').
+    """
+    nomes = ['tarefa' if campo == 'task_id' else campo for campo, _, _ in colunas]
+    if getattr(log, 'persistente', False):
+        def linha(e):
+            return tuple(e[campo] if mapa is None else mapa[e[campo]] for campo, _, mapa in colunas)
+        dtype = [(nome, tipo) for nome, (_, tipo, _) in zip(nomes, colunas)]
+        arr = np.fromiter(map(linha, log), dtype=dtype, count=len(log))
+        return {nome: np.ascontiguousarray(arr[nome]) for nome in nomes}
+    arrays = {}
+    for nome, (campo, tipo, mapa) in zip(nomes, colunas):
+        valores = map(itemgetter(campo), log)
+        if mapa is not None:
+            valores = map(mapa.__getitem__, valores)
+        arrays[nome] = np.fromiter(valores, dtype=tipo, count=len(log))
+    return arrays
+
+# --- Análises (cada uma devolve uma tabela: {coluna: array}, todas do mesmo tamanho) ---
+
+def estados_por_tarefa(logs):
+    """
+    Ticks de cada tarefa em cada estado, do ingresso à conclusão (ou ao fim da
+    simulação): executando, pronta (na fila), em E/S e bloqueada em mutex.
+    'pronta' é a mesma espera de metricas.calcular_metricas.
+    """
+    n = len(logs.ids)
+    rodando = logs.gantt['tarefa']
+    executando = np.bincount(rodando[rodando >= 0], minlength=n)
+    e_s = np.bincount(logs.io['tarefa'], minlength=n)
+    mutex = np.bincount(logs.bloqueio['tarefa'], minlength=n)
+    fim = np.where(logs.conclusao >= 0, logs.conclusao, logs.fim)
+    vida = np.maximum(fim - logs.ingresso, 0)
+    return {
+        'tarefa': np.array(logs.ids, dtype=object),
+        'ingresso': logs.ingresso,
+        'conclusao': logs.conclusao,
+        'executando': executando,
+        'pronta': vida - executando - e_s - mutex,
+        'e_s': e_s,
+        'mutex': mutex,
+    }
+
+def _trocas_de_contexto(logs):
+    """Ticks (um por troca) em que uma CPU passa a executar uma tarefa diferente da do tick anterior."""
+    tick, tarefa, cpu = logs.gantt['tick'], logs.gantt['tarefa'], logs.gantt['cpu']
+    if logs.num_cpus > 1:
+        ordem = np.lexsort((tick, cpu))
+        tick, tarefa, cpu = tick[ordem], tarefa[ordem], cpu[ordem]
+    continua = np.zeros(len(tick), dtype=bool)
+    continua[1:] = (cpu[1:] == cpu[:-1]) & (tick[1:] == tick[:-1] + 1) & (tarefa[1:] == tarefa[:-1])
+    return tick[(tarefa >= 0) & ~continua]
+
+def por_janela(logs, janelas=JANELAS_PADRAO):
+    """Uso da CPU e trocas de contexto (total e por 1000 ticks) em janelas de tamanho igual."""
+    tamanho = max(1, -(-logs.fim // max(1, janelas)))
+    qtd = -(-logs.fim // tamanho)
+    inicio = np.arange(qtd, dtype=np.int64) * tamanho
+    duracao = np.minimum(inicio + tamanho, logs.fim) - inicio
+    rodando = logs.gantt['tarefa'] >= 0
+    ocupados = np.bincount(logs.gantt['tick'][rodando] // tamanho, minlength=qtd)[:qtd]
+    trocas = np.bincount(_trocas_de_contexto(logs) // tamanho, minlength=qtd)[:qtd]
+    return {
+        'inicio': inicio,
+        'fim': inicio + duracao,
+        'utilizacao_cpu': ocupados / (duracao * logs.num_cpus),
+        'trocas': trocas,
+        'trocas_por_1000': trocas * 1000 / duracao,
+    }
+
+def _pares(chave, tick, tipo, abre, fecha):
+    """
+    Pares (abre -> fecha) consecutivos do mesmo par (tarefa, mutex), na ordem do log.
+    Retorna (índices de abertura, duração) e as aberturas sem fechamento.
+    """
+    sel = np.flatnonzero((tipo == abre) | (tipo == fecha))
+    sel = sel[np.lexsort((sel, chave[sel]))]  # estável: empates no mesmo tick ficam na ordem do log
+    k, t, tp = chave[sel], tick[sel], tipo[sel]
+    par = (tp[:-1] == abre) & (tp[1:] == fecha) & (k[:-1] == k[1:])
+    fechados = np.zeros(len(sel), dtype=bool)
+    fechados[:-1] = par
+    sem_fechamento = sel[(tp == abre) & ~fechados]
+    return sel[:-1][par], (t[1:] - t[:-1])[par], sem_fechamento
+
+def _faixa(valores):
+    """Faixa do histograma em potências de 2: 0 -> 0, 1 -> 1, 2-3 -> 2, 4-7 -> 3, ..."""
+    return np.frexp(valores.astype(np.float64))[1]
+
+def _nome_faixa(faixa):
+    if faixa == 0: return "0"
+    baixo, alto = 1 << (faixa - 1), (1 << faixa) - 1
+    return str(baixo) if baixo == alto else f"{baixo}-{alto}"
+
+def _agregar(grupo, valores, qtd_grupos):
+    """Quantidade, soma e máximo de valores por grupo (grupos 0..qtd_grupos-1)."""
+    quantidade = np.bincount(grupo, minlength=qtd_grupos)
+    soma = np.bincount(grupo, weights=valores, minlength=qtd_grupos).astype(np.int64)
+    maximo = np.zeros(qtd_grupos, dtype=np.int64)
+    if len(grupo):
+        ordem = np.argsort(grupo, kind='stable')
+        g = grupo[ordem]
+        inicios = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+        maximo[g[inicios]] = np.maximum.reduceat(valores[ordem], inicios)
+    return quantidade, soma, maximo
+
+def analisar_mutex(logs):
+    """
+    Posse (ML -> MU, ou até a conclusão da dona, que libera tudo ao terminar) e
+    disputa (ML_FAIL -> ML: ticks até conseguir o lock) de cada mutex.
+    Retorna (resumo por mutex, histograma por mutex em faixas de potências de 2).
+    """
+    m = logs.mutex
+    mutexes, mutex_idx = np.unique(m['mutex'], return_inverse=True)
+    qtd = len(mutexes)
+    # Chave do par (tarefa, mutex) em um inteiro
+    chave = m['tarefa'].astype(np.int64) * max(qtd, 1) + mutex_idx
+
+    abertas, posse, sem_unlock = _pares(chave, m['tick'], m['tipo'], _ML, _MU)
+    dona = m['tarefa'][sem_unlock]
+    fim = np.where(logs.conclusao[dona] >= 0, logs.conclusao[dona], logs.fim)
+    grupo_posse = np.concatenate((mutex_idx[abertas], mutex_idx[sem_unlock]))
+    posse = np.concatenate((posse, fim - m['tick'][sem_unlock]))
+
+    tentativas, espera, _ = _pares(chave, m['tick'], m['tipo'], _ML_FAIL, _ML)
+    grupo_espera = mutex_idx[tentativas]
+
+    aquisicoes, posse_total, posse_max = _agregar(grupo_posse, posse, qtd)
+    esperas, espera_total, espera_max = _agregar(grupo_espera, espera, qtd)
+    resumo = {
+        'mutex': mutexes,
+        'aquisicoes': aquisicoes,
+        'posse_total': posse_total,
+        'posse_media': posse_total / np.maximum(aquisicoes, 1),
+        'posse_max': posse_max,
+        'bloqueios': np.bincount(mutex_idx[m['tipo'] == _ML_FAIL], minlength=qtd),
+        'espera_media': espera_total / np.maximum(esperas, 1),
+        'espera_max': espera_max,
+    }
+
+    faixa_posse, faixa_espera = _faixa(posse), _faixa(espera)
+    qtd_faixas = int(max(faixa_posse.max(initial=0), faixa_espera.max(initial=0))) + 1
+    contagem_posse = np.bincount(grupo_posse * qtd_faixas + faixa_posse, minlength=qtd * qtd_faixas)
+    contagem_espera = np.bincount(grupo_espera * qtd_faixas + faixa_espera, minlength=qtd * qtd_faixas)
+    linhas = np.flatnonzero(contagem_posse + contagem_espera)
+    histograma = {
+        'mutex': mutexes[linhas // qtd_faixas],
+        'faixa_ticks': np.array([_nome_faixa(f) for f in (linhas % qtd_faixas).tolist()], dtype=object),
+        'posses': contagem_posse[linhas],
+        'esperas': contagem_espera[linhas],
+    }
+    return resumo, histograma
+
+def analisar_logs(simulador, janelas=JANELAS_PADRAO):
+    """
+    Análise da linha do tempo de uma simulação (níveis COMPLETO e LINHA_DO_TEMPO).
+    Retorna {'global': {...}, 'tabelas': {nome: {coluna: array}}}.
+    """
+    logs = LogsVetorizados(simulador)
+    estados = estados_por_tarefa(logs)
+    mutex, histograma = analisar_mutex(logs)
+    trocas = len(_trocas_de_contexto(logs))
+    totais = {estado: int(estados[estado].sum()) for estado in ('executando', 'pronta', 'e_s', 'mutex')}
+    globais = {
+        'ticks': logs.fim,
+        'trocas': trocas,
+        'trocas_por_1000': trocas * 1000 / logs.fim if logs.fim else 0.0,
+        'ticks_por_estado': totais,
+    }
+    tabelas = {
+        'estados_tarefas': estados,
+        'janelas': por_janela(logs, janelas),
+        'mutex': mutex,
+        'histograma_mutex': histograma,
+    }
+    return {'global': globais, 'tabelas': tabelas}
+
+# --- Saída ---
+
+def exportar_tabelas(analise, diretorio):
+    """Grava cada tabela em <diretorio>/<nome>.csv. Retorna os caminhos gravados."""
+    os.makedirs(diretorio, exist_ok=True)
+    caminhos = []
+    for nome, tabela in analise['tabelas'].items():
+        caminho = os.path.join(diretorio, f"{nome}.csv")
+        with open(caminho, 'w', newline='') as f:
+            escritor = csv.writer(f)
+            escritor.writerow(tabela.keys())
+            escritor.writerows(zip(*(coluna.tolist() for coluna in tabela.values())))
+        caminhos.append(caminho)
+    return caminhos
+
+def formatar_analise(analise, limite_mutex=10):
+    """Resumo em texto: tempo por estado, trocas de contexto, janelas e mutexes mais disputados."""
+    g = analise['global']
+    estados = g['ticks_por_estado']
+    total = sum(estados.values()) or 1
+    janelas = analise['tabelas']['janelas']
+    linhas = [
+        "Tempo das tarefas: " + " | ".join(f"{nome}: {ticks / total * 100:.1f}%" for nome, ticks in
+                                           (("Executando", estados['executando']), ("Pronta", estados['pronta']),
+                                            ("E/S", estados['e_s']), ("Mutex", estados['mutex']))),
+        f"Trocas de contexto: {g['trocas']} ({g['trocas_por_1000']:.1f} por 1000 ticks)",
+    ]
+    if len(janelas['inicio']):
+        uso = janelas['utilizacao_cpu']
+        linhas.append(f"Uso da CPU por janela de {int(janelas['fim'][0] - janelas['inicio'][0])} ticks: "
+                      f"mín. {uso.min() * 100:.1f}% | máx. {uso.max() * 100:.1f}% | "
+                      f"trocas/1000 máx. {janelas['trocas_por_1000'].max():.1f}")
+    mutex = analise['tabelas']['mutex']
+    if len(mutex['mutex']):
+        linhas.append(f"{'MUTEX':<8}{'LOCKS':>7}{'POSSE MÉD':>11}{'POSSE MÁX':>11}{'BLOQUEIOS':>11}{'ESPERA MÁX':>12}")
+        for i in np.argsort(-mutex['bloqueios'], kind='stable')[:limite_mutex].tolist():
+            linhas.append(f"{'M' + str(mutex['mutex'][i]):<8}{mutex['aquisicoes'][i]:>7}{mutex['posse_media'][i]:>11.2f}"
+                          f"{mutex['posse_max'][i]:>11}{mutex['bloqueios'][i]:>11}{mutex['espera_max'][i]:>12}")
+    return "\n".join(linhas)
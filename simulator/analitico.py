@@ -0,0 +1,163 @@
+import numpy as np
+
+# Sorteios que o FIFO com empates pode reproduzir; acima disso a simulação segue pelo Simulator
+LIMITE_SORTEIOS_EMULADOS = 30_000_000
+
+def fim_fifo(a, d):
+    """
+    Fim de cada tarefa, na ordem de execução (a, d ordenados por ingresso e duração).
+    fim_i = max(a_i, fim_{i-1}) + d_i tem forma fechada:
+    fim_i = C_i + max_{j<=i}(a_j - C_{j-1}), com C a soma acumulada das durações.
+    """
+    acumulado = np.cumsum(d)
+    return acumulado + np.maximum.accumulate(a - (acumulado - d))
+
+def _grupos_empatados(a, d):
+    """Trechos [inicio, fim) da ordem de execução com o mesmo (ingresso, duracao) e tamanho >= 2."""
+    n = len(a)
+    if n < 2: return []
+    quebra = np.flatnonzero((a[1:] != a[:-1]) | (d[1:] != d[:-1])) + 1
+    bordas = np.concatenate(([0], quebra, [n]))
+    tamanhos = np.diff(bordas)
+    return [(int(i), int(i + t)) for i, t in zip(bordas[:-1][tamanhos > 1], tamanhos[tamanhos > 1])]
+
+def _sorteios_por_despacho(a, inicio):
+    """
+    Chamadas a rng.random() do FIFO antes de cada despacho e em cada um: o desempate
+    sorteia um número por tarefa da fila, e no despacho k a fila tem todas as
+    tarefas que já chegaram menos as k já despachadas.
+    """
+    na_fila = np.searchsorted(a, inicio, side='right') - np.arange(len(a))
+    return np.cumsum(na_fila) - na_fila, na_fila
+
+def sorteios_necessarios_fifo(a, d):
+    """Sorteios a reproduzir (até o último despacho empatado); 0 se não há empates."""
+    grupos = _grupos_empatados(a, d)
+    if not grupos: return 0
+    inicio = fim_fifo(a, d) - d
+    antes, na_fila = _sorteios_por_despacho(a, inicio)
+    ultimo = grupos[-1][1] - 2  # o último membro de cada grupo sai sem sorteio
+    return int(antes[ultimo] + na_fila[ultimo])
+
+def _pular_sorteios(rng, quantidade):
+    # random() consome duas palavras de 32 bits do Mersenne Twister, como getrandbits(64)
+    while quantidade > 0:
+        bloco = min(quantidade, 1 << 20)
+        rng.getrandbits(64 * bloco)
+        quantidade -= bloco
+
+def desempatar_fifo(ingresso, duracao, ordem, rng):
+    """
+    Reproduz os sorteios do FIFO (_escolher_com_desempate) nos grupos de tarefas com
+    o mesmo ingresso e a mesma duração. Trocar tarefas idênticas não muda os tempos,
+    só qual id ocupa cada posição, então basta reordenar 'ordem' dentro dos grupos.
+
+    A fila de prontos do Simulator está em ordem de chegada (no mesmo tick, ordem do
+    arquivo), então o grupo fica no começo dela, misturado às tarefas de mesmo
+    ingresso e duração maior. rng é consumido exatamente como no Simulator.
+    Retorna (ordem reordenada, posições da ordem de execução decididas por sorteio).
+    """
+    a, d = ingresso[ordem], duracao[ordem]
+    grupos = _grupos_empatados(a, d)
+    if not grupos: return ordem, []
+
+    antes, _ = _sorteios_por_despacho(a, fim_fifo(a, d) - d)
+    por_ingresso = np.lexsort((np.arange(len(ingresso)), ingresso))
+    ingresso_ordenado = ingresso[por_ingresso]
+    ordem = ordem.copy()
+    sorteados = []
+    consumidos = 0
+    for inicio_grupo, fim_grupo in grupos:
+        ing, dur = ingresso[ordem[inicio_grupo]], duracao[ordem[inicio_grupo]]
+        lo, hi = np.searchsorted(ingresso_ordenado, [ing, ing + 1])
+        bloco = por_ingresso[lo:hi]
+        # Começo da fila: mesmas chegadas, exceto as mais curtas (já despachadas)
+        fila = bloco[duracao[bloco] >= dur].tolist()
+        restantes = set(ordem[inicio_grupo:fim_grupo].tolist())
+        for k in range(inicio_grupo, fim_grupo - 1):
+            _pular_sorteios(rng, int(antes[k]) - consumidos)
+            posicoes = [p for p, i in enumerate(fila) if i in restantes]
+            sorteio = [rng.random() for _ in range(posicoes[-1] + 1)]
+            consumidos = int(antes[k]) + posicoes[-1] + 1
+            vencedora = fila.pop(min(posicoes, key=lambda p: sorteio[p]))
+            restantes.discard(vencedora)
+            ordem[k] = vencedora
+            sorteados.append(k)
+        ordem[fim_grupo - 1] = restantes.pop()
+    return ordem, sorteados
+
+def round_robin(a, d, quantum, com_intervalos=False):
+    """
+    RoundRobin do projeto em forma analítica, O(N) sobre as tarefas ordenadas por
+    (ingresso, duracao). O escolhido é sempre o de menor chave na fila (excluída a
+    atual) e quem chega depois tem chave maior que todos os presentes, então só
+    as duas menores chaves ainda não concluídas se revezam: cada fase é um par
+    alternando fatias de 'quantum' até um terminar, com duração calculada de uma
+    vez. Sem par presente no estouro, o quantum não é renovado e a tarefa roda
+    até o fim (mesmo comportamento do Simulator).
+
+    Retorna (conclusao na ordem recebida, despachos, intervalos) onde intervalos é
+    (inicios, duracoes, tarefas) se com_intervalos, senão None.
+    """
+    n = len(a)
+    chegada = a.tolist()
+    dur = d.tolist()
+    q = int(quantum)
+    conclusao = [0] * n
+    despachos = 0
+    inicios, duracoes, tarefas = [], [], []
+
+    t = 0
+    prox = 0      # próxima tarefa que ainda não rodou (as demais esperam em ordem de chave)
+    atual = -1
+    restante = 0
+    while True:
+        if atual < 0:
+            if prox == n: break
+            t = max(t, chegada[prox])
+            atual, restante = prox, dur[prox]
+            prox += 1
+
+        if restante <= q or prox == n or chegada[prox] > t + q:
+            # Termina dentro do quantum, ou estoura sem concorrente e segue até o fim
+            conclusao[atual] = t + restante
+            despachos += 1
+            if com_intervalos:
+                inicios.append(t); duracoes.append(restante); tarefas.append(atual)
+            t += restante
+            atual = -1
+            continue
+
+        # Fase: atual (x) e a próxima chave (p) alternam fatias, x primeiro
+        x, p = atual, prox
+        prox += 1
+        rx, rp = restante, dur[p]
+        fatias_x, fatias_p = -(-rx // q), -(-rp // q)
+        if fatias_x <= fatias_p:
+            fim = t + rx + (fatias_x - 1) * q
+            conclusao[x] = fim
+            despachos += 2 * fatias_x - 1
+            sobrevivente, restante = p, rp - (fatias_x - 1) * q
+        else:
+            fim = t + fatias_p * q + rp
+            conclusao[p] = fim
+            despachos += 2 * fatias_p
+            sobrevivente, restante = x, rx - fatias_p * q
+        if com_intervalos:
+            inicio, rx_fase, rp_fase = t, rx, rp
+            while inicio < fim:
+                for tarefa in (x, p):
+                    if inicio >= fim: break
+                    resto = rx_fase if tarefa == x else rp_fase
+                    fatia = min(q, resto)
+                    if fatia == 0: continue
+                    inicios.append(inicio); duracoes.append(fatia); tarefas.append(tarefa)
+                    inicio += fatia
+                    if tarefa == x: rx_fase -= fatia
+                    else: rp_fase -= fatia
+        # O sobrevivente é o próximo escolhido, com quantum novo
+        t = fim
+        atual = sobrevivente
+
+    intervalos = (inicios, duracoes, tarefas) if com_intervalos else None
+    return conclusao, despachos, intervalos
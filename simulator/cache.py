@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import inspect
+import importlib.util
+import simulator.core
+import simulator.schedulers
+import simulator.smp
+import simulator.vetorizado
+import simulator.analitico
+import simulator.metricas
+
+DIRETORIO_CACHE_PADRAO = ".cache_simulador"
+LIMITE_BYTES_PADRAO = 200 * 1024 * 1024  # 200 MB
+
+ARQUIVO_RESULTADO = "resultado.pkl"
+ARQUIVO_IMAGEM = "gantt.png"
+
+def _hash_arquivo(caminho):
+    with open(caminho, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _normalizar_carga(simulador):
+    """Carga de trabalho já parseada, independente de espaços e ordem das ações no arquivo."""
+    tarefas = []
+    for t in simulador.tarefas:
+        acoes = [sorted(a.items()) for a in t.acoes]
+        afinidade = sorted(t.afinidade) if t.afinidade is not None else None
+        tarefas.append([t.id, t.cor, t.ingresso, t.duracao, t.prioridade, acoes, afinidade])
+    return tarefas
+
+def _fontes(escalonador):
+    """
+    Arquivos que entram na chave: o motor, as métricas, o Gantt (a imagem vai
+    para o cache) e o de cada classe da hierarquia do escalonador fora da
+    biblioteca padrão (um plugin herda o comportamento das bases).
+    """
+    fontes = [simulator.core.__file__, simulator.schedulers.__file__, simulator.smp.__file__,
+              simulator.vetorizado.__file__, simulator.analitico.__file__, simulator.metricas.__file__,
+              importlib.util.find_spec('simulator.gantt').origin]  # sem importar o matplotlib
+    for classe in type(escalonador).__mro__:
+        if classe.__module__.split('.')[0] in sys.stdlib_module_names: continue
+        fonte = inspect.getsourcefile(classe)
+        if fonte and fonte not in fontes:
+            fontes.append(fonte)
+    return fontes
+
+def descrever_simulacao(simulador):
+    """
+    Tudo que determina o resultado: carga normalizada, algoritmo, quantum,
+    alpha, semente, política de deadlock e o código-fonte do motor e do
+    escalonador (nativo ou plugin).
+    """
+    escalonador = simulador.escalonador
+    return {
+        'tarefas': _normalizar_carga(simulador),
+        'algoritmo': simulador.nome_algoritmo_config,
+        'escalonador': type(escalonador).__name__,
+        'quantum': simulador.quantum,
+        'alpha': getattr(escalonador, 'alpha', None),
+        'parametros': [getattr(escalonador, nome, None)
+                       for nome in ('quanta', 'periodo_boost', 'granularidade', 'latencia')],
+        'semente': simulador.semente,
+        'deadlock': [simulador.politica_deadlock, simulador.abortar_vitima],
+        'registro': getattr(simulador, 'nivel_registro', 'COMPLETO'),
+        'cpus': [getattr(simulador, 'num_cpus', 1), getattr(simulador, 'fila_global', True),
+                 getattr(simulador, 'roubo_trabalho', False)],
+        'fontes': [_hash_arquivo(caminho) for caminho in _fontes(escalonador)],
+    }
+
+def chave_simulacao(simulador):
+    """Hash de descrever_simulacao: mesma chave = mesmo resultado."""
+    texto = json.dumps(descrever_simulacao(simulador), sort_keys=True, default=str)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+class CacheResultados:
+    """
+    Cache em disco de resultados (métricas, intervalos e imagem do Gantt),
+    endereçado pelo conteúdo da simulação. Cada entrada é uma pasta; o mtime
+    da pasta marca o último uso e orienta a remoção LRU por tamanho total.
+    """
+    def __init__(self, diretorio=DIRETORIO_CACHE_PADRAO, limite_bytes=LIMITE_BYTES_PADRAO):
+        self.diretorio = diretorio
+        self.limite_bytes = int(limite_bytes)
+
+    def _pasta(self, chave):
+        return os.path.join(self.diretorio, chave)
+
+    def buscar(self, chave):
+        """Retorna o resultado salvo (dict) ou None. Um acerto renova o uso da entrada."""
+        pasta = self._pasta(chave)
+        caminho = os.path.join(pasta, ARQUIVO_RESULTADO)
+        if not os.path.exists(caminho): return None
+        try:
+            with open(caminho, 'rb') as f:
+                resultado = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        os.utime(pasta)
+        imagem = os.path.join(pasta, ARQUIVO_IMAGEM)
+        resultado['imagem'] = imagem if os.path.exists(imagem) else None
+        return resultado
+
+    def guardar(self, chave, metricas, intervalos, caminho_imagem=None):
+        os.makedirs(self.diretorio, exist_ok=True)
+        pasta = self._pasta(chave)
+        temporaria = f"{pasta}.tmp{os.getpid()}"
+        shutil.rmtree(temporaria, ignore_errors=True)
+        os.makedirs(temporaria)
+
+        with open(os.path.join(temporaria, ARQUIVO_RESULTADO), 'wb') as f:
+            pickle.dump({'metricas': metricas, 'intervalos': intervalos, 'criado_em': time.time()},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        if caminho_imagem:
+            shutil.copyfile(caminho_imagem, os.path.join(temporaria, ARQUIVO_IMAGEM))
+
+        shutil.rmtree(pasta, ignore_errors=True)
+        os.replace(temporaria, pasta)
+        self.remover_excedente()
+
+    def remover_excedente(self):
+        """Remove as entradas usadas há mais tempo até caber no limite de bytes."""
+        entradas = []
+        total = 0
+        for nome in os.listdir(self.diretorio):
+            pasta = os.path.join(self.diretorio, nome)
+            if not os.path.isdir(pasta) or '.tmp' in nome: continue
+            tamanho = sum(os.path.getsize(os.path.join(pasta, arq)) for arq in os.listdir(pasta))
+            entradas.append((os.path.getmtime(pasta), tamanho, pasta))
+            total += tamanho
+
+        entradas.sort()
+        while total > self.limite_bytes and entradas:
+            _, tamanho, pasta = entradas.pop(0)
+            shutil.rmtree(pasta, ignore_errors=True)
+            total -= tamanho
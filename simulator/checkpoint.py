@@ -0,0 +1,115 @@
+import os
+import hashlib
+from simulator.registros import CAMPOS_LOG, escrever_bloco, ler_bloco
+
+INTERVALO_PADRAO = 500  # ticks entre checkpoints
+
+ARQUIVO_ESTADO = "estado.ckpt"
+ARQUIVO_LOGS = "logs.ckpt"
+
+def _assinatura_config(caminho_config):
+    with open(caminho_config, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class GerenciadorCheckpoint:
+    """
+    Grava checkpoints periódicos de uma simulação em disco.
+
+    - estado.ckpt: snapshot compacto (capturar_estado) reescrito de forma atômica.
+    - logs.ckpt: diário append-only apenas com as entradas de log novas desde o
+      último checkpoint. Assim o custo de cada checkpoint não cresce com os ticks.
+      Logs com destino em arquivo (registros.DestinoArquivo) já estão em disco:
+      só são sincronizados, e ao restaurar são truncados ao tamanho do snapshot.
+    """
+    def __init__(self, diretorio, caminho_config, intervalo=INTERVALO_PADRAO):
+        self.diretorio = diretorio
+        self.caminho_config = caminho_config
+        self.intervalo = int(intervalo)
+        self.enviados = {campo: 0 for campo in CAMPOS_LOG}
+
+    @property
+    def caminho_estado(self):
+        return os.path.join(self.diretorio, ARQUIVO_ESTADO)
+
+    @property
+    def caminho_logs(self):
+        return os.path.join(self.diretorio, ARQUIVO_LOGS)
+
+    def existe(self):
+        return os.path.exists(self.caminho_estado)
+
+    def iniciar(self):
+        """Começa uma execução nova, descartando checkpoints antigos."""
+        self.limpar()
+        os.makedirs(self.diretorio, exist_ok=True)
+        self.enviados = {campo: 0 for campo in CAMPOS_LOG}
+
+    def limpar(self):
+        for caminho in (self.caminho_estado, self.caminho_logs):
+            if os.path.exists(caminho): os.remove(caminho)
+        if os.path.isdir(self.diretorio) and not os.listdir(self.diretorio):
+            os.rmdir(self.diretorio)
+
+    def verificar(self, simulador):
+        """Chamado a cada tick: grava um checkpoint quando o intervalo é atingido."""
+        if self.intervalo > 0 and simulador.relogio_global % self.intervalo == 0:
+            self.salvar(simulador)
+
+    def salvar(self, simulador):
+        # 1. Diário de logs: só o que ainda não foi gravado
+        novos = {}
+        for campo in CAMPOS_LOG:
+            log = getattr(simulador, campo)
+            if log.persistente:
+                log.sincronizar()
+                novos[campo] = []
+            else:
+                novos[campo] = log[self.enviados[campo]:]
+        with open(self.caminho_logs, 'ab') as f:
+            escrever_bloco(f, novos)
+            f.flush()
+            os.fsync(f.fileno())
+            offset_logs = f.tell()
+        for campo in CAMPOS_LOG:
+            self.enviados[campo] = len(getattr(simulador, campo))
+
+        # 2. Estado completo, trocado de forma atômica (o último checkpoint sempre é válido)
+        checkpoint = {
+            'assinatura': _assinatura_config(self.caminho_config),
+            'offset_logs': offset_logs,
+            'estado': simulador.capturar_estado(copiar=False),
+        }
+        temporario = self.caminho_estado + ".tmp"
+        with open(temporario, 'wb') as f:
+            escrever_bloco(f, checkpoint)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, self.caminho_estado)
+
+    def restaurar(self, simulador):
+        """
+        Restaura o último checkpoint sobre um simulador recém-carregado do mesmo config.
+        Retorna False se não houver checkpoint ou se o config foi alterado.
+        """
+        if not self.existe(): return False
+        with open(self.caminho_estado, 'rb') as f:
+            checkpoint = ler_bloco(f)
+        if checkpoint['assinatura'] != _assinatura_config(self.caminho_config):
+            return False
+
+        # Reconstrói os logs a partir do diário, descartando blocos gravados após o estado
+        for campo in CAMPOS_LOG:
+            if not getattr(simulador, campo).persistente:
+                del getattr(simulador, campo)[:]
+        with open(self.caminho_logs, 'rb') as f:
+            while f.tell() < checkpoint['offset_logs']:
+                bloco = ler_bloco(f)
+                for campo in CAMPOS_LOG:
+                    getattr(simulador, campo).extend(bloco[campo])
+        with open(self.caminho_logs, 'r+b') as f:
+            f.truncate(checkpoint['offset_logs'])
+
+        simulador.restaurar_estado(checkpoint['estado'])
+        for campo in CAMPOS_LOG:
+            self.enviados[campo] = len(getattr(simulador, campo))
+        return True
@@ -0,0 +1,111 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from simulator.parser import obter_escalonador
+from simulator.schedulers import suporta_smp
+from simulator.metricas import calcular_metricas
+from simulator.vetorizado import motivo_inelegivel, simular_simulador
+
+# Algoritmos nativos comparados: (nome exibido, nome para obter_escalonador, usa quantum)
+ALGORITMOS_NATIVOS = [
+    ('FIFO', 'FIFO', False),
+    ('RR', 'RR', True),
+    ('SRTF', 'SRTF', False),
+    ('PRIORIDADEP', 'PRIORIDADEP', False),
+    ('PRIOPEnv', 'PRIOPENV', False),
+    ('MLFQ', 'MLFQ', True),
+    ('CFS', 'CFS', True),
+]
+
+QUANTUM_PADRAO = 2  # usado pelo RR (e como base do MLFQ e do CFS) quando o config não define quantum
+ALPHA_PADRAO = 1    # usado pelo PRIOPEnv quando o config não define alpha
+
+def _contexto_processos():
+    # fork herda plugins e a carga já parseada sem reimportar nada
+    metodos = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in metodos else None)
+
+def _simular_algoritmo(simulador_base, nome, nome_escalonador, quantum, alpha, plugins):
+    """Executado em um processo de trabalho: roda a carga inteira com um algoritmo."""
+    inicio = time.time()
+    escalonador = obter_escalonador(nome_escalonador, quantum, alpha, plugins)
+    if escalonador is None:
+        raise ValueError(f"Algoritmo '{nome}' desconhecido.")
+
+    simulador = simulador_base  # cópia própria: chegou serializada para este processo
+    simulador.escalonador = escalonador
+    simulador.quantum = quantum
+    simulador.nome_algoritmo_config = nome
+    if hasattr(escalonador, 'alpha'):
+        simulador.nome_algoritmo_config += f" (Alpha={escalonador.alpha})"
+    simulador.intervalo_keyframe = 0  # ninguém volta no tempo aqui
+    if simulador.nivel_registro == 'COMPLETO':
+        simulador.definir_nivel_registro('LINHA_DO_TEMPO')
+    simulador.definir_semente(simulador.semente)
+    simulador.semear_random_global()
+
+    if motivo_inelegivel(simulador) is None:
+        # Carga sem ações: FIFO e RR saem da forma analítica, SRTF e PRIORIDADEP por eventos
+        resultado = simular_simulador(simulador)
+        resultado.aplicar(simulador, com_gantt=not simulador.so_metricas)
+        metricas = resultado.metricas()
+    else:
+        while not simulador.terminou():
+            simulador.tick()
+        metricas = calcular_metricas(simulador)
+
+    return {
+        'nome': simulador.nome_algoritmo_config,
+        'metricas': metricas,
+        'tempo': time.time() - inicio,
+        'gantt_log': simulador.gantt_log,
+        'tarefas': simulador.tarefas,
+        'bloqueio_log': simulador.bloqueio_log,
+        'mutex_event_log': simulador.mutex_event_log,
+        'io_log': simulador.io_log,
+    }
+
+def comparar_algoritmos(simulador_base, plugins=None, max_processos=None):
+    """
+    Roda a mesma carga (já parseada) com todos os algoritmos nativos e os plugins
+    carregados, cada um em um processo. Retorna a lista de resultados na ordem dos
+    algoritmos; algoritmos que falharem aparecem com a chave 'erro'. Com CPUS>1
+    ficam de fora os nativos que só têm a interface incremental (MLFQ, CFS).
+    """
+    quantum = simulador_base.quantum if simulador_base.quantum > 0 else QUANTUM_PADRAO
+    alpha = getattr(simulador_base.escalonador, 'alpha', 0) or ALPHA_PADRAO
+    smp = getattr(simulador_base, 'num_cpus', 1) > 1
+
+    trabalhos = []
+    for nome, nome_escalonador, usa_quantum in ALGORITMOS_NATIVOS:
+        if smp and not suporta_smp(obter_escalonador(nome_escalonador, quantum, alpha)): continue
+        trabalhos.append((nome, nome_escalonador, quantum if usa_quantum else 0))
+    for nome_plugin in sorted(plugins or {}):
+        trabalhos.append((nome_plugin, nome_plugin, simulador_base.quantum))
+
+    processos = max_processos or min(len(trabalhos), os.cpu_count() or 1)
+    resultados = []
+    with ProcessPoolExecutor(max_workers=processos, mp_context=_contexto_processos()) as executor:
+        futuros = [executor.submit(_simular_algoritmo, simulador_base, nome, nome_escalonador, q, alpha, plugins)
+                   for nome, nome_escalonador, q in trabalhos]
+        for (nome, _, _), futuro in zip(trabalhos, futuros):
+            try:
+                resultados.append(futuro.result())
+            except Exception as e:
+                resultados.append({'nome': nome, 'erro': str(e)})
+    return resultados
+
+def formatar_relatorio(resultados):
+    """Tabela comparativa com as métricas globais de cada algoritmo."""
+    linhas = [f"{'ALGORITMO':<22}{'MAKESPAN':>10}{'USO CPU':>9}{'ESPERA':>9}{'TURNAROUND':>12}"
+              f"{'DESPACHOS':>11}{'SORTEIOS':>10}{'TEMPO(s)':>10}"]
+    for r in resultados:
+        if 'erro' in r:
+            linhas.append(f"{r['nome']:<22}  ERRO: {r['erro']}")
+            continue
+        g = r['metricas']['global']
+        linhas.append(f"{r['nome']:<22}{g['makespan']:>10}{g['utilizacao_cpu'] * 100:>8.1f}%"
+                      f"{g['espera_media']:>9.2f}{g['turnaround_medio']:>12.2f}"
+                      f"{g['despachos']:>11}{g['sorteios']:>10}{r['tempo']:>10.3f}")
+    return "\n".join(linhas)
@@ -1,5 +1,18 @@
 from enum import Enum
+from collections import deque
+import heapq
 import copy  # SNAPSHOT
+import random
+from simulator.registros import CAMPOS_LOG, TAMANHO_MAX_PADRAO, DestinoMemoria
+
+# Tratamento de deadlock: evitar com o Banqueiro ou detectar ciclos no grafo de espera
+POLITICAS_DEADLOCK = ('BANQUEIRO', 'DETECCAO')
+
+# O que a simulação guarda a cada tick (veja Simulator.definir_nivel_registro)
+NIVEIS_REGISTRO = ('COMPLETO', 'LINHA_DO_TEMPO', 'METRICAS')
+
+INTERVALO_KEYFRAME_PADRAO = 20  # ticks entre snapshots da viagem no tempo
+SEMENTE_PADRAO = 0  # mesma config + mesma semente = mesma linha do tempo
 
 class TaskState(Enum):
     NOVA = 0
@@ -21,7 +34,15 @@ class TCB:
         self.tempo_espera = 0
         self.quantum_utilizado = 0
         self.tick_conclusao = -1
+        self.abortada = False  # vítima escolhida para desfazer um deadlock
+        self.ordem = 0         # ordem de adição ao Simulator (desempate das chegadas, ordem dos logs)
+        self.pronta_desde = 0  # escalonador incremental: 1º tick de espera na fila atual
         self.acoes = []
+
+        # Modo SMP: CPUs permitidas (None = qualquer uma), última CPU usada e migrações
+        self.afinidade = None
+        self.ultima_cpu = None
+        self.migracoes = 0
         
         #Para o Banqueiro saber o que a tarefa vai precisar no futuro
         self.recursos_maximos = set()
@@ -29,57 +50,280 @@ class TCB:
     def __repr__(self):
         return (f"TCB(id={self.id}, pd={self.prioridade_dinamica}, exec={self.tempo_executado}/{self.duracao})")
 
-    def to_debug_str(self):
+    def to_debug_str(self, espera=None):
         return (f"  - {self.id} (Prio Estática: {self.prioridade} | Dinâmica: {self.prioridade_dinamica}):\n"
                 f"    Estado: {self.estado.name}\n"
                 f"    Progresso: {self.tempo_executado} / {self.duracao}\n"
                 f"    Ingresso: {self.ingresso}\n"
-                f"    Espera: {self.tempo_espera} ticks")
+                f"    Espera: {self.tempo_espera if espera is None else espera} ticks")
+
+def indexar_tarefas(tarefas):
+    """
+    Índices derivados da lista de tarefas (veja Simulator.adicionar_tarefa):
+    id -> TCB e o heap (ingresso, ordem, TCB) das que ainda não ingressaram.
+    Usado quando a lista inteira é trocada (ex.: re-simulação incremental).
+    """
+    por_id = {}
+    chegadas = []
+    for ordem, t in enumerate(tarefas):
+        t.ordem = ordem
+        por_id[t.id] = t
+        if t.estado == TaskState.NOVA:
+            chegadas.append((t.ingresso, ordem, t))
+    heapq.heapify(chegadas)
+    return {'tarefas_por_id': por_id, 'chegadas': chegadas, 'proxima_ordem': len(tarefas)}
+
+class AdaptadorDecidir:
+    """
+    Expõe um escalonador que só implementa decidir(fila, atual, obrigatoria)
+    pela interface incremental usada pelo core: a fila de prontos mantida pelo
+    próprio Simulator é entregue inteira a cada decisão, como sempre foi.
+    """
+    def __init__(self, escalonador, fila_prontos):
+        self.escalonador = escalonador
+        self.fila_prontos = fila_prontos
+
+    def pick_next(self, tarefa_atual, mudanca_contexto_obrigatoria):
+        return self.escalonador.decidir(self.fila_prontos, tarefa_atual, mudanca_contexto_obrigatoria)
 
 class Simulator:
-    def __init__(self, escalonador, quantum):
+    def __init__(self, escalonador, quantum, intervalo_keyframe=INTERVALO_KEYFRAME_PADRAO, semente=SEMENTE_PADRAO):
         self.relogio_global = 0
         self.quantum = int(quantum)
         self.escalonador = escalonador
         self.nome_algoritmo_config = "Desconhecido"
         self.tarefas = []
-        self.fila_prontos = []
+        # Índices para não varrer self.tarefas a cada tick (veja indexar_tarefas)
+        self.tarefas_por_id = {}
+        self.chegadas = []        # heap (ingresso, ordem, TCB) das tarefas ainda NOVA
+        self.proxima_ordem = 0
+        self.fila_prontos = []    # escalonadores com decidir(); os incrementais têm a própria fila
+        self.prontas = {}         # escalonador incremental: id -> TCB pronta (contagem e exibição)
+        self.inicio_espera = 0    # pronta_desde de quem entra nos prontos agora
         self.tarefa_executando = None
-        self.gantt_log = []
-        self.bloqueio_log = []      
-        self.io_log = []            
-        self.mutex_event_log = [] 
+        # Logs de eventos: em memória por padrão; usar_destinos_log() troca por arquivos
+        self.gantt_log = DestinoMemoria()
+        self.bloqueio_log = DestinoMemoria()
+        self.io_log = DestinoMemoria()
+        self.mutex_event_log = DestinoMemoria()
+        self.formato_log = 'MEMORIA'  # destino dos logs no Modo Completo (opção LOG=)
+        self.tamanho_max_log = TAMANHO_MAX_PADRAO
+        self.nivel_registro = 'COMPLETO'
+        self.so_metricas = False
+        self.contadores = None  # só no nível METRICAS: substitui os logs em calcular_metricas
         self.tarefas_concluidas = 0
-        self.mutex_estado = {} 
-        self.mutex_fila = {}
+        self.mutex_estado = {}             # mutex -> tarefa dona
+        self.mutex_fila = {}               # mutex -> deque das tarefas bloqueadas nele
+        # Índices mantidos junto com mutex_estado/mutex_fila para não varrê-los inteiros
+        self.mutex_possuidos = {}          # tarefa -> {mutex: None} na ordem em que os obteve
+        self.mutex_livres_com_espera = set()
+        self.ordem_mutex_fila = {}         # mutex -> ordem de criação da fila (ordem de reavaliação)
         self.io_wait = {}           
-        self.historico = []
+        # Grafo de espera: tarefa bloqueada -> mutex que espera (o dono vem de mutex_estado)
+        self.aguardando_mutex = {}
+        self.politica_deadlock = 'BANQUEIRO'
+        self.abortar_vitima = False  # DETECCAO: aborta uma tarefa de cada ciclo encontrado
+        self.deadlocks = []          # [{'tick', 'ciclo': [(tarefa, mutex), ...], 'vitima'}]
+        self.intervalo_keyframe = int(intervalo_keyframe)
+        self.keyframes = {}  # tick -> capturar_estado() (fora do próprio snapshot)
+        self.despertar_escalonador = None  # proximo_despertar() do escalonador incremental
+        self.fonte_tarefas = None  # modo fluxo: tarefas chegando de um pipe/gerador (fluxo.FonteTarefas)
         self.scheduler_called_last_tick = False
         self.ultimo_log = "Simulação Iniciada."
+        self.definir_semente(semente)
+
+    def definir_semente(self, semente):
+        """O RNG do desempate pertence ao escalonador desta simulação (self.escalonador.rng)."""
+        self.semente = int(semente)
+        self.escalonador.rng = random.Random(self.semente)
+
+    def semear_random_global(self):
+        """
+        Semeia o módulo random global para plugins que ainda o usam direto.
+        Só quem é dono do processo chama (os laços do main e os processos de
+        trabalho): montar um Simulator não mexe no estado global.
+        """
+        random.seed(self.semente)
 
     def adicionar_tarefa(self, tcb):
-        for t in self.tarefas:
-            if t.id == tcb.id: return False 
+        if tcb.id in self.tarefas_por_id: return False
+        self.tarefas_por_id[tcb.id] = tcb
+        tcb.ordem = self.proxima_ordem
+        self.proxima_ordem += 1
         self.tarefas.append(tcb)
+        if tcb.estado == TaskState.NOVA:
+            heapq.heappush(self.chegadas, (tcb.ingresso, tcb.ordem, tcb))
         return True
 
+    def fila_de_prontos(self):
+        """Tarefas prontas na ordem de entrada: a lista do core ou, com escalonador incremental, o índice."""
+        return self.prontas.values() if self.prontas else self.fila_prontos
+
+    def tempo_espera(self, t):
+        """
+        Ticks de t na fila de prontos até agora. Com escalonador incremental a
+        espera em curso só é somada a t.tempo_espera quando a tarefa é escolhida.
+        """
+        if t.id in self.prontas:
+            return t.tempo_espera + self.relogio_global - t.pronta_desde
+        return t.tempo_espera
+
+    def definir_nivel_registro(self, nivel):
+        """
+        Escolhe o que é guardado a cada tick (antes do primeiro tick):
+        - COMPLETO: logs da linha do tempo e keyframes para voltar no tempo (passo-a-passo).
+        - LINHA_DO_TEMPO: só os logs (Gantt e métricas), sem keyframes.
+        - METRICAS: nenhum log; só os contadores agregados usados por calcular_metricas.
+        """
+        nivel = nivel.upper()
+        if nivel not in NIVEIS_REGISTRO:
+            raise ValueError(f"REGISTRO={nivel} inválido (use {', '.join(NIVEIS_REGISTRO)}).")
+        self.nivel_registro = nivel
+        self.so_metricas = nivel == 'METRICAS'
+        if nivel != 'COMPLETO':
+            self.keyframes = {}
+        self.contadores = None
+        if self.so_metricas:
+            self.contadores = {
+                'ocupados': 0, 'despachos': 0, 'sorteios': 0,
+                'ticks_sorteio': [],    # ticks com decisão por sorteio (análise Monte Carlo)
+                'ocupados_cpu': {},     # cpu -> ticks executando
+                'bloqueado': {},        # tarefa -> ticks em E/S ou esperando mutex
+                'ultimo_tick': {},      # tarefa -> último tick executado (detecta despachos)
+            }
+
+    def _contar_bloqueios(self):
+        # Bloqueadas são exatamente as em E/S e as que esperam mutex: não é preciso varrer as tarefas
+        bloqueado = self.contadores['bloqueado']
+        for tid in self.io_wait:
+            bloqueado[tid] = bloqueado.get(tid, 0) + 1
+        for tid in self.aguardando_mutex:
+            bloqueado[tid] = bloqueado.get(tid, 0) + 1
+
+    def _registrar_bloqueios(self):
+        """
+        Logs de E/S e de espera por mutex do tick, na ordem das tarefas. As bloqueadas
+        são exatamente as de io_wait e aguardando_mutex: não é preciso varrer as tarefas.
+        """
+        if self.so_metricas:
+            self._contar_bloqueios()
+            return
+        ordem = lambda tid: self.tarefas_por_id[tid].ordem
+        for tid in sorted(self.io_wait, key=ordem):
+            self.io_log.append({'tick': self.relogio_global, 'task_id': tid})
+        for tid in sorted(self.aguardando_mutex, key=ordem):
+            self.bloqueio_log.append({'tick': self.relogio_global, 'task_id': tid})
+
+    def _contar_execucao(self, t, sorteio, cpu=0):
+        c = self.contadores
+        c['ocupados'] += 1
+        c['ocupados_cpu'][cpu] = c['ocupados_cpu'].get(cpu, 0) + 1
+        if sorteio:
+            c['sorteios'] += 1
+            c['ticks_sorteio'].append(self.relogio_global)
+        if c['ultimo_tick'].get(t.id) != self.relogio_global - 1:
+            c['despachos'] += 1
+        c['ultimo_tick'][t.id] = self.relogio_global
+
+    def _registrar_mutex(self, t, tipo, m_id):
+        if not self.so_metricas:
+            self.mutex_event_log.append({'tick': self.relogio_global, 'task_id': t.id, 'tipo': tipo, 'mutex': m_id})
+
+    def usar_destinos_log(self, destinos):
+        """
+        Passa a gravar os logs nos destinos dados ({campo: destino}, veja
+        registros.criar_destinos_log). Entradas já registradas são copiadas.
+        """
+        for campo in CAMPOS_LOG:
+            destino = destinos[campo]
+            destino.extend(getattr(self, campo))
+            setattr(self, campo, destino)
+
+    def usar_fonte_tarefas(self, fonte):
+        """
+        Modo fluxo (sistema aberto): no início de cada tick a fonte remove da memória
+        as tarefas concluídas e admite as que ingressam; terminou() espera o fim do fluxo.
+        Só no nível METRICAS, para que nada cresça com a quantidade de tarefas.
+        """
+        if not self.so_metricas:
+            raise ValueError("O modo fluxo exige REGISTRO=METRICAS.")
+        self.fonte_tarefas = fonte
+
+    def fechar_logs(self):
+        """Grava o que estiver em buffer e fecha os arquivos dos destinos."""
+        for campo in CAMPOS_LOG:
+            getattr(self, campo).fechar()
+
     def terminou(self):
-        return self.tarefas_concluidas == len(self.tarefas)
+        """Todas concluídas, ou todas as restantes presas em mutex (deadlock sem recuperação)."""
+        if self.fonte_tarefas is not None and not self.fonte_tarefas.esgotada():
+            return False
+        restantes = len(self.tarefas) - self.tarefas_concluidas
+        return restantes == 0 or restantes == len(self.aguardando_mutex)
+
+    def inserir_tarefa_dinamica(self, tcb):
+        """
+        Insere uma tarefa no meio da execução (comando 'n' do debugger).
+        A linha do tempo diverge a partir daqui: keyframes futuros são descartados
+        e um novo keyframe guarda o estado já com a tarefa.
+        """
+        if not self.adicionar_tarefa(tcb): return False
+        for tick in [k for k in self.keyframes if k >= self.relogio_global]:
+            del self.keyframes[tick]
+        self.keyframes[self.relogio_global] = self.capturar_estado()
+        return True
 
-    def salvar_estado(self):
-        historico_temp = self.historico
-        self.historico = [] 
-        snapshot = copy.deepcopy(self)
-        self.historico = historico_temp
-        self.historico.append(snapshot)
+    def ir_para_tick(self, alvo):
+        """
+        Viagem no tempo para qualquer tick (para trás ou para frente).
+        Para trás, restaura o keyframe mais próximo <= alvo e reexecuta os ticks
+        restantes, o que é determinístico porque o keyframe inclui o estado do RNG.
+        Para frente só reexecuta: keyframes não guardam os logs, então pular para
+        um keyframe adiante deixaria buracos no Gantt.
+        """
+        alvo = max(0, int(alvo))
+        if alvo < self.relogio_global:
+            anteriores = [k for k in self.keyframes if k <= alvo]
+            if anteriores:
+                base = max(anteriores)
+                self.restaurar_estado(self.keyframes[base])
+                # Keyframes adiante podem ser de uma linha do tempo desfeita (ex.: tarefa
+                # inserida e depois voltada); os periódicos são refeitos no replay
+                for tick in [k for k in self.keyframes if k > base]:
+                    del self.keyframes[tick]
+        while self.relogio_global < alvo and not self.terminou():
+            self.tick()
+        return self.relogio_global
 
     def voltar_tick(self):
-        if not self.historico: return False
-        ultimo_estado = self.historico.pop()
-        historico_atual = self.historico
-        self.__dict__.update(ultimo_estado.__dict__)
-        self.historico = historico_atual
-        return True
+        """Volta um tick. False se o relógio não mudou (tick 0 ou nenhum keyframe anterior)."""
+        if self.relogio_global == 0: return False
+        relogio = self.relogio_global
+        return self.ir_para_tick(relogio - 1) < relogio
+
+    def capturar_estado(self, copiar=True):
+        """
+        Snapshot compacto do estado (tarefas, filas, mutex, E/S, escalonador e RNG).
+        Não copia os logs nem os keyframes: o custo não cresce com os ticks.
+        copiar=False devolve referências ao estado atual, para quem vai serializá-lo
+        na hora (o pickle já é uma cópia, bem mais barata que o deepcopy).
+        """
+        estado = {k: v for k, v in self.__dict__.items()
+                  if k not in CAMPOS_LOG and k not in ('keyframes', 'fonte_tarefas')}
+        if copiar:
+            estado = copy.deepcopy(estado)
+        estado['_tamanhos_log'] = {campo: len(getattr(self, campo)) for campo in CAMPOS_LOG}
+        estado['_random_global'] = random.getstate()
+        return estado
+
+    def restaurar_estado(self, estado):
+        """Restaura um snapshot de capturar_estado(), truncando os logs ao tamanho salvo."""
+        estado = copy.deepcopy(estado)
+        tamanhos = estado.pop('_tamanhos_log')
+        random.setstate(estado.pop('_random_global'))
+        self.__dict__.update(estado)
+        for campo in CAMPOS_LOG:
+            del getattr(self, campo)[tamanhos[campo]:]
 
     def get_debug_info(self):
         status_scheduler = "ATIVO" if self.scheduler_called_last_tick else "INATIVO"
@@ -97,10 +341,16 @@ class Simulator:
             io_str = ", ".join([f"{tid}({rest}t)" for tid, rest in self.io_wait.items()])
             bloq_info += f"\nEM E/S (WAIT): {io_str}"
 
-        prontos = [t.id for t in self.fila_prontos]
+        if self.deadlocks:
+            ultimo = self.deadlocks[-1]
+            ciclo = " -> ".join(f"{tid}(M{m_id})" for tid, m_id in ultimo['ciclo'])
+            vitima = f", vítima {ultimo['vitima']}" if ultimo['vitima'] else ""
+            bloq_info += f"\nDEADLOCKS: {len(self.deadlocks)} (último no tick {ultimo['tick']}: {ciclo}{vitima})"
+
+        prontos = [t.id for t in self.fila_de_prontos()]
         fila_info = f"FILA DE PRONTOS: {prontos}"
         tasks_info = "\nESTADO DAS TAREFAS:\n" + "\n".join(
-            [t.to_debug_str() for t in self.tarefas if t.estado != TaskState.NOVA]
+            [t.to_debug_str(self.tempo_espera(t)) for t in self.tarefas if t.estado != TaskState.NOVA]
         )
         return "\n".join([header, log_info, exec_info, fila_info + bloq_info, tasks_info])
 
@@ -149,31 +399,107 @@ class Simulator:
         # Se todos conseguem terminar, o estado é seguro
         return all(terminados.values())
 
+    def _pode_conceder(self):
+        """Com o Banqueiro, a concessão (já registrada em mutex_estado) precisa deixar o estado seguro."""
+        return self.politica_deadlock == 'DETECCAO' or self.verificar_estado_seguro()
+
+    def _definir_dono(self, m_id, task_id):
+        self.mutex_estado[m_id] = task_id
+        self.mutex_possuidos.setdefault(task_id, {})[m_id] = None
+        self.mutex_livres_com_espera.discard(m_id)
+
+    def _liberar_mutex(self, m_id):
+        """Tira o dono do mutex; se alguém espera por ele, passa a ser um livre com espera."""
+        dono = self.mutex_estado.pop(m_id)
+        possuidos = self.mutex_possuidos[dono]
+        del possuidos[m_id]
+        if not possuidos: del self.mutex_possuidos[dono]
+        if self.mutex_fila.get(m_id):
+            self.mutex_livres_com_espera.add(m_id)
+
+    def _bloquear_em_mutex(self, t, m_id):
+        t.estado = TaskState.BLOQUEADA
+        if m_id not in self.mutex_fila:
+            self.mutex_fila[m_id] = deque()
+            self.ordem_mutex_fila[m_id] = len(self.ordem_mutex_fila)
+        self.mutex_fila[m_id].append(t)
+        self.aguardando_mutex[t.id] = m_id
+        if m_id not in self.mutex_estado:
+            self.mutex_livres_com_espera.add(m_id)
+
+    def _acordar_primeiro_da_fila(self, m_id):
+        """O primeiro da fila (já registrado como dono do mutex) volta para os prontos."""
+        t_acordada = self.mutex_fila[m_id].popleft()
+        del self.aguardando_mutex[t_acordada.id]
+        t_acordada.estado = TaskState.PRONTA
+        self._enfileirar_pronta(t_acordada)
+        return t_acordada
+
+    def detectar_ciclo(self, t):
+        """
+        Procura um ciclo no grafo de espera passando por t, que acabou de bloquear.
+        Cada tarefa espera no máximo um mutex e cada mutex tem um dono, então há
+        um único caminho a seguir (t -> mutex -> dono -> mutex...): o custo é o
+        tamanho da cadeia, e não o do sistema. Retorna [(tarefa_id, mutex)] ou None.
+        """
+        ciclo = []
+        visitadas = set()
+        atual = t.id
+        while atual not in visitadas:
+            m_id = self.aguardando_mutex.get(atual)
+            if m_id is None: return None
+            visitadas.add(atual)
+            ciclo.append((atual, m_id))
+            atual = self.mutex_estado.get(m_id)
+            if atual is None: return None
+        # Voltar a outra tarefa seria um ciclo antigo, já relatado quando se formou
+        return ciclo if atual == t.id else None
+
+    def _tratar_deadlock(self, ciclo):
+        """Registra o ciclo e, se configurado, aborta a vítima: menor prioridade, depois a que chegou por último."""
+        descricao = " -> ".join(f"{tid} espera M{m_id}" for tid, m_id in ciclo)
+        log = f" [DEADLOCK: {descricao}] "
+        vitima = None
+        if self.abortar_vitima:
+            vitima = min((self.tarefas_por_id[tid] for tid, _ in ciclo), key=lambda x: (x.prioridade, -x.ingresso, x.id))
+            log += self._abortar_tarefa(vitima)
+        self.deadlocks.append({'tick': self.relogio_global, 'ciclo': ciclo, 'vitima': vitima.id if vitima else None})
+        return log
+
+    def _abortar_tarefa(self, t):
+        """Encerra uma tarefa bloqueada em mutex e devolve os mutexes que ela tinha."""
+        m_id = self.aguardando_mutex.pop(t.id)
+        self.mutex_fila[m_id].remove(t)
+        if not self.mutex_fila[m_id]: self.mutex_livres_com_espera.discard(m_id)
+        t.estado = TaskState.TERMINADA
+        t.abortada = True
+        t.tick_conclusao = self.relogio_global
+        t.acoes = []
+        self.tarefas_concluidas += 1
+        self._avisar_saida(t)
+        return f" [{t.id} Abortada] " + self.liberar_recursos_da_tarefa(t)
+
     # Acorda tarefas barradas pelo Banqueiro
     def tentar_desbloquear_espera_segura(self):
         log_desbloqueio = ""
-        # Verifica todas as filas de mutex
-        for m_id, fila in self.mutex_fila.items():
-            if not fila: continue
-            
-            # Só nos interessa se o recurso está livre (dono is None).
-            # Se estiver ocupado, o desbloqueio normal do MU cuida dele.
-            if self.mutex_estado.get(m_id) is None:
-                candidato = fila[0]
-                
-                # Simula alocação
-                self.mutex_estado[m_id] = candidato.id
-                eh_seguro = self.verificar_estado_seguro()
-                
-                if eh_seguro:
-                    # Agora é seguro, acorda a tarefa.
-                    t_acordada = fila.pop(0)
-                    t_acordada.estado = TaskState.PRONTA
-                    self.fila_prontos.append(t_acordada)
-                    log_desbloqueio += f" [Banqueiro Liberou: {t_acordada.id} para M{m_id}] "
-                else:
-                    # Ainda inseguro, desfaz
-                    del self.mutex_estado[m_id]
+        # Na detecção o mutex liberado passa direto ao primeiro da fila: ninguém fica barrado
+        if self.politica_deadlock == 'DETECCAO': return log_desbloqueio
+        # Só nos interessam os mutexes livres com fila (os ocupados são resolvidos no MU),
+        # reavaliados na ordem em que as filas surgiram
+        for m_id in sorted(self.mutex_livres_com_espera, key=self.ordem_mutex_fila.__getitem__):
+            candidato = self.mutex_fila[m_id][0]
+
+            # Simula alocação
+            self._definir_dono(m_id, candidato.id)
+            eh_seguro = self.verificar_estado_seguro()
+
+            if eh_seguro:
+                # Agora é seguro, acorda a tarefa.
+                t_acordada = self._acordar_primeiro_da_fila(m_id)
+                log_desbloqueio += f" [Banqueiro Liberou: {t_acordada.id} para M{m_id}] "
+            else:
+                # Ainda inseguro, desfaz
+                self._liberar_mutex(m_id)
         return log_desbloqueio
 
     # Auxiliar para acoes das tarefas
@@ -202,53 +528,45 @@ class Simulator:
                 # 1. Eu já sou o dono? (Pré-alocado pelo Banqueiro)
                 if dono == t.id:
                     log_acoes += f" [Lock M{m_id} Confirmado (Pré-alocado)] "
-                    self.mutex_event_log.append({
-                        'tick': self.relogio_global, 'task_id': t.id, 'tipo': 'ML', 'mutex': m_id
-                    })
+                    self._registrar_mutex(t, 'ML', m_id)
                     t.acoes.remove(acao)
 
                 # 2. Outra pessoa é dona? Bloqueia.
                 elif dono is not None:
                     log_acoes += f" [Lock M{m_id} Ocupado -> Bloqueado] "
-                    self.mutex_event_log.append({
-                        'tick': self.relogio_global, 'task_id': t.id, 'tipo': 'ML_FAIL', 'mutex': m_id
-                    })
+                    self._registrar_mutex(t, 'ML_FAIL', m_id)
                     
                     # Herança de Prioridade
                     dono_id = self.mutex_estado[m_id]
-                    t_dono = next((x for x in self.tarefas if x.id == dono_id), None)
+                    t_dono = self.tarefas_por_id.get(dono_id)
                     if t_dono and t.prioridade_dinamica > t_dono.prioridade_dinamica:
                         prio_antiga = t_dono.prioridade_dinamica
                         t_dono.prioridade_dinamica = t.prioridade_dinamica
                         log_acoes += f" [Herança: {t_dono.id} ({prio_antiga}->{t_dono.prioridade_dinamica}) de {t.id}] "
 
-                    t.estado = TaskState.BLOQUEADA
-                    if m_id not in self.mutex_fila: self.mutex_fila[m_id] = []
-                    self.mutex_fila[m_id].append(t)
+                    self._bloquear_em_mutex(t, m_id)
+                    if self.politica_deadlock == 'DETECCAO':
+                        ciclo = self.detectar_ciclo(t)
+                        if ciclo: log_acoes += self._tratar_deadlock(ciclo)
                     bloqueou = True
                     break
 
-                # 3. Está livre? Verifica Banqueiro
+                # 3. Está livre? Verifica Banqueiro (na detecção, concede direto)
                 else:
-                    self.mutex_estado[m_id] = t.id
-                    eh_seguro = self.verificar_estado_seguro()
+                    self._definir_dono(m_id, t.id)
+                    eh_seguro = self._pode_conceder()
                     
                     if eh_seguro:
-                        log_acoes += f" [Lock M{m_id} Sucesso (Seguro)] "
-                        self.mutex_event_log.append({
-                            'tick': self.relogio_global, 'task_id': t.id, 'tipo': 'ML', 'mutex': m_id
-                        })
+                        seguro = " (Seguro)" if self.politica_deadlock == 'BANQUEIRO' else ""
+                        log_acoes += f" [Lock M{m_id} Sucesso{seguro}] "
+                        self._registrar_mutex(t, 'ML', m_id)
                         t.acoes.remove(acao)
                     else:
-                        del self.mutex_estado[m_id]
+                        self._liberar_mutex(m_id)
                         log_acoes += f" [Lock M{m_id} NEGADO (Inseguro) -> Bloqueado] "
-                        self.mutex_event_log.append({
-                            'tick': self.relogio_global, 'task_id': t.id, 'tipo': 'ML_FAIL', 'mutex': m_id
-                        })
+                        self._registrar_mutex(t, 'ML_FAIL', m_id)
                         
-                        t.estado = TaskState.BLOQUEADA
-                        if m_id not in self.mutex_fila: self.mutex_fila[m_id] = []
-                        self.mutex_fila[m_id].append(t)
+                        self._bloquear_em_mutex(t, m_id)
                         bloqueou = True
                         break
                     
@@ -256,29 +574,25 @@ class Simulator:
                 m_id = acao['mutex']
                 dono = self.mutex_estado.get(m_id)
                 if dono == t.id:
-                    del self.mutex_estado[m_id]
+                    self._liberar_mutex(m_id)
                     log_acoes += f" [Unlock M{m_id}] "
                     if t.prioridade_dinamica > t.prioridade:
                         t.prioridade_dinamica = t.prioridade
                         log_acoes += f" [Prio Reset: {t.id}] "
                     
-                    self.mutex_event_log.append({
-                        'tick': self.relogio_global, 'task_id': t.id, 'tipo': 'MU', 'mutex': m_id
-                    })
+                    self._registrar_mutex(t, 'MU', m_id)
                     t.acoes.remove(acao)
                     
                     # 1. Desbloqueio Padrão (Fila de espera normal)
-                    if m_id in self.mutex_fila and self.mutex_fila[m_id]:
+                    if self.mutex_fila.get(m_id):
                         candidato = self.mutex_fila[m_id][0]
                         # Banqueiro de novo para garantir
-                        self.mutex_estado[m_id] = candidato.id
-                        if self.verificar_estado_seguro():
-                            t_acordada = self.mutex_fila[m_id].pop(0)
-                            t_acordada.estado = TaskState.PRONTA
-                            self.fila_prontos.append(t_acordada)
+                        self._definir_dono(m_id, candidato.id)
+                        if self._pode_conceder():
+                            t_acordada = self._acordar_primeiro_da_fila(m_id)
                             log_acoes += f" [{t_acordada.id} Desbloqueada] "
                         else:
-                            del self.mutex_estado[m_id]
+                            self._liberar_mutex(m_id)
 
                     # 2. Desbloqueio Global (Banqueiro)
                     log_acoes += self.tentar_desbloquear_espera_segura()
@@ -289,11 +603,66 @@ class Simulator:
 
         return log_acoes, bloqueou
 
-    def tick(self):
-        self.salvar_estado() 
-        self.scheduler_called_last_tick = False
-        log_eventos_tick = ""
-        precisa_escalonar = False
+    def liberar_recursos_da_tarefa(self, t):
+        """Devolve os mutexes de uma tarefa que terminou, acordando quem espera por eles."""
+        mutexes_possuidos = list(self.mutex_possuidos.get(t.id, ()))
+        liberou_algo = False
+        for m_id in mutexes_possuidos:
+            self._liberar_mutex(m_id)
+            if self.mutex_fila.get(m_id):
+                candidato = self.mutex_fila[m_id][0]
+                self._definir_dono(m_id, candidato.id)
+                if self._pode_conceder():
+                    self._acordar_primeiro_da_fila(m_id)
+                else:
+                    self._liberar_mutex(m_id)
+            liberou_algo = True
+        
+        # Se liberou, reavaliar o Banqueiro Global
+        if liberou_algo:
+            return self.tentar_desbloquear_espera_segura()
+        return ""
+
+    def _enfileirar_pronta(self, t):
+        """Ponto único de entrada na fila de prontos (o modo SMP escolhe a fila da CPU)."""
+        if self.escalonador.incremental:
+            # A fila é do escalonador: aqui só o índice e o início da espera, sem varrer nada
+            t.pronta_desde = self.inicio_espera
+            self.prontas[t.id] = t
+            self.escalonador.on_ready(t)
+        else:
+            self.fila_prontos.append(t)
+
+    def _retirar_pronta(self, t):
+        """A escolhida sai dos prontos; no incremental a espera acumulada é somada de uma vez."""
+        if self.escalonador.incremental:
+            if self.prontas.pop(t.id, None) is not None:
+                t.tempo_espera += self.relogio_global - t.pronta_desde + 1
+        elif t in self.fila_prontos:
+            self.fila_prontos.remove(t)
+
+    def _avisar_saida(self, t):
+        """Ponto único do on_exit: a tarefa terminou ou foi abortada (o modo SMP não emite eventos)."""
+        if self.escalonador.incremental:
+            self.escalonador.on_exit(t)
+
+    def _politica(self):
+        """Escalonador pela interface incremental; os que só têm decidir() passam pelo adaptador."""
+        if self.escalonador.incremental:
+            return self.escalonador
+        return AdaptadorDecidir(self.escalonador, self.fila_prontos)
+
+    def _registrar_keyframe(self):
+        if self.nivel_registro == 'COMPLETO' and self.intervalo_keyframe > 0 and self.relogio_global % self.intervalo_keyframe == 0:
+            if self.relogio_global not in self.keyframes:
+                self.keyframes[self.relogio_global] = self.capturar_estado()
+
+    def _processar_chegadas(self):
+        """Passos 1 e 2 do tick: retornos de E/S e ingressos. Retorna (log, houve_chegada)."""
+        log_chegadas = ""
+        houve_chegada = False
+        if self.fonte_tarefas is not None:
+            self.fonte_tarefas.admitir(self)
 
         # 1. Processar Retorno de IO
         tarefas_retornando_io = []
@@ -304,31 +673,47 @@ class Simulator:
                 tarefas_retornando_io.append(tid)
         
         for tid in tarefas_retornando_io:
-            t_retorno = next((t for t in self.tarefas if t.id == tid), None)
+            t_retorno = self.tarefas_por_id.get(tid)
             if t_retorno:
                 t_retorno.estado = TaskState.PRONTA
-                self.fila_prontos.append(t_retorno)
-                log_eventos_tick += f" [{t_retorno.id} Retornou de E/S] "
-                precisa_escalonar = True
-
-        # 2. Ingressos
-        for t in self.tarefas:
+                self._enfileirar_pronta(t_retorno)
+                log_chegadas += f" [{t_retorno.id} Retornou de E/S] "
+                houve_chegada = True
+
+        # 2. Ingressos (heap por ingresso; uma tarefa com ingresso já passado nunca ingressa)
+        chegadas = self.chegadas
+        while chegadas and chegadas[0][0] <= self.relogio_global:
+            t = heapq.heappop(chegadas)[2]
             if t.estado == TaskState.NOVA and t.ingresso == self.relogio_global:
                 t.estado = TaskState.PRONTA
-                self.fila_prontos.append(t)
-                log_eventos_tick += f" [{t.id} Ingressou] "
-                precisa_escalonar = True 
+                self._enfileirar_pronta(t)
+                log_chegadas += f" [{t.id} Ingressou] "
+                houve_chegada = True 
+
+        return log_chegadas, houve_chegada
+
+    def tick(self):
+        self._registrar_keyframe()
+        self.scheduler_called_last_tick = False
+        incremental = self.escalonador.incremental
 
-        # Aging
+        # 1. e 2. Retornos de E/S e Ingressos (a espera de quem chega conta já neste tick)
+        self.inicio_espera = self.relogio_global
+        log_eventos_tick, precisa_escalonar = self._processar_chegadas()
+
+        # Aging. Com escalonador incremental a espera vem de pronta_desde (_retirar_pronta)
+        # e o envelhecimento de prioridade, se houver, é do próprio escalonador
         tem_alpha = hasattr(self.escalonador, 'alpha')
-        for t in self.fila_prontos:
-            t.tempo_espera += 1
-            if tem_alpha:
-                t.prioridade_dinamica += self.escalonador.alpha
-                if self.tarefa_executando:
-                    if t.prioridade_dinamica > self.tarefa_executando.prioridade_dinamica:
-                        precisa_escalonar = True
-                        log_eventos_tick += f" [Aging: {t.id} > {self.tarefa_executando.id}] "
+        if not incremental:
+            for t in self.fila_prontos:
+                t.tempo_espera += 1
+                if tem_alpha:
+                    t.prioridade_dinamica += self.escalonador.alpha
+                    if self.tarefa_executando:
+                        if t.prioridade_dinamica > self.tarefa_executando.prioridade_dinamica:
+                            precisa_escalonar = True
+                            log_eventos_tick += f" [Aging: {t.id} > {self.tarefa_executando.id}] "
+        self.inicio_espera = self.relogio_global + 1
 
         preemptar_quantum = False
         tarefa_bloqueou_agora = False
@@ -343,6 +728,9 @@ class Simulator:
                 self.tarefa_executando = None
                 tarefa_bloqueou_agora = True
                 precisa_escalonar = True
+                # Se foi abortada como vítima de deadlock no mesmo passo, _abortar_tarefa já avisou a saída
+                if incremental and t.estado != TaskState.TERMINADA:
+                    self.escalonador.on_block(t)
             else:
                 # Verificações de fim de tarefa / quantum
                 if t.tempo_executado == t.duracao:
@@ -350,42 +738,38 @@ class Simulator:
                     t.tick_conclusao = self.relogio_global 
                     self.tarefas_concluidas += 1
                     log_eventos_tick += f" [{t.id} Terminou] "
+                    self._avisar_saida(t)
                     
                     # Libera recursos ao terminar
-                    mutexes_possuidos = [k for k,v in self.mutex_estado.items() if v == t.id]
-                    liberou_algo = False
-                    for m_id in mutexes_possuidos:
-                        del self.mutex_estado[m_id]
-                        if m_id in self.mutex_fila and self.mutex_fila[m_id]:
-                            candidato = self.mutex_fila[m_id][0]
-                            self.mutex_estado[m_id] = candidato.id
-                            if self.verificar_estado_seguro():
-                                t_acordada = self.mutex_fila[m_id].pop(0)
-                                t_acordada.estado = TaskState.PRONTA
-                                self.fila_prontos.append(t_acordada)
-                            else:
-                                del self.mutex_estado[m_id]
-                        liberou_algo = True
-                    
-                    # Se liberou, reavaliar o Banqueiro Global
-                    if liberou_algo:
-                        log_eventos_tick += self.tentar_desbloquear_espera_segura()
+                    log_eventos_tick += self.liberar_recursos_da_tarefa(t)
 
                     self.tarefa_executando = None
                     precisa_escalonar = True 
-                elif t.quantum_utilizado == self.quantum and self.escalonador.usar_quantum:
-                    preemptar_quantum = True 
-                    log_eventos_tick += f" [{t.id} Estourou Quantum] "
-                    precisa_escalonar = True 
+                else:
+                    # on_tick vale para todo tick em que a tarefa segue na CPU, mesmo com o quantum estourado
+                    pedido = incremental and (self.escalonador.on_tick(t, self.relogio_global) or
+                                              (self.despertar_escalonador is not None and
+                                               self.relogio_global >= self.despertar_escalonador))
+                    if t.quantum_utilizado == self.quantum and self.escalonador.usar_quantum:
+                        preemptar_quantum = True 
+                        log_eventos_tick += f" [{t.id} Estourou Quantum] "
+                        precisa_escalonar = True 
+                    elif pedido:
+                        preemptar_quantum = True
+                        log_eventos_tick += f" [{t.id} Preempção pedida pelo escalonador] "
+                        precisa_escalonar = True
 
-        elif self.fila_prontos:
+        elif self.fila_prontos or self.prontas:
             precisa_escalonar = True
 
         # 4. Escalonador
         houve_sorteio = False
         if precisa_escalonar:
             self.scheduler_called_last_tick = True
-            proxima_tarefa, houve_sorteio = self.escalonador.decidir(self.fila_prontos, self.tarefa_executando, preemptar_quantum)
+            politica = self._politica()
+            proxima_tarefa, houve_sorteio = politica.pick_next(self.tarefa_executando, preemptar_quantum)
+            if incremental:
+                self.despertar_escalonador = politica.proximo_despertar(self.relogio_global)
             
             if proxima_tarefa and tem_alpha:
                 proxima_tarefa.prioridade_dinamica = proxima_tarefa.prioridade
@@ -397,13 +781,12 @@ class Simulator:
                 if t_antigo and t_antigo.estado == TaskState.EXECUTANDO:
                     t_antigo.estado = TaskState.PRONTA
                     t_antigo.quantum_utilizado = 0     
-                    self.fila_prontos.append(t_antigo)
+                    self._enfileirar_pronta(t_antigo)
                     log_eventos_tick += f" [{t_antigo.id} -> Prontos] "
                 
                 self.tarefa_executando = proxima_tarefa
                 if self.tarefa_executando: 
-                    if self.tarefa_executando in self.fila_prontos:
-                         self.fila_prontos.remove(self.tarefa_executando)
+                    self._retirar_pronta(self.tarefa_executando)
                     self.tarefa_executando.estado = TaskState.EXECUTANDO
                     self.tarefa_executando.quantum_utilizado = 0
                     log_eventos_tick += f" [Escalonador escolheu {self.tarefa_executando.id}] "
@@ -412,6 +795,8 @@ class Simulator:
                     log_acoes_nova, bloqueou_nova = self.processar_acoes_da_tarefa(self.tarefa_executando)
                     log_eventos_tick += log_acoes_nova
                     if bloqueou_nova:
+                         if incremental and self.tarefa_executando.estado != TaskState.TERMINADA:
+                             self.escalonador.on_block(self.tarefa_executando)
                          self.tarefa_executando = None
         
         elif self.tarefa_executando and preemptar_quantum:
@@ -419,20 +804,20 @@ class Simulator:
              log_eventos_tick += f" [{self.tarefa_executando.id} Renovou Quantum] "
 
         # LOGS DE ESTADO (Para o Gantt)
-        for t in self.tarefas:
-            if t.id in self.io_wait:
-                self.io_log.append({'tick': self.relogio_global, 'task_id': t.id})
-            elif t.estado == TaskState.BLOQUEADA:
-                self.bloqueio_log.append({'tick': self.relogio_global, 'task_id': t.id})
+        self._registrar_bloqueios()
 
         if self.tarefa_executando:
             t = self.tarefa_executando
             t.tempo_executado += 1
             t.quantum_utilizado += 1 
-            self.gantt_log.append({'tick': self.relogio_global, 'task_id': t.id, 'cor': t.cor, 'sorteio': houve_sorteio})
+            if self.so_metricas:
+                self._contar_execucao(t, houve_sorteio)
+            else:
+                self.gantt_log.append({'tick': self.relogio_global, 'task_id': t.id, 'cor': t.cor, 'sorteio': houve_sorteio})
             log_eventos_tick += f" [{t.id} Executou] " 
         else:
-            self.gantt_log.append({'tick': self.relogio_global, 'task_id': 'idle', 'cor': '#FFFFFF', 'sorteio': False})
+            if not self.so_metricas:
+                self.gantt_log.append({'tick': self.relogio_global, 'task_id': 'idle', 'cor': '#FFFFFF', 'sorteio': False})
             log_eventos_tick += " [CPU Ociosa] "
 
         self.relogio_global += 1
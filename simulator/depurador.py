@@ -0,0 +1,248 @@
+from collections import Counter
+from fnmatch import fnmatchcase
+from itertools import islice
+from simulator.core import TaskState
+
+TAMANHO_PAGINA_PADRAO = 20
+LIMITE_IDS = 15            # ids mostrados por fila antes de resumir em "(+N)"
+LIMITE_ALTERACOES = 50     # linhas de alteração por passo
+LIMITE_EVENTOS = 2000      # caracteres do log do tick
+
+def _executando(simulador):
+    """Ids em execução: slots das CPUs no modo SMP, senão a tarefa atual."""
+    cpus = getattr(simulador, 'cpus', None)
+    if cpus is not None:
+        return {t.id for t in cpus if t}
+    return {simulador.tarefa_executando.id} if simulador.tarefa_executando else set()
+
+def _bloqueadas(simulador):
+    return set(simulador.io_wait) | set(simulador.aguardando_mutex)
+
+def _ids_resumidos(itens, total, limite=LIMITE_IDS):
+    ids = [getattr(x, 'id', x) for x in islice(itens, limite)]
+    resto = f" (+{total - len(ids)})" if total > len(ids) else ""
+    return f"{ids}{resto}"
+
+def _resumo(t):
+    return (t.estado.name, t.tempo_executado)
+
+class VisaoDepurador:
+    """
+    Visão do modo passo-a-passo que mostra só o que mudou desde o passo anterior.
+
+    Em vez de varrer todas as tarefas, cada avanço de um tick olha apenas as que
+    os eventos do tick podem ter alterado: as que ingressaram, as que estavam ou
+    estão na CPU e as que entraram ou saíram de E/S ou da espera por mutex. Um
+    resumo (estado, progresso) por tarefa guarda o último valor mostrado, e a
+    contagem por estado é atualizada junto. Voltar no tempo, pular ticks ou
+    restaurar um keyframe reconstrói a visão inteira uma vez.
+
+    Filtros (padrão de id no estilo 'T1*' e conjunto de estados) valem para as
+    alterações e para a listagem paginada; as tarefas observadas aparecem
+    sempre, com todos os detalhes.
+    """
+    def __init__(self, padrao=None, estados=None, tamanho_pagina=TAMANHO_PAGINA_PADRAO):
+        self.padrao = padrao
+        self.estados = set(estados or ())
+        self.observadas = []
+        self.tamanho_pagina = max(1, int(tamanho_pagina))
+        self.pagina = 0
+        self.mostrar_lista = False
+
+        self.alteracoes = []       # [(tarefa_id, resumo anterior ou None, resumo atual)]
+        self.reconstruida = False
+        self.contagem = Counter()
+        self._tick = None
+        self._tarefas = None
+        self._quantidade = 0
+        self._resumos = {}
+        self._por_id = {}
+        self._por_ingresso = {}
+        self._executando = set()
+        self._bloqueadas = set()
+
+    # --- Filtros, observação e paginação ---
+
+    def definir_filtro(self, padrao=None, estados=None):
+        estados = {e.strip().upper() for e in (estados or ()) if e.strip()}
+        invalidos = estados - set(TaskState.__members__)
+        if invalidos:
+            raise ValueError(f"Estado(s) desconhecido(s): {', '.join(sorted(invalidos))}.")
+        self.padrao = padrao or None
+        self.estados = estados
+        self.pagina = 0
+
+    def alternar_observada(self, task_id):
+        """Inclui a tarefa na lista de observadas, ou a remove se já estava. Retorna True se incluiu."""
+        if task_id in self.observadas:
+            self.observadas.remove(task_id)
+            return False
+        self.observadas.append(task_id)
+        return True
+
+    def mudar_pagina(self, delta):
+        self.pagina = max(0, self.pagina + delta)
+
+    def passa_filtro(self, t):
+        if self.padrao and not fnmatchcase(t.id, self.padrao): return False
+        if self.estados: return t.estado.name in self.estados
+        return t.estado != TaskState.NOVA
+
+    # --- Atualização ---
+
+    def atualizar(self, simulador):
+        """Traz a visão para o estado atual do simulador."""
+        tarefas = simulador.tarefas
+        tick = simulador.relogio_global
+        mesma_linha = tarefas is self._tarefas and self._tick is not None
+
+        if mesma_linha and len(tarefas) > self._quantidade:
+            # Tarefas inseridas no debugger entram nos índices (ainda como NOVA)
+            for t in tarefas[self._quantidade:]:
+                self._indexar(t)
+                self._resumos[t.id] = _resumo(t)
+                self.contagem[t.estado.name] += 1
+            self._quantidade = len(tarefas)
+
+        if mesma_linha and tick == self._tick:
+            return
+        if mesma_linha and tick == self._tick + 1:
+            self.reconstruida = False
+            executando, bloqueadas = _executando(simulador), _bloqueadas(simulador)
+            candidatas = executando | self._executando | (bloqueadas ^ self._bloqueadas)
+            candidatas.update(t.id for t in self._por_ingresso.get(self._tick, ()))
+            self._executando, self._bloqueadas = executando, bloqueadas
+            self.alteracoes = []
+            for tid in sorted(candidatas):
+                self._comparar(self._por_id[tid])
+        else:
+            self._reconstruir(simulador)
+        self._tick = tick
+
+    def _indexar(self, t):
+        self._por_id[t.id] = t
+        self._por_ingresso.setdefault(t.ingresso, []).append(t)
+
+    def _comparar(self, t):
+        novo = _resumo(t)
+        antigo = self._resumos.get(t.id)
+        if novo == antigo: return
+        if antigo: self.contagem[antigo[0]] -= 1
+        self.contagem[novo[0]] += 1
+        self._resumos[t.id] = novo
+        self.alteracoes.append((t.id, antigo, novo))
+
+    def _reconstruir(self, simulador):
+        """Passada completa (salto no tempo ou primeira exibição): compara com o último resumo mostrado."""
+        self.reconstruida = self._tick is not None
+        self._tarefas = simulador.tarefas
+        self._quantidade = len(simulador.tarefas)
+        self._por_id, self._por_ingresso = {}, {}
+        self._executando, self._bloqueadas = _executando(simulador), _bloqueadas(simulador)
+        anteriores = self._resumos
+        self._resumos = {}
+        self.contagem = Counter()
+        self.alteracoes = []
+        for t in simulador.tarefas:
+            self._indexar(t)
+            novo = _resumo(t)
+            self._resumos[t.id] = novo
+            self.contagem[novo[0]] += 1
+            antigo = anteriores.get(t.id)
+            if novo != antigo and (antigo or t.estado != TaskState.NOVA):
+                self.alteracoes.append((t.id, antigo, novo))
+
+    # --- Texto ---
+
+    def renderizar(self, simulador):
+        self.atualizar(simulador)
+        linhas = [self._cabecalho(simulador)]
+        linhas += self._filas(simulador)
+        linhas.append("TAREFAS POR ESTADO: " + " | ".join(
+            f"{e.name}: {self.contagem[e.name]}" for e in TaskState if self.contagem[e.name]))
+        linhas += self._texto_alteracoes(simulador)
+        if self.observadas:
+            linhas.append("\nOBSERVADAS:")
+            for tid in self.observadas:
+                t = self._por_id.get(tid)
+                linhas.append(t.to_debug_str(simulador.tempo_espera(t)) if t else f"  - {tid}: (não encontrada)")
+        if self.mostrar_lista:
+            linhas += self._texto_lista(simulador)
+        return "\n".join(linhas)
+
+    def _cabecalho(self, simulador):
+        status_scheduler = "ATIVO" if simulador.scheduler_called_last_tick else "INATIVO"
+        eventos = simulador.ultimo_log
+        if len(eventos) > LIMITE_EVENTOS:
+            eventos = eventos[:LIMITE_EVENTOS] + f" ... (+{len(eventos) - LIMITE_EVENTOS} caracteres)"
+        cpus = getattr(simulador, 'cpus', None)
+        if cpus is not None:
+            exec_info = " | ".join(f"CPU{cpu}: [ {t.id if t else 'Nenhuma'} ]" for cpu, t in enumerate(cpus))
+        else:
+            exec_info = f"CPU: [ {simulador.tarefa_executando.id if simulador.tarefa_executando else 'Nenhuma'} ]"
+        filtro = self._descricao_filtro()
+        return "\n".join([
+            f"--- [TICK: {simulador.relogio_global}] | ESCALONADOR: {status_scheduler} | FILTRO: {filtro} ---",
+            f"EVENTOS DO ÚLTIMO TICK:\n >> {eventos}",
+            exec_info,
+        ])
+
+    def _descricao_filtro(self):
+        partes = []
+        if self.padrao: partes.append(f"id={self.padrao}")
+        if self.estados: partes.append("estado=" + ",".join(sorted(self.estados)))
+        return " ".join(partes) or "nenhum"
+
+    def _filas(self, simulador):
+        linhas = []
+        filas_cpu = getattr(simulador, 'filas_cpu', None)
+        if filas_cpu is not None and not simulador.fila_global:
+            for cpu, fila in enumerate(filas_cpu):
+                linhas.append(f"FILA CPU{cpu}: {_ids_resumidos(fila, len(fila))}")
+        else:
+            prontos = simulador.fila_de_prontos()
+            linhas.append(f"FILA DE PRONTOS: {_ids_resumidos(prontos, len(prontos))}")
+
+        esperando = [(m_id, fila) for m_id, fila in simulador.mutex_fila.items() if fila]
+        if esperando:
+            texto = ", ".join(f"M{m_id}:{_ids_resumidos(fila, len(fila))}" for m_id, fila in esperando[:LIMITE_IDS])
+            if len(esperando) > LIMITE_IDS: texto += f" (+{len(esperando) - LIMITE_IDS} mutexes)"
+            linhas.append(f"BLOQUEADOS EM MUTEX: {texto}")
+        if simulador.io_wait:
+            io_str = ", ".join(f"{tid}({rest}t)" for tid, rest in islice(simulador.io_wait.items(), LIMITE_IDS))
+            if len(simulador.io_wait) > LIMITE_IDS: io_str += f" (+{len(simulador.io_wait) - LIMITE_IDS})"
+            linhas.append(f"EM E/S (WAIT): {io_str}")
+        if simulador.deadlocks:
+            ultimo = simulador.deadlocks[-1]
+            ciclo = " -> ".join(f"{tid}(M{m_id})" for tid, m_id in ultimo['ciclo'])
+            vitima = f", vítima {ultimo['vitima']}" if ultimo['vitima'] else ""
+            linhas.append(f"DEADLOCKS: {len(simulador.deadlocks)} (último no tick {ultimo['tick']}: {ciclo}{vitima})")
+        return linhas
+
+    def _texto_alteracoes(self, simulador):
+        titulo = "\nALTERAÇÕES (visão reconstruída):" if self.reconstruida else "\nALTERAÇÕES DESDE O ÚLTIMO PASSO:"
+        visiveis = [a for a in self.alteracoes if self.passa_filtro(self._por_id[a[0]])]
+        linhas = [titulo]
+        for tid, antigo, novo in visiveis[:LIMITE_ALTERACOES]:
+            t = self._por_id[tid]
+            if antigo is None or antigo[0] == novo[0]:
+                estado = novo[0]
+            else:
+                estado = f"{antigo[0]} -> {novo[0]}"
+            linhas.append(f"  - {tid}: {estado} | Progresso: {t.tempo_executado}/{t.duracao} | Espera: {simulador.tempo_espera(t)}")
+        if len(visiveis) > LIMITE_ALTERACOES:
+            linhas.append(f"  ... e mais {len(visiveis) - LIMITE_ALTERACOES} alteração(ões)")
+        if not visiveis:
+            linhas.append("  (nenhuma)")
+        return linhas
+
+    def _texto_lista(self, simulador):
+        inicio = self.pagina * self.tamanho_pagina
+        filtradas = (t for t in self._tarefas if self.passa_filtro(t))
+        pagina = list(islice(filtradas, inicio, inicio + self.tamanho_pagina + 1))
+        ha_mais = len(pagina) > self.tamanho_pagina
+        linhas = [f"\nTAREFAS (página {self.pagina + 1}{', há mais' if ha_mais else ''}):"]
+        linhas += [t.to_debug_str(simulador.tempo_espera(t)) for t in pagina[:self.tamanho_pagina]]
+        if not pagina:
+            linhas.append("  (nenhuma tarefa nesta página)")
+        return linhas
@@ -0,0 +1,49 @@
+import time
+from simulator.core import TCB
+from simulator.parser import montar_simulador
+
+# Escalonadores incrementais verificados por padrão (linhas de sistema do config)
+ALGORITMOS_PADRAO = ('MLFQ;2', 'CFS;1')
+TAMANHOS_PADRAO = (2000, 20000)  # tarefas prontas
+TICKS_AQUECIMENTO = 50           # o tick 0 admite todas as tarefas de uma vez: fica fora da medida
+TICKS_MEDIDOS = 2000
+RAZAO_MAXIMA = 2.0  # custo por tick com a maior fila / com a menor (linear daria 10x)
+
+def medir_custo_por_tick(linha_sistema, prontas, ticks=TICKS_MEDIDOS, plugins=None):
+    """
+    Milissegundos por tick com 'prontas' tarefas longas (ninguém termina),
+    todas ingressando no tick 0, no nível LINHA_DO_TEMPO do Modo Completo.
+    """
+    simulador, _ = montar_simulador(linha_sistema, plugins)
+    for i in range(prontas):
+        simulador.adicionar_tarefa(TCB(f"T{i}", 'red', 0, 10**9, i % 5))
+    simulador.definir_nivel_registro('LINHA_DO_TEMPO')
+    for _ in range(TICKS_AQUECIMENTO):
+        simulador.tick()
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        simulador.tick()
+    return (time.perf_counter() - inicio) * 1000 / ticks
+
+def verificar_escala(algoritmos=ALGORITMOS_PADRAO, tamanhos=TAMANHOS_PADRAO, ticks=TICKS_MEDIDOS, plugins=None):
+    """
+    Mede o custo por tick de cada algoritmo com filas de prontos de tamanhos
+    crescentes. Com um escalonador incremental o core não varre a fila, então
+    o custo fica plano: 'plano' é False se a maior fila custar mais que
+    RAZAO_MAXIMA vezes a menor.
+    """
+    resultados = []
+    for linha in algoritmos:
+        custos = [medir_custo_por_tick(linha, n, ticks, plugins) for n in tamanhos]
+        razao = custos[-1] / custos[0] if custos[0] else float('inf')
+        resultados.append({'algoritmo': linha, 'tamanhos': list(tamanhos), 'custos': custos,
+                           'razao': razao, 'plano': razao <= RAZAO_MAXIMA})
+    return resultados
+
+def formatar_escala(resultados):
+    linhas = []
+    for r in resultados:
+        custos = " | ".join(f"{n} prontas: {c:.4f} ms" for n, c in zip(r['tamanhos'], r['custos']))
+        situacao = "plano" if r['plano'] else f"CRESCE (limite {RAZAO_MAXIMA:.1f}x)"
+        linhas.append(f"{r['algoritmo']:<10} {custos} | razão {r['razao']:.2f}x: {situacao}")
+    return "\n".join(linhas)
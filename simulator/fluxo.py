@@ -0,0 +1,121 @@
+import sys
+from simulator.core import TCB, TaskState
+from simulator.metricas import metricas_tarefa
+from simulator.parser import montar_simulador, ler_linha_tarefa
+
+def abrir_fluxo(origem):
+    """
+    Linhas de um fluxo: '-' é a entrada padrão; uma string é o caminho de um arquivo
+    ou FIFO (lido aos poucos, conforme o produtor escreve); qualquer outro iterável
+    (ex.: um gerador) é usado como está.
+    """
+    if origem == '-':
+        return sys.stdin
+    if isinstance(origem, str):
+        return _linhas_do_arquivo(origem)
+    return origem
+
+def _linhas_do_arquivo(caminho):
+    with open(caminho, 'r') as f:
+        yield from f
+
+class FonteTarefas:
+    """
+    Tarefas de um sistema aberto: chegam de um fluxo no formato das linhas de
+    tarefa do config (ou já como TCB) em ordem de ingresso e são admitidas com
+    adicionar_tarefa no tick em que ingressam (Simulator.usar_fonte_tarefas).
+
+    O fluxo é lido uma tarefa à frente: para saber se alguém ingressa no tick
+    atual, o simulador espera a próxima linha (ou o fim do fluxo).
+
+    As concluídas saem da memória no tick seguinte: as métricas delas vão para
+    o resumo (usado por calcular_metricas) e, se houver, para destino_metricas
+    (qualquer objeto com append, ex.: registros.DestinoJSONL). Ids só precisam
+    ser únicos entre as tarefas ainda em memória.
+    """
+    def __init__(self, linhas, num_cpus=1, destino_metricas=None, numero_linha=1):
+        self._linhas = iter(linhas)
+        self._numero = numero_linha  # número da última linha lida, para as mensagens de erro
+        self._proxima = None
+        self._fim = False
+        self.num_cpus = num_cpus
+        self.destino_metricas = destino_metricas
+        self.admitidas = 0
+        self.resumo = {'tarefas': 0, 'soma_espera': 0, 'soma_turnaround': 0, 'makespan': 0}
+
+    def _espiar(self):
+        """Próxima tarefa do fluxo, sem consumi-la (None no fim)."""
+        while self._proxima is None and not self._fim:
+            item = next(self._linhas, None)
+            if item is None:
+                self._fim = True
+            elif isinstance(item, TCB):
+                self._numero += 1
+                self._proxima = item
+            elif item.strip():
+                self._numero += 1
+                self._proxima = ler_linha_tarefa(item, self.num_cpus, self._numero)
+        return self._proxima
+
+    def esgotada(self):
+        return self._espiar() is None
+
+    def admitir(self, simulador):
+        """Início do tick: remove as concluídas e admite as tarefas que ingressam agora."""
+        self.remover_concluidas(simulador)
+        relogio = simulador.relogio_global
+        while self._espiar() is not None and self._proxima.ingresso <= relogio:
+            t, self._proxima = self._proxima, None
+            if t.ingresso < relogio:
+                raise ValueError(f"Tarefa {t.id} (linha {self._numero}) ingressa no tick {t.ingresso}, "
+                                 f"mas a simulação já está no tick {relogio}: o fluxo deve vir em ordem de ingresso.")
+            if simulador.adicionar_tarefa(t):
+                self.admitidas += 1
+
+    def remover_concluidas(self, simulador):
+        """Tira da memória as tarefas concluídas, guardando as métricas delas."""
+        if not simulador.tarefas_concluidas: return
+        contadores = simulador.contadores
+        smp = getattr(simulador, 'num_cpus', 1) > 1
+        resumo = self.resumo
+        vivas = []
+        for t in simulador.tarefas:
+            if t.estado != TaskState.TERMINADA:
+                vivas.append(t)
+                continue
+            m = metricas_tarefa(t, contadores['bloqueado'].pop(t.id, 0))
+            contadores['ultimo_tick'].pop(t.id, None)
+            del simulador.tarefas_por_id[t.id]
+            if t.abortada: continue  # vítima de deadlock: só aparece em 'abortadas'
+            resumo['tarefas'] += 1
+            resumo['soma_espera'] += m['espera']
+            resumo['soma_turnaround'] += m['turnaround']
+            resumo['makespan'] = max(resumo['makespan'], m['conclusao'])
+            if self.destino_metricas is not None:
+                if smp: m['migracoes'] = t.migracoes
+                self.destino_metricas.append({'task_id': t.id, **m})
+        simulador.tarefas = vivas
+        simulador.tarefas_concluidas = 0
+        # Os ticks de sorteio só servem à análise Monte Carlo e cresceriam sem limite
+        del contadores['ticks_sorteio'][:]
+
+def carregar_fluxo(origem, plugins_externos=None, semente=None, destino_metricas=None):
+    """
+    Monta um Simulator em modo fluxo. A primeira linha do fluxo é a linha de
+    sistema do config; as seguintes são as tarefas, em ordem de ingresso.
+    O nível de registro passa a ser METRICAS (veja Simulator.usar_fonte_tarefas).
+    """
+    try:
+        linhas = iter(abrir_fluxo(origem))
+        linha_sistema = next((linha for linha in linhas if linha.strip()), None)
+        if linha_sistema is None: raise ValueError("Fluxo vazio: falta a linha de sistema.")
+
+        simulador, descricao = montar_simulador(linha_sistema.strip(), plugins_externos, semente)
+        simulador.definir_nivel_registro('METRICAS')
+        fonte = FonteTarefas(linhas, getattr(simulador, 'num_cpus', 1), destino_metricas)
+        simulador.usar_fonte_tarefas(fonte)
+        print(f"{descricao}, Tasks=fluxo")
+        return simulador
+    except Exception as e:
+        print(f"Erro: {e}")
+        return None
@@ -1,75 +1,71 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 
-def gerar_imagem_gantt(gantt_log, tarefas, nome_arquivo_saida, nome_algoritmo, bloqueio_log=None, mutex_event_log=None, io_log=None):
-    if bloqueio_log is None: bloqueio_log = []
-    if mutex_event_log is None: mutex_event_log = []
-    if io_log is None: io_log = []
-    
-    if gantt_log:
-        tempo_atual = gantt_log[-1]['tick'] + 1
-    else:
-        tempo_atual = 0
-
-    # Função interna para agrupar logs consecutivos
-    def agrupar_logs(logs):
-        blocos = []
-        if not logs: return blocos
-        
-        # Ordena primariamente por task_id, depois pelo tick
-        logs_ordenados = sorted(logs, key=lambda x: (x['task_id'], x['tick']))
-        
-        bloco_atual = logs_ordenados[0].copy()
-        bloco_atual['start'] = bloco_atual['tick']
-        bloco_atual['duration'] = 1
-        
-        for log in logs_ordenados[1:]:
-            # Se for a mesma tarefa e o tick for consecutivo
-            if log['task_id'] == bloco_atual['task_id'] and log['tick'] == bloco_atual['start'] + bloco_atual['duration']:
-                bloco_atual['duration'] += 1
-            else:
-                blocos.append(bloco_atual)
-                bloco_atual = log.copy()
-                bloco_atual['start'] = bloco_atual['tick']
-                bloco_atual['duration'] = 1
-        blocos.append(bloco_atual)
-        return blocos
-
-    # Processar Logs de Execução
-    blocos_exec = []
-    if gantt_log:
-        b_atual = gantt_log[0].copy()
-        b_atual['start'] = b_atual['tick']
-        b_atual['duration'] = 1
-        for log in gantt_log[1:]:
-            if log['task_id'] == b_atual['task_id']:
-                b_atual['duration'] += 1
-            else:
-                blocos_exec.append(b_atual)
-                b_atual = log.copy()
-                b_atual['start'] = b_atual['tick']
-                b_atual['duration'] = 1
-        blocos_exec.append(b_atual)
-
-    blocos_bloq = agrupar_logs(bloqueio_log)
-    blocos_io = agrupar_logs(io_log) 
+def _estender_bloco(abertos, blocos, chave, log):
+    """Soma o log ao bloco aberto da chave se o tick for consecutivo; senão abre outro bloco."""
+    bloco = abertos.get(chave)
+    if bloco is not None and log['tick'] == bloco['start'] + bloco['duration']:
+        bloco['duration'] += 1
+        return
+    bloco = dict(log)
+    bloco['start'] = log['tick']
+    bloco['duration'] = 1
+    abertos[chave] = bloco
+    blocos.append(bloco)
+
+def _agrupar_logs(logs):
+    """
+    Agrupa logs consecutivos da mesma tarefa em blocos com 'start' e 'duration'.
+    Os logs são lidos uma vez, em ordem de tick, então destinos em arquivo
+    (simulator.registros) não precisam ser carregados inteiros.
+    """
+    abertos, blocos = {}, []
+    for log in logs:
+        _estender_bloco(abertos, blocos, log['task_id'], log)
+    blocos.sort(key=lambda b: (b['task_id'], b['start']))
+    return blocos
+
+def _desenhar_gantt(gnt, gantt_log, tarefas, bloqueio_log, mutex_event_log, io_log, tempo_max=0):
+    """Desenha um Gantt completo no eixo gnt. Retorna os itens da legenda."""
+    # Uma passada pelo gantt_log: blocos de execução, raias por CPU (modo SMP) e sorteios
+    tempo_atual = 0
+    cpu_ids = set()
+    abertos_exec, blocos_exec = {}, []
+    abertos_cpu, blocos_cpu = {}, []
+    sorteios = []
+    for log in gantt_log:
+        tempo_atual = log['tick'] + 1
+        if 'cpu' in log: cpu_ids.add(log['cpu'])
+        if log['task_id'] == 'idle': continue
+        _estender_bloco(abertos_exec, blocos_exec, log['task_id'], log)
+        if 'cpu' in log:
+            _estender_bloco(abertos_cpu, blocos_cpu, (log['cpu'], log['task_id']), log)
+        if log.get('sorteio', False):
+            sorteios.append((log['task_id'], log['tick']))
+    blocos_exec.sort(key=lambda b: (b['task_id'], b['start']))
+    blocos_cpu.sort(key=lambda b: (b['cpu'], b['task_id'], b['start']))
+    cpu_ids = sorted(cpu_ids)
+
+    blocos_bloq = _agrupar_logs(bloqueio_log)
+    blocos_io = _agrupar_logs(io_log)
 
     # Configurar Gráfico
-    fig, gnt = plt.subplots(figsize=(16, 8))
-
     task_ids = sorted(list(set(t.id for t in tarefas)))
     task_ids.reverse() 
-    task_map = {task_id: i for i, task_id in enumerate(task_ids)}
+    raias_cpu = [f"CPU{cpu}" for cpu in reversed(cpu_ids)] if len(cpu_ids) > 1 else []
+    cpu_map = {cpu: i for i, cpu in enumerate(reversed(cpu_ids))} if raias_cpu else {}
+    task_map = {task_id: i + len(raias_cpu) for i, task_id in enumerate(task_ids)}
+    rotulos = raias_cpu + task_ids
     
     y_altura = 6 
     y_padding = 10 
 
-    gnt.set_ylim(0, len(task_ids) * y_padding + 5)
-    gnt.set_yticks([y_padding * i + y_altura/2 for i in range(len(task_ids))])
-    gnt.set_yticklabels(task_ids)
+    gnt.set_ylim(0, len(rotulos) * y_padding + 5)
+    gnt.set_yticks([y_padding * i + y_altura/2 for i in range(len(rotulos))])
+    gnt.set_yticklabels(rotulos)
     gnt.set_ylabel('Tarefas')
 
-    tempo_max_visual = max(tempo_atual, 20) 
+    tempo_max_visual = max(tempo_atual, tempo_max, 20) 
     gnt.set_xlim(0, tempo_max_visual)
     gnt.set_xlabel('Tempo (t)')
     
@@ -125,6 +121,15 @@ def gerar_imagem_gantt(gantt_log, tarefas, nome_arquivo_saida, nome_algoritmo, b
         y_pos = task_map[task_id] * y_padding
         gnt.broken_barh([(bloco['start'], bloco['duration'])], (y_pos, y_altura), facecolors=(bloco['cor']), edgecolor='black', zorder=10)
 
+    # 4b. Raias das CPUs (quem executou em cada CPU)
+    if raias_cpu:
+        gnt.axhline(len(raias_cpu) * y_padding - (y_padding - y_altura) / 2, color='black', linewidth=1.5)
+        for bloco in blocos_cpu:
+            y_pos = cpu_map[bloco['cpu']] * y_padding
+            gnt.broken_barh([(bloco['start'], bloco['duration'])], (y_pos, y_altura), facecolors=(bloco['cor']), edgecolor='black', zorder=10)
+            if bloco['duration'] >= 2:
+                gnt.text(bloco['start'] + bloco['duration'] / 2, y_pos + y_altura / 2, bloco['task_id'], ha='center', va='center', fontsize=7, color='white', fontweight='bold', zorder=20)
+
     # 5. Marcadores de Mutex
     for event in mutex_event_log:
         t_id = event['task_id']
@@ -145,14 +150,10 @@ def gerar_imagem_gantt(gantt_log, tarefas, nome_arquivo_saida, nome_algoritmo, b
             gnt.text(tick_x + 0.5, y_pos + y_altura + 2, label, ha='center', va='bottom', fontsize=9, fontweight='bold', color=color, zorder=25)
 
     # 6. Sorteio
-    if gantt_log:
-        for log in gantt_log:
-            if log.get('sorteio', False) and log['task_id'] != 'idle':
-                t_id = log['task_id']
-                if t_id in task_map:
-                    y_pos = task_map[t_id] * y_padding
-                    tick_x = log['tick']
-                    gnt.text(tick_x + 0.5, y_pos + y_altura + 0.5, "*", ha='center', va='center', fontsize=14, fontweight='bold', color='black', zorder=20)
+    for t_id, tick_x in sorteios:
+        if t_id in task_map:
+            y_pos = task_map[t_id] * y_padding
+            gnt.text(tick_x + 0.5, y_pos + y_altura + 0.5, "*", ha='center', va='center', fontsize=14, fontweight='bold', color='black', zorder=20)
 
     # Legenda
     patches = [mpatches.Patch(color=t.cor, label=f"{t.id} (Prio: {t.prioridade})") for t in sorted(tarefas, key=lambda x: x.id)]
@@ -166,11 +167,50 @@ def gerar_imagem_gantt(gantt_log, tarefas, nome_arquivo_saida, nome_algoritmo, b
     patches.append(plt.Line2D([0], [0], marker='v', color='w', label='Mutex Unlock', markerfacecolor='blue', markersize=8))
     patches.append(plt.Line2D([0], [0], marker='X', color='w', label='Lock Negado (Bloqueio)', markerfacecolor='red', markersize=8))
 
-    plt.legend(handles=patches, bbox_to_anchor=(1.02, 1), loc='upper left')
-    plt.title(f"Gráfico de Gantt (Algoritmo: {nome_algoritmo.upper()})", fontsize=16)
+    return patches
+
+def gerar_imagem_gantt(gantt_log, tarefas, nome_arquivo_saida, nome_algoritmo, bloqueio_log=None, mutex_event_log=None, io_log=None, semente=None):
+    if bloqueio_log is None: bloqueio_log = []
+    if mutex_event_log is None: mutex_event_log = []
+    if io_log is None: io_log = []
+
+    fig, gnt = plt.subplots(figsize=(16, 8))
+    patches = _desenhar_gantt(gnt, gantt_log, tarefas, bloqueio_log, mutex_event_log, io_log)
+
+    gnt.legend(handles=patches, bbox_to_anchor=(1.02, 1), loc='upper left')
+    titulo = f"Gráfico de Gantt (Algoritmo: {nome_algoritmo.upper()})"
+    if semente is not None:
+        titulo += f" - Semente: {semente}"
+    gnt.set_title(titulo, fontsize=16)
+
+    try:
+        fig.savefig(nome_arquivo_saida, bbox_inches='tight')
+    except Exception as e:
+        print(f"Erro ao salvar o gráfico: {e}")
+    plt.close(fig)
+
+def gerar_imagem_comparativa(paineis, nome_arquivo_saida, titulo):
+    """
+    Vários Gantts empilhados (um painel por algoritmo) em uma única figura e um único render.
+    paineis: lista de dicts com 'nome', 'gantt_log', 'tarefas', 'bloqueio_log', 'mutex_event_log' e 'io_log'.
+    """
+    if not paineis: return
+    tempo_max = max((p['gantt_log'][-1]['tick'] + 1 for p in paineis if p['gantt_log']), default=0)
+    altura_painel = max(3, 0.35 * len(paineis[0]['tarefas']) + 1.5)
+    fig, eixos = plt.subplots(len(paineis), 1, figsize=(16, altura_painel * len(paineis)), squeeze=False)
+
+    patches = []
+    for gnt, painel in zip(eixos[:, 0], paineis):
+        patches = _desenhar_gantt(gnt, painel['gantt_log'], painel['tarefas'], painel['bloqueio_log'],
+                                  painel['mutex_event_log'], painel['io_log'], tempo_max)
+        gnt.set_title(painel['nome'], fontsize=13, loc='left')
+
+    eixos[0, 0].legend(handles=patches, bbox_to_anchor=(1.02, 1), loc='upper left')
+    fig.suptitle(titulo, fontsize=16)
+    fig.tight_layout()
 
     try:
-        plt.savefig(nome_arquivo_saida, bbox_inches='tight')
+        fig.savefig(nome_arquivo_saida, bbox_inches='tight')
     except Exception as e:
         print(f"Erro ao salvar o gráfico: {e}")
     plt.close(fig)
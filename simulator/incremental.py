@@ -0,0 +1,280 @@
+import os
+import copy
+import json
+import math
+import hashlib
+from simulator.core import TaskState, indexar_tarefas
+from simulator.cache import descrever_simulacao
+from simulator.registros import CAMPOS_LOG, escrever_bloco, ler_bloco
+
+INTERVALO_INCREMENTAL_PADRAO = 500  # ticks entre snapshots guardados para a próxima execução
+
+ARQUIVO_HISTORICO = "historico.bin"
+ARQUIVO_ESTADOS = "estados.bin"
+
+# Campos da tarefa cuja edição só importa a partir de certo progresso (veja _comparar_tarefa)
+CAMPOS_PROGRESSO = {'duracao', 'acoes', 'cor', 'recursos_maximos'}
+
+def chave_sistema(simulador):
+    """Tudo que não é a lista de tarefas: se mudar, nada da execução anterior serve."""
+    descricao = descrever_simulacao(simulador)
+    del descricao['tarefas']
+    descricao['formato_log'] = simulador.formato_log
+    texto = json.dumps(descricao, sort_keys=True, default=str)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def _acoes_no_progresso(acoes, progresso):
+    return [a for a in acoes if a['tempo'] == progresso]
+
+def _comparar_tarefa(antiga, nova, usa_duracao):
+    """
+    Como a edição de uma tarefa pode afetar a simulação. Retorna None (não
+    mudou), 0 (pode mudar tudo desde o ingresso) ou k >= 1: até a k-ésima
+    unidade executada a tarefa se comporta igual nas duas versões.
+
+    Ações disparam quando tempo_executado == tempo, o fim é testado quando
+    tempo_executado == duracao e a cor só aparece no Gantt: nenhum dos três é
+    visto antes de a tarefa chegar a esse progresso (a duração, só se o
+    escalonador não a usar para decidir).
+    """
+    diferentes = {campo for campo in set(vars(antiga)) | set(vars(nova))
+                  if getattr(antiga, campo, None) != getattr(nova, campo, None)}
+    if not diferentes: return None
+    if diferentes - CAMPOS_PROGRESSO or ('duracao' in diferentes and usa_duracao):
+        return 0
+    k = math.inf
+    if 'duracao' in diferentes: k = min(antiga.duracao, nova.duracao)
+    if 'cor' in diferentes: k = 1
+    for progresso in sorted({a['tempo'] for a in antiga.acoes} | {a['tempo'] for a in nova.acoes}):
+        if progresso >= k: break
+        if _acoes_no_progresso(antiga.acoes, progresso) != _acoes_no_progresso(nova.acoes, progresso):
+            k = progresso
+            break
+    return k
+
+def _recursos_banqueiro(tarefas):
+    return {t.id: t.recursos_maximos for t in tarefas if t.recursos_maximos}
+
+class Edicao:
+    """Diferenças entre a carga da execução anterior e a carga atual."""
+    def __init__(self, anteriores, atuais, usa_duracao):
+        self.atuais = atuais
+        self.por_id = {t.id: t for t in atuais}
+        por_id_anterior = {t.id: t for t in anteriores}
+        self.removidas = [t for t in anteriores if t.id not in self.por_id]
+        self.adicionadas = [t for t in atuais if t.id not in por_id_anterior]
+        self.desde_ingresso = {}  # id -> (versão anterior, versão atual)
+        self.por_progresso = {}   # id -> k
+        for t in atuais:
+            antiga = por_id_anterior.get(t.id)
+            if antiga is None: continue
+            k = _comparar_tarefa(antiga, t, usa_duracao)
+            if k == 0: self.desde_ingresso[t.id] = (antiga, t)
+            elif k is not None: self.por_progresso[t.id] = k
+        comuns = set(self.por_id) & set(por_id_anterior)
+        # A ordem da lista decide a ordem dos ingressos e das linhas de log no mesmo tick
+        self.reordenada = ([t.id for t in anteriores if t.id in comuns] != [t.id for t in atuais if t.id in comuns])
+        # O Banqueiro olha os recursos máximos de todas as tarefas, inclusive as que ainda não chegaram
+        self.recursos_mudaram = _recursos_banqueiro(anteriores) != _recursos_banqueiro(atuais)
+
+    def tick_divergencia(self, simulador, tick_final, conclusoes):
+        """
+        Primeiro tick em que a simulação nova pode diferir da anterior, cujos logs
+        estão em 'simulador' e cujos ticks de conclusão estão em 'conclusoes'.
+        Até ele (exclusive) as duas linhas do tempo são iguais.
+        """
+        if self.reordenada: return 0
+        tick = tick_final
+        for t in self.removidas + self.adicionadas:
+            tick = min(tick, t.ingresso)
+        if self.removidas:
+            # Sem as removidas, a simulação nova pode acabar assim que as outras terminarem
+            restantes = [conclusoes[t.id] for t in self.atuais if t.id in conclusoes]
+            if any(c < 0 for c in restantes): return 0
+            tick = min(tick, max(restantes, default=-1) + 1)
+        for antiga, atual in self.desde_ingresso.values():
+            tick = min(tick, antiga.ingresso, atual.ingresso)
+
+        if self.recursos_mudaram and simulador.politica_deadlock == 'BANQUEIRO':
+            # O Banqueiro só roda quando alguém pede ou devolve um mutex
+            if simulador.so_metricas: return 0
+            for evento in simulador.mutex_event_log:
+                tick = min(tick, evento['tick'])
+                break
+
+        if self.por_progresso:
+            # Tick da k-ésima execução de cada tarefa editada, lido do Gantt anterior
+            if simulador.so_metricas:
+                for tid in self.por_progresso:
+                    tick = min(tick, self.por_id[tid].ingresso)
+                return tick
+            faltam = dict(self.por_progresso)
+            for entrada in simulador.gantt_log:
+                if entrada['tick'] >= tick or not faltam: break
+                tid = entrada['task_id']
+                if tid in faltam:
+                    faltam[tid] -= 1
+                    if faltam[tid] == 0:
+                        tick = min(tick, entrada['tick'])
+                        del faltam[tid]
+        return tick
+
+    def aplicar(self, estado):
+        """
+        Leva um snapshot (capturar_estado) anterior à divergência para a carga
+        atual. Retorna False se o snapshot já passou do ponto em que a edição vale.
+        """
+        restauradas = {t.id: t for t in estado['tarefas']}
+        for t in self.removidas:
+            if restauradas[t.id].estado != TaskState.NOVA: return False
+        tarefas = []
+        for nova in self.atuais:
+            t = restauradas.get(nova.id)
+            if t is None or nova.id in self.desde_ingresso:
+                if t is not None and t.estado != TaskState.NOVA: return False
+                t = copy.deepcopy(nova)
+            elif nova.id in self.por_progresso:
+                k = self.por_progresso[nova.id]
+                if t.tempo_executado >= k: return False
+                t.duracao, t.cor = nova.duracao, nova.cor
+                t.recursos_maximos = set(nova.recursos_maximos)
+                if t.estado != TaskState.TERMINADA:  # abortada antes de k: as ações já foram descartadas
+                    # Ações antes de k são iguais nas duas versões: mantém as que ainda não dispararam
+                    t.acoes = ([a for a in t.acoes if a['tempo'] < k] +
+                               [dict(a) for a in nova.acoes if a['tempo'] >= k])
+            tarefas.append(t)
+        estado['tarefas'] = tarefas
+        estado.update(indexar_tarefas(tarefas))
+        return True
+
+class HistoricoIncremental:
+    """
+    Guarda ao lado do config (<config>.incremental/) o que a última execução
+    do Modo Completo deixou: a carga parseada, snapshots a cada 'intervalo'
+    ticks (estados.bin) e os logs em memória (historico.bin).
+
+    Na execução seguinte, se só as tarefas mudaram, a carga nova é comparada
+    com a guardada (Edicao), o primeiro tick em que a edição pode ter efeito é
+    calculado e a simulação retoma do último snapshot até ele, com o prefixo
+    dos logs reaproveitado. Os snapshots anteriores a esse tick também são
+    levados para a carga nova, então edições seguintes continuam rápidas.
+    Logs em arquivo (LOG=CSV/JSONL/BINARIO) são reabertos e truncados.
+    """
+    def __init__(self, diretorio, intervalo=INTERVALO_INCREMENTAL_PADRAO):
+        self.diretorio = diretorio
+        self.intervalo = int(intervalo)
+        self._arquivo = None
+        self._indice = []  # [(tick, offset)] dos snapshots em estados.bin
+        self._base = None
+        self.divergencia = None  # primeiro tick afetado pela edição (após preparar)
+
+    @property
+    def caminho_historico(self):
+        return os.path.join(self.diretorio, ARQUIVO_HISTORICO)
+
+    @property
+    def caminho_estados(self):
+        return os.path.join(self.diretorio, ARQUIVO_ESTADOS)
+
+    def existe(self):
+        return os.path.exists(self.caminho_historico) and os.path.exists(self.caminho_estados)
+
+    def _fechar(self):
+        if self._arquivo:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def _ler_historico(self):
+        if not self.existe(): return None
+        with open(self.caminho_historico, 'rb') as f:
+            return ler_bloco(f)
+
+    # --- Início da execução ---
+
+    def preparar(self, simulador):
+        """
+        Chamado com o simulador recém-carregado (logs já configurados, sem ticks).
+        Retoma da execução anterior quando possível e começa a gravar o histórico
+        desta. Retorna o tick de onde a simulação continua (0 = do início).
+        """
+        self._base = copy.deepcopy(simulador.tarefas)
+        self.divergencia = None
+        anterior = self._ler_historico()
+        tick = 0
+        if anterior and anterior['chave'] == chave_sistema(simulador):
+            tick = self._retomar(simulador, anterior)
+        if tick == 0:
+            self._comecar_do_zero(simulador)
+        return tick
+
+    def _comecar_do_zero(self, simulador):
+        self._fechar()
+        for campo in CAMPOS_LOG:
+            del getattr(simulador, campo)[:]
+        os.makedirs(self.diretorio, exist_ok=True)
+        if os.path.exists(self.caminho_historico): os.remove(self.caminho_historico)
+        self._indice = []
+        self._arquivo = open(self.caminho_estados + ".tmp", 'wb')
+        self._gravar(simulador.relogio_global, simulador.capturar_estado(copiar=False))
+
+    def _retomar(self, simulador, anterior):
+        edicao = Edicao(anterior['tarefas'], self._base, simulador.escalonador.usa_duracao)
+        # Logs da execução anterior (os em arquivo já foram reabertos com retomar=True)
+        for campo, entradas in anterior['logs'].items():
+            getattr(simulador, campo).extend(entradas)
+        if any(len(getattr(simulador, campo)) != tamanho for campo, tamanho in anterior['tamanhos_log'].items()):
+            return 0
+        alvo = self.divergencia = edicao.tick_divergencia(simulador, anterior['tick_final'], anterior['conclusoes'])
+        candidatos = [(tick, offset) for tick, offset in anterior['indice'] if tick <= alvo]
+        if not candidatos or candidatos[-1][0] == 0:
+            return 0
+
+        # Os snapshots até a divergência valem para a carga nova: são regravados já ajustados
+        os.remove(self.caminho_historico)
+        self._indice = []
+        ultimo = None
+        self._arquivo = open(self.caminho_estados + ".tmp", 'wb')
+        with open(self.caminho_estados, 'rb') as f:
+            for tick, offset in candidatos:
+                f.seek(offset)
+                estado = ler_bloco(f)['estado']
+                if not edicao.aplicar(estado): break
+                self._gravar(tick, estado)
+                ultimo = estado
+        if ultimo is None: return 0
+        simulador.restaurar_estado(ultimo)
+        return simulador.relogio_global
+
+    # --- Durante e ao fim da execução ---
+
+    def _gravar(self, tick, estado):
+        self._indice.append((tick, self._arquivo.tell()))
+        escrever_bloco(self._arquivo, {'tick': tick, 'estado': estado}, nivel=1)
+
+    def verificar(self, simulador):
+        """Chamado a cada tick: guarda um snapshot quando o intervalo é atingido."""
+        tick = simulador.relogio_global
+        if self._arquivo and self.intervalo > 0 and tick % self.intervalo == 0 and self._indice[-1][0] < tick:
+            self._gravar(tick, simulador.capturar_estado(copiar=False))
+
+    def concluir(self, simulador):
+        """Fecha o histórico de uma execução que chegou ao fim (o estado final também é guardado)."""
+        if not self._arquivo: return
+        if self._indice[-1][0] < simulador.relogio_global:
+            self._gravar(simulador.relogio_global, simulador.capturar_estado(copiar=False))
+        self._fechar()
+        os.replace(self.caminho_estados + ".tmp", self.caminho_estados)
+        historico = {
+            'chave': chave_sistema(simulador),
+            'tarefas': self._base,
+            'tick_final': simulador.relogio_global,
+            'conclusoes': {t.id: t.tick_conclusao for t in simulador.tarefas},
+            'indice': self._indice,
+            'tamanhos_log': {campo: len(getattr(simulador, campo)) for campo in CAMPOS_LOG},
+            'logs': {campo: list(getattr(simulador, campo)) for campo in CAMPOS_LOG
+                     if not getattr(simulador, campo).persistente},
+        }
+        temporario = self.caminho_historico + ".tmp"
+        with open(temporario, 'wb') as f:
+            escrever_bloco(f, historico, nivel=1)
+        os.replace(temporario, self.caminho_historico)
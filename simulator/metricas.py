@@ -0,0 +1,125 @@
+from collections import Counter
+
+def extrair_intervalos(gantt_log):
+    """
+    Agrupa o gantt_log em intervalos de execução consecutivos de cada tarefa.
+    Retorna [(inicio, duracao, task_id)] em ordem de início, sem os trechos de CPU ociosa.
+    No modo SMP as entradas de várias CPUs se intercalam, por isso o agrupamento é por tarefa.
+    """
+    intervalos = []
+    abertos = {}  # task_id -> índice do último intervalo da tarefa
+    for log in gantt_log:
+        task_id = log['task_id']
+        if task_id == 'idle': continue
+        i = abertos.get(task_id)
+        if i is not None:
+            inicio, duracao, _ = intervalos[i]
+            if inicio + duracao == log['tick']:
+                intervalos[i] = (inicio, duracao + 1, task_id)
+                continue
+        abertos[task_id] = len(intervalos)
+        intervalos.append((log['tick'], 1, task_id))
+    return intervalos
+
+def metricas_tarefa(t, bloqueado):
+    """Métricas de uma tarefa concluída; bloqueado = ticks em E/S ou esperando mutex."""
+    turnaround = t.tick_conclusao - t.ingresso
+    return {
+        'ingresso': t.ingresso,
+        'conclusao': t.tick_conclusao,
+        'turnaround': turnaround,
+        'executado': t.tempo_executado,
+        'bloqueado': bloqueado,
+        'espera': turnaround - t.tempo_executado - bloqueado,
+    }
+
+def calcular_metricas(simulador):
+    """
+    Métricas por tarefa e globais de uma simulação (concluída ou não).
+    Espera = Turnaround - Executado - Bloqueado (E/S + Mutex).
+    No nível de registro METRICAS os totais vêm dos contadores, não dos logs.
+    No modo fluxo as tarefas já removidas da memória entram só nos totais globais,
+    pelo resumo acumulado da fonte. Vítimas de deadlock abortadas não concluíram:
+    ficam fora das métricas por tarefa e das médias e aparecem só em 'abortadas'.
+    """
+    contadores = getattr(simulador, 'contadores', None)
+    if contadores is not None:
+        bloqueado = Counter(contadores['bloqueado'])
+    else:
+        bloqueado = Counter(log['task_id'] for log in simulador.io_log)
+        bloqueado.update(log['task_id'] for log in simulador.bloqueio_log)
+
+    por_tarefa = {}
+    for t in simulador.tarefas:
+        if t.tick_conclusao == -1 or t.abortada: continue
+        por_tarefa[t.id] = metricas_tarefa(t, bloqueado[t.id])
+
+    if contadores is not None:
+        ocupados, despachos, sorteios = contadores['ocupados'], contadores['despachos'], contadores['sorteios']
+    else:
+        intervalos = extrair_intervalos(simulador.gantt_log)
+        ocupados = sum(duracao for _, duracao, _ in intervalos)
+        despachos = len(intervalos)
+        sorteios = sum(1 for log in simulador.gantt_log if log.get('sorteio', False))
+    makespan = max((m['conclusao'] for m in por_tarefa.values()), default=0)
+    num_cpus = getattr(simulador, 'num_cpus', 1)
+    qtd = len(por_tarefa)
+    soma_espera = sum(m['espera'] for m in por_tarefa.values())
+    soma_turnaround = sum(m['turnaround'] for m in por_tarefa.values())
+    fonte = getattr(simulador, 'fonte_tarefas', None)
+    if fonte is not None:
+        resumo = fonte.resumo
+        qtd += resumo['tarefas']
+        soma_espera += resumo['soma_espera']
+        soma_turnaround += resumo['soma_turnaround']
+        makespan = max(makespan, resumo['makespan'])
+    globais = {
+        'tarefas_concluidas': qtd,
+        'makespan': makespan,
+        'num_cpus': num_cpus,
+        'ticks_ocupados': ocupados,
+        'utilizacao_cpu': ocupados / (makespan * num_cpus) if makespan else 0.0,
+        'despachos': despachos,
+        'sorteios': sorteios,
+        'espera_media': soma_espera / qtd if qtd else 0.0,
+        'turnaround_medio': soma_turnaround / qtd if qtd else 0.0,
+    }
+
+    if num_cpus > 1:
+        if contadores is not None:
+            ocupados_cpu = Counter(contadores['ocupados_cpu'])
+        else:
+            ocupados_cpu = Counter(log['cpu'] for log in simulador.gantt_log if log['task_id'] != 'idle')
+        globais['utilizacao_por_cpu'] = [ocupados_cpu[cpu] / makespan if makespan else 0.0 for cpu in range(num_cpus)]
+        globais['migracoes'] = simulador.migracoes
+        for t in simulador.tarefas:
+            if t.id in por_tarefa: por_tarefa[t.id]['migracoes'] = t.migracoes
+    deadlocks = getattr(simulador, 'deadlocks', [])
+    if deadlocks:
+        globais['deadlocks'] = len(deadlocks)
+        globais['abortadas'] = [d['vitima'] for d in deadlocks if d['vitima']]
+        globais['presas_em_deadlock'] = len(simulador.aguardando_mutex)
+    return {'global': globais, 'tarefas': por_tarefa}
+
+def formatar_metricas(metricas, limite_tarefas=30):
+    """Texto com as métricas globais e, para cargas pequenas, a tabela por tarefa."""
+    g = metricas['global']
+    linhas = [
+        f"Tarefas concluídas: {g['tarefas_concluidas']} | Makespan: {g['makespan']} | "
+        f"Uso da CPU: {g['utilizacao_cpu'] * 100:.1f}%",
+        f"Despachos: {g['despachos']} | Sorteios: {g['sorteios']} | "
+        f"Espera média: {g['espera_media']:.2f} | Turnaround médio: {g['turnaround_medio']:.2f}",
+    ]
+    if g.get('num_cpus', 1) > 1:
+        uso = " | ".join(f"CPU{cpu}: {u * 100:.1f}%" for cpu, u in enumerate(g['utilizacao_por_cpu']))
+        linhas.append(f"{uso} | Migrações: {g['migracoes']}")
+    if g.get('deadlocks'):
+        abortadas = ", ".join(g['abortadas']) or "nenhuma"
+        linhas.append(f"Deadlocks detectados: {g['deadlocks']} | Abortadas: {abortadas} | "
+                      f"Presas em mutex: {g['presas_em_deadlock']}")
+    if metricas['tarefas'] and len(metricas['tarefas']) <= limite_tarefas:
+        linhas.append(f"{'TAREFA':<16}{'INGRESSO':>9}{'FIM':>7}{'TURNAROUND':>12}{'ESPERA':>8}{'BLOQ':>6}")
+        for task_id, m in metricas['tarefas'].items():
+            linhas.append(f"{task_id:<16}{m['ingresso']:>9}{m['conclusao']:>7}"
+                          f"{m['turnaround']:>12}{m['espera']:>8}{m['bloqueado']:>6}")
+    return "\n".join(linhas)
@@ -0,0 +1,137 @@
+import os
+import math
+import pickle
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from simulator.comparacao import _contexto_processos
+from simulator.metricas import calcular_metricas
+from simulator.vetorizado import motivo_inelegivel, simular_simulador
+
+AMOSTRAS_PADRAO = 100
+PERCENTIS = (5, 50, 95)
+Z_95 = 1.959964  # quantil da normal para o intervalo de confiança de 95% da média
+AMOSTRAS_POR_LOTE = 16
+
+METRICAS_GLOBAIS = ('makespan', 'utilizacao_cpu', 'espera_media', 'turnaround_medio', 'despachos', 'sorteios')
+
+# Estado de cada processo de trabalho, preenchido uma vez por _iniciar_trabalhador
+_CARGA = None
+_VETORIZAVEL = False
+
+def _iniciar_trabalhador(simulador_base):
+    """
+    Recebe a carga já parseada uma única vez por processo (com fork, sem nem
+    serializar) e guarda um pickle dela: cada semente parte de um pickle.loads,
+    bem mais barato que parsear de novo ou fazer deepcopy.
+    """
+    global _CARGA, _VETORIZAVEL
+    simulador_base.intervalo_keyframe = 0
+    simulador_base.definir_nivel_registro('METRICAS')
+    _VETORIZAVEL = motivo_inelegivel(simulador_base) is None
+    _CARGA = pickle.dumps(simulador_base, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _simular_semente(semente):
+    simulador = pickle.loads(_CARGA)
+    simulador.definir_semente(semente)
+    simulador.semear_random_global()
+    if _VETORIZAVEL:
+        resultado = simular_simulador(simulador)
+        return resultado.metricas(), resultado.ticks_sorteio
+    while not simulador.terminou():
+        simulador.tick()
+    return calcular_metricas(simulador), simulador.contadores['ticks_sorteio']
+
+def _simular_lote(sementes):
+    """Executado em um processo de trabalho. Devolve só o que a agregação usa."""
+    amostras = []
+    for semente in sementes:
+        metricas, ticks_sorteio = _simular_semente(semente)
+        por_tarefa = {tid: (m['turnaround'], m['espera']) for tid, m in metricas['tarefas'].items()}
+        globais = {nome: metricas['global'][nome] for nome in METRICAS_GLOBAIS}
+        amostras.append((semente, globais, por_tarefa, sorted(set(ticks_sorteio))))
+    return amostras
+
+def estatisticas(valores):
+    """Média, desvio, percentis e intervalo de confiança de 95% da média (aproximação normal)."""
+    v = np.asarray(valores, dtype=float)
+    media = float(v.mean())
+    desvio = float(v.std(ddof=1)) if len(v) > 1 else 0.0
+    margem = Z_95 * desvio / math.sqrt(len(v))
+    estat = {'media': media, 'desvio': desvio, 'ic95': (media - margem, media + margem)}
+    for p, valor in zip(PERCENTIS, np.percentile(v, PERCENTIS)):
+        estat[f'p{p}'] = float(valor)
+    return estat
+
+def agregar(amostras):
+    """Junta as amostras [(semente, globais, por_tarefa, ticks_sorteio)] em estatísticas."""
+    k = len(amostras)
+    globais = {nome: estatisticas([a[1][nome] for a in amostras]) for nome in METRICAS_GLOBAIS}
+
+    turnarounds, esperas = {}, {}
+    for _, _, por_tarefa, _ in amostras:
+        for tid, (turnaround, espera) in por_tarefa.items():
+            turnarounds.setdefault(tid, []).append(turnaround)
+            esperas.setdefault(tid, []).append(espera)
+    tarefas = {tid: {'turnaround': estatisticas(turnarounds[tid]), 'espera': estatisticas(esperas[tid]),
+                     'concluida': len(turnarounds[tid]) / k}
+               for tid in turnarounds}
+
+    contagem = Counter(tick for _, _, _, ticks in amostras for tick in ticks)
+    return {
+        'amostras': k,
+        'sementes': (min(a[0] for a in amostras), max(a[0] for a in amostras)),
+        'global': globais,
+        'tarefas': tarefas,
+        'sorteio_por_tick': {tick: n / k for tick, n in sorted(contagem.items())},
+        'amostras_com_sorteio': sum(1 for a in amostras if a[3]) / k,
+    }
+
+def analisar_sementes(simulador_base, amostras=AMOSTRAS_PADRAO, semente_inicial=None, max_processos=None):
+    """
+    Roda a mesma carga com as sementes semente_inicial .. semente_inicial+amostras-1
+    em processos de trabalho e agrega as métricas (veja agregar). A carga vai para
+    cada processo uma vez, no inicializador; as tarefas do pool são só lotes de sementes.
+    """
+    amostras = int(amostras)
+    if amostras < 1: raise ValueError("O número de amostras deve ser no mínimo 1.")
+    inicio = simulador_base.semente if semente_inicial is None else int(semente_inicial)
+    sementes = list(range(inicio, inicio + amostras))
+    processos = max_processos or min(os.cpu_count() or 1, amostras)
+    tamanho_lote = max(1, min(AMOSTRAS_POR_LOTE, math.ceil(amostras / (processos * 4))))
+    lotes = [sementes[i:i + tamanho_lote] for i in range(0, amostras, tamanho_lote)]
+
+    resultados = []
+    with ProcessPoolExecutor(max_workers=processos, mp_context=_contexto_processos(),
+                             initializer=_iniciar_trabalhador, initargs=(simulador_base,)) as executor:
+        for lote in executor.map(_simular_lote, lotes):
+            resultados.extend(lote)
+    return agregar(resultados)
+
+def _formatar_estat(e, casas=2):
+    return (f"{e['media']:>10.{casas}f} ±{e['ic95'][1] - e['media']:>7.{casas}f}"
+            f"{e['p5']:>9.{casas}f}{e['p50']:>9.{casas}f}{e['p95']:>9.{casas}f}")
+
+def formatar_montecarlo(resultado, limite_tarefas=30, limite_ticks=20):
+    """Relatório em texto: métricas globais, por tarefa (cargas pequenas) e ticks com sorteio."""
+    primeira, ultima = resultado['sementes']
+    linhas = [f"Amostras: {resultado['amostras']} (sementes {primeira}..{ultima}) | "
+              f"Com algum sorteio: {resultado['amostras_com_sorteio'] * 100:.1f}%",
+              f"{'MÉTRICA':<20}{'MÉDIA':>10}{'IC95%':>9}{'P5':>9}{'P50':>9}{'P95':>9}"]
+    for nome, estat in resultado['global'].items():
+        linhas.append(f"{nome:<20}{_formatar_estat(estat, 4 if nome == 'utilizacao_cpu' else 2)}")
+
+    if resultado['tarefas'] and len(resultado['tarefas']) <= limite_tarefas:
+        linhas.append(f"\n{'TAREFA':<14}{'':<6}{'MÉDIA':>10}{'IC95%':>9}{'P5':>9}{'P50':>9}{'P95':>9}{'CONCL.':>8}")
+        for tid, m in resultado['tarefas'].items():
+            linhas.append(f"{tid:<14}{'turn.':<6}{_formatar_estat(m['turnaround'])}{m['concluida'] * 100:>7.0f}%")
+            linhas.append(f"{'':<14}{'espera':<6}{_formatar_estat(m['espera'])}")
+
+    frequencias = resultado['sorteio_por_tick']
+    if frequencias:
+        mais_frequentes = sorted(frequencias.items(), key=lambda item: (-item[1], item[0]))[:limite_ticks]
+        linhas.append(f"\nTICKS COM SORTEIO ({len(frequencias)} distintos; os {len(mais_frequentes)} mais frequentes):")
+        linhas.append("  " + " | ".join(f"t{tick}: {freq * 100:.0f}%" for tick, freq in sorted(mais_frequentes)))
+    else:
+        linhas.append("\nNenhum sorteio em nenhuma amostra: o resultado não depende da semente.")
+    return "\n".join(linhas)
@@ -1,12 +1,14 @@
-import os
-import sys
-import importlib.util
-import inspect
 import re
+from functools import lru_cache
 import matplotlib.colors as mcolors
-from simulator.core import Simulator, TCB
-from simulator.schedulers import FIFO, SRTF, PriorityPreemptive, PriorityAging, RoundRobin, Scheduler
+from simulator.core import Simulator, TCB, INTERVALO_KEYFRAME_PADRAO, SEMENTE_PADRAO, POLITICAS_DEADLOCK
+from simulator.smp import SimuladorSMP
+from simulator.schedulers import (FIFO, SRTF, PriorityPreemptive, PriorityAging, RoundRobin, MLFQ, CFS,
+                                  NIVEIS_MLFQ_PADRAO, BOOST_MLFQ_PADRAO)
+from simulator.plugins import CARREGADOR_PADRAO, DIRETORIO_PLUGINS_PADRAO
+from simulator.registros import FORMATOS_LOG
 
+@lru_cache(maxsize=1024)  # cargas grandes repetem poucas cores
 def _normalizar_cor(cor_str):
     cor_limpa = cor_str.strip()
     if re.fullmatch(r'[0-9A-Fa-f]{6}', cor_limpa):
@@ -15,28 +17,45 @@ def _normalizar_cor(cor_str):
         raise ValueError(f"Cor '{cor_str}' inválida. Use HEX (#RRGGBB) ou nomes em Inglês (red, blue, etc).")
     return cor_limpa
 
-def carregar_plugins(diretorio_plugins="extensions"):
-    plugins = {}
-    if not os.path.isdir(diretorio_plugins): return plugins
-    abs_path = os.path.abspath(diretorio_plugins)
-    if abs_path not in sys.path: sys.path.append(abs_path)
+def _ler_linha_sistema(linha):
+    """
+    Separa os campos posicionais (ALGORITMO;QUANTUM[;ALPHA]) das opções nomeadas
+    no formato CHAVE=VALOR, que podem aparecer em qualquer posição após o quantum.
+    """
+    posicionais = []
+    opcoes = {}
+    for campo in linha.split(';'):
+        campo = campo.strip()
+        if '=' in campo:
+            chave, valor = campo.split('=', 1)
+            opcoes[chave.strip().upper()] = valor.strip()
+        else:
+            posicionais.append(campo)
+    return posicionais, opcoes
 
-    for arquivo in os.listdir(diretorio_plugins):
-        if arquivo.endswith(".py") and arquivo != "__init__.py":
-            caminho_completo = os.path.join(diretorio_plugins, arquivo)
-            nome_modulo = arquivo[:-3] 
-            try:
-                spec = importlib.util.spec_from_file_location(nome_modulo, caminho_completo)
-                if spec and spec.loader:
-                    modulo = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(modulo)
-                    for nome, obj in inspect.getmembers(modulo, inspect.isclass):
-                        if issubclass(obj, Scheduler) and obj is not Scheduler:
-                            plugins[nome.upper()] = obj
-            except Exception: pass
+def carregar_plugins(diretorio_plugins=DIRETORIO_PLUGINS_PADRAO):
+    """Retorna {NOME: classe} dos plugins da pasta. Só reexecuta os arquivos alterados."""
+    plugins, _ = CARREGADOR_PADRAO.carregar(diretorio_plugins)
     return plugins
 
-def obter_escalonador(algoritmo_nome, quantum, alpha=0, plugins_externos=None):
+def carregar_plugins_detalhado(diretorio_plugins=DIRETORIO_PLUGINS_PADRAO):
+    """Como carregar_plugins, mas retorna também o relatório por arquivo (tempo e erros)."""
+    return CARREGADOR_PADRAO.carregar(diretorio_plugins)
+
+def _escalonador_mlfq(quantum, opcoes):
+    """
+    MLFQ;QUANTUM[;NIVEIS=n][;QUANTA=q0,q1,...][;BOOST=ticks]: sem QUANTA, o nível
+    k usa QUANTUM * 2^k (QUANTUM 0 vale 1). BOOST=0 desliga o boost.
+    """
+    if 'QUANTA' in opcoes:
+        quanta = [int(q) for q in opcoes['QUANTA'].split(',') if q.strip()]
+    else:
+        niveis = int(opcoes.get('NIVEIS', NIVEIS_MLFQ_PADRAO))
+        if niveis < 1: raise ValueError("NIVEIS deve ser no mínimo 1.")
+        quanta = [max(1, quantum) * 2 ** k for k in range(niveis)]
+    return MLFQ(quanta, int(opcoes.get('BOOST', BOOST_MLFQ_PADRAO)))
+
+def obter_escalonador(algoritmo_nome, quantum, alpha=0, plugins_externos=None, opcoes=None):
     algoritmo_upper = algoritmo_nome.upper()
     if plugins_externos and algoritmo_upper in plugins_externos:
         cls = plugins_externos[algoritmo_upper]
@@ -53,100 +72,159 @@ def obter_escalonador(algoritmo_nome, quantum, alpha=0, plugins_externos=None):
         return PriorityAging(alpha)
     elif algoritmo_upper in ['RR', 'ROUNDROBIN']:
         return RoundRobin()
+    elif algoritmo_upper == 'MLFQ':
+        return _escalonador_mlfq(quantum, opcoes or {})
+    elif algoritmo_upper == 'CFS':
+        # O quantum é a granularidade mínima; LATENCIA=n muda o período alvo
+        latencia = (opcoes or {}).get('LATENCIA')
+        return CFS(max(1, quantum), int(latencia) if latencia is not None else None)
     return None
 
-def carregar_configuracao_arquivo(caminho_arquivo, plugins_externos=None):
+def montar_simulador(linha, plugins_externos=None, semente=None):
+    """
+    Monta o Simulator (ainda sem tarefas) a partir da linha de sistema do config.
+    Retorna (simulador, descrição) para o resumo impresso por quem carregou.
+    """
+    linha_sistema, opcoes = _ler_linha_sistema(linha)
+    algoritmo_nome = linha_sistema[0].strip()
+    quantum = int(linha_sistema[1].strip())
+    
+    alpha = 0
+    if len(linha_sistema) >= 3:
+        try: alpha = int(linha_sistema[2].strip())
+        except ValueError: alpha = 0
+    
+    escalonador = obter_escalonador(algoritmo_nome, quantum, alpha, plugins_externos, opcoes)
+    if not escalonador: raise ValueError(f"Algoritmo '{algoritmo_nome}' desconhecido.")
+    
+    intervalo_keyframe = int(opcoes.get('KEYFRAME', INTERVALO_KEYFRAME_PADRAO))
+    if intervalo_keyframe < 1: raise ValueError("KEYFRAME deve ser no mínimo 1.")
+    if semente is None:
+        semente = int(opcoes.get('SEMENTE', SEMENTE_PADRAO))
+    num_cpus = int(opcoes.get('CPUS', 1))
+    if num_cpus < 1: raise ValueError("CPUS deve ser no mínimo 1.")
+    if num_cpus > 1:
+        fila_global = opcoes.get('FILA', 'GLOBAL').upper() != 'LOCAL'
+        roubo = opcoes.get('ROUBO', 'NAO').upper() in ('SIM', '1', 'S')
+        simulador = SimuladorSMP(escalonador, quantum, num_cpus, fila_global, roubo, intervalo_keyframe, semente)
+    else:
+        simulador = Simulator(escalonador, quantum, intervalo_keyframe, semente)
+    simulador.nome_algoritmo_config = algoritmo_nome
+    simulador.formato_log = opcoes.get('LOG', 'MEMORIA').upper()
+    if simulador.formato_log not in FORMATOS_LOG:
+        raise ValueError(f"LOG={simulador.formato_log} inválido (use {', '.join(FORMATOS_LOG)}).")
+    simulador.politica_deadlock = opcoes.get('DEADLOCK', 'BANQUEIRO').upper()
+    if simulador.politica_deadlock not in POLITICAS_DEADLOCK:
+        raise ValueError(f"DEADLOCK={simulador.politica_deadlock} inválido (use {', '.join(POLITICAS_DEADLOCK)}).")
+    simulador.abortar_vitima = opcoes.get('RECUPERAR', 'NAO').upper() in ('SIM', '1', 'S')
+    simulador.definir_nivel_registro(opcoes.get('REGISTRO', 'COMPLETO'))
+    if 'LOG_MB' in opcoes:
+        simulador.tamanho_max_log = int(float(opcoes['LOG_MB']) * 1024 * 1024)
+    if algoritmo_nome.upper() == 'PRIOPENV':
+         simulador.nome_algoritmo_config += f" (Alpha={alpha})"
+    if isinstance(escalonador, MLFQ):
+        simulador.nome_algoritmo_config += f" (Quanta={','.join(map(str, escalonador.quanta))} | Boost={escalonador.periodo_boost})"
+    if isinstance(escalonador, CFS):
+        simulador.nome_algoritmo_config += f" (Granularidade={escalonador.granularidade} | Latência={escalonador.latencia})"
+
+    descricao = (f"Sistema: {algoritmo_nome}, Q={quantum}, Alpha={alpha}, Semente={simulador.semente}, "
+                 f"CPUs={num_cpus}")
+    return simulador, descricao
+
+def ler_linha_tarefa(linha, num_cpus=1, i=None):
+    """
+    Converte uma linha de tarefa do config (ID;COR;INGRESSO;DURACAO;PRIORIDADE[;ações])
+    em TCB. i é o número da linha, usado nas mensagens de erro e avisos.
+    """
+    partes = linha.strip().split(';')
+    if len(partes) < 5: raise ValueError(f"Linha {i} mal formatada.")
+    
+    tcb = TCB(
+        partes[0].strip(), 
+        _normalizar_cor(partes[1]), 
+        int(partes[2]), 
+        int(partes[3]), 
+        int(partes[4])
+    )
+    
+    if len(partes) > 5:
+        acoes_cruas = partes[5:]
+        acoes_parseadas = []
+        for item in acoes_cruas:
+            item = item.strip()
+            if not item: continue
+            try:
+                if item.upper().startswith("AF:"):
+                    # Afinidade (modo SMP): AF:0,2 -> só roda nas CPUs 0 e 2
+                    cpus = {int(c) for c in item[3:].split(',') if c.strip()}
+                    if not cpus or max(cpus) >= num_cpus or min(cpus) < 0:
+                        raise ValueError(f"Afinidade {item} fora das CPUs disponíveis (CPUS={num_cpus}).")
+                    tcb.afinidade = cpus
+                    continue
+                if item.startswith("IO:"):
+                    resto = item[3:].split('-')
+                    inicio_io = int(resto[0])
+                    duracao_io = int(resto[1])
+                    
+                    if inicio_io >= tcb.duracao:
+                        raise ValueError(f"Tempo da E/S {item} ({inicio_io}) excede duração da tarefa.")
+                    if duracao_io < 1:
+                        raise ValueError(f"Duração da E/S {item} deve ser no mínimo 1 (Req 3.4).")
+
+                    acoes_parseadas.append({
+                        'tipo': 'IO',
+                        'tempo': inicio_io,
+                        'duracao_io': duracao_io,
+                        'ordem_original': len(acoes_parseadas) 
+                    })
+                else:
+                    tipo = item[:2].upper() 
+                    resto = item[2:].split(':')
+                    mutex_id = int(resto[0])
+                    tempo = int(resto[1])
+                    
+                    if tipo not in ['ML', 'MU']:
+                        print(f"Aviso: Ação desconhecida '{item}' na linha {i}. Ignorada.")
+                        continue
+                    if tempo >= tcb.duracao:
+                        raise ValueError(f"Tempo da ação {item} ({tempo}) excede duração da tarefa.")
+
+                    acoes_parseadas.append({
+                        'tipo': tipo,
+                        'mutex': mutex_id,
+                        'tempo': tempo,
+                        'ordem_original': len(acoes_parseadas)
+                    })
+                    # Registra no TCB que esse recurso será necessário
+                    if tipo == 'ML':
+                        tcb.recursos_maximos.add(mutex_id)
+
+            except (ValueError, IndexError) as e:
+                if "excede duração" in str(e) or "Req 3.4" in str(e) or "Afinidade" in str(e):
+                    raise e 
+                print(f"Aviso: Formato inválido de ação '{item}' na linha {i}. Ignorada.")
+        
+        acoes_parseadas.sort(key=lambda x: (x['tempo'], x['ordem_original']))
+        for acao in acoes_parseadas: del acao['ordem_original']
+        tcb.acoes = acoes_parseadas
+    return tcb
+
+def carregar_configuracao_arquivo(caminho_arquivo, plugins_externos=None, semente=None):
+    """
+    Lê o arquivo de configuração e monta o Simulator.
+    A semente do desempate vem do argumento (CLI), da opção SEMENTE=n ou do padrão.
+    """
     try:
         with open(caminho_arquivo, 'r') as f:
             linhas = [linha.strip() for linha in f.readlines() if linha.strip()]
         if len(linhas) < 2: raise ValueError("Arquivo inválido.")
-            
-        linha_sistema = linhas[0].split(';')
-        algoritmo_nome = linha_sistema[0].strip()
-        quantum = int(linha_sistema[1].strip())
-        
-        alpha = 0
-        if len(linha_sistema) >= 3:
-            try: alpha = int(linha_sistema[2].strip())
-            except ValueError: alpha = 0
-        
-        escalonador = obter_escalonador(algoritmo_nome, quantum, alpha, plugins_externos)
-        if not escalonador: raise ValueError(f"Algoritmo '{algoritmo_nome}' desconhecido.")
-        
-        simulador = Simulator(escalonador, quantum)
-        simulador.nome_algoritmo_config = algoritmo_nome
-        if algoritmo_nome.upper() == 'PRIOPENV':
-             simulador.nome_algoritmo_config += f" (Alpha={alpha})"
 
+        simulador, descricao = montar_simulador(linhas[0], plugins_externos, semente)
+        num_cpus = getattr(simulador, 'num_cpus', 1)
         for i, linha in enumerate(linhas[1:], start=2):
-            partes = linha.strip().split(';')
-            if len(partes) < 5: raise ValueError(f"Linha {i} mal formatada.")
-            
-            tcb = TCB(
-                partes[0].strip(), 
-                _normalizar_cor(partes[1]), 
-                int(partes[2]), 
-                int(partes[3]), 
-                int(partes[4])
-            )
-            
-            if len(partes) > 5:
-                acoes_cruas = partes[5:]
-                acoes_parseadas = []
-                for item in acoes_cruas:
-                    item = item.strip()
-                    if not item: continue
-                    try:
-                        if item.startswith("IO:"):
-                            resto = item[3:].split('-')
-                            inicio_io = int(resto[0])
-                            duracao_io = int(resto[1])
-                            
-                            if inicio_io >= tcb.duracao:
-                                raise ValueError(f"Tempo da E/S {item} ({inicio_io}) excede duração da tarefa.")
-                            if duracao_io < 1:
-                                raise ValueError(f"Duração da E/S {item} deve ser no mínimo 1 (Req 3.4).")
-
-                            acoes_parseadas.append({
-                                'tipo': 'IO',
-                                'tempo': inicio_io,
-                                'duracao_io': duracao_io,
-                                'ordem_original': len(acoes_parseadas) 
-                            })
-                        else:
-                            tipo = item[:2].upper() 
-                            resto = item[2:].split(':')
-                            mutex_id = int(resto[0])
-                            tempo = int(resto[1])
-                            
-                            if tipo not in ['ML', 'MU']:
-                                print(f"Aviso: Ação desconhecida '{item}' na linha {i}. Ignorada.")
-                                continue
-                            if tempo >= tcb.duracao:
-                                raise ValueError(f"Tempo da ação {item} ({tempo}) excede duração da tarefa.")
-
-                            acoes_parseadas.append({
-                                'tipo': tipo,
-                                'mutex': mutex_id,
-                                'tempo': tempo,
-                                'ordem_original': len(acoes_parseadas)
-                            })
-                            # Registra no TCB que esse recurso será necessário
-                            if tipo == 'ML':
-                                tcb.recursos_maximos.add(mutex_id)
-
-                    except (ValueError, IndexError) as e:
-                        if "excede duração" in str(e) or "Req 3.4" in str(e):
-                            raise e 
-                        print(f"Aviso: Formato inválido de ação '{item}' na linha {i}. Ignorada.")
-                
-                acoes_parseadas.sort(key=lambda x: (x['tempo'], x['ordem_original']))
-                for acao in acoes_parseadas: del acao['ordem_original']
-                tcb.acoes = acoes_parseadas
-
-            simulador.adicionar_tarefa(tcb)
+            simulador.adicionar_tarefa(ler_linha_tarefa(linha, num_cpus, i))
             
-        print(f"Sistema: {algoritmo_nome}, Q={quantum}, Alpha={alpha}, Tasks={len(simulador.tarefas)}")
+        print(f"{descricao}, Tasks={len(simulador.tarefas)}")
         return simulador
     except Exception as e:
         print(f"Erro: {e}")
@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+import hashlib
+import inspect
+import threading
+import traceback
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from simulator.schedulers import Scheduler, EscalonadorIncremental
+
+DIRETORIO_PLUGINS_PADRAO = "extensions"
+# Prefixo dos módulos de plugin em sys.modules: um plugin "random.py" não pode
+# substituir o módulo random da biblioteca padrão
+PREFIXO_MODULO_PLUGIN = "_plugin_"
+
+class _EntradaPlugin:
+    """Um arquivo de plugin já carregado, com a assinatura usada para detectar mudanças."""
+    def __init__(self, caminho, mtime_ns, tamanho, sha256, modulo, classes):
+        self.caminho = caminho
+        self.mtime_ns = mtime_ns
+        self.tamanho = tamanho
+        self.sha256 = sha256
+        self.modulo = modulo
+        self.classes = classes  # NOME_EM_MAIUSCULAS -> classe
+
+class _FalhaPlugin:
+    """Última versão de um arquivo que falhou ao carregar: não é reexecutada até o arquivo mudar."""
+    def __init__(self, caminho, mtime_ns, tamanho, sha256, erro):
+        self.caminho = caminho
+        self.mtime_ns = mtime_ns
+        self.tamanho = tamanho
+        self.sha256 = sha256
+        self.erro = erro
+
+def _arquivo_da_classe(cls):
+    modulo = sys.modules.get(cls.__module__)
+    return os.path.abspath(modulo.__file__) if getattr(modulo, '__file__', None) else None
+
+class CarregadorPlugins:
+    """
+    Carregador de plugins com cache por arquivo. Um arquivo só é reexecutado
+    quando muda: primeiro compara mtime e tamanho (sem ler o arquivo) e, se
+    diferirem, compara o sha256 do conteúdo (um 'touch' não força recarga).
+    Os arquivos alterados são carregados em paralelo e cada um tem seu tempo
+    de carga e seu erro registrados no relatório.
+
+    Se um arquivo já carregado passar a falhar, a última versão válida continua
+    ativa até o erro ser corrigido. A falha também fica em cache: o arquivo com
+    erro só é reexecutado quando o conteúdo mudar.
+    """
+    def __init__(self, max_threads=None):
+        self.max_threads = max_threads
+        self._entradas = {}  # caminho absoluto -> _EntradaPlugin
+        self._falhas = {}    # caminho absoluto -> _FalhaPlugin (versão atual do arquivo falha)
+        self._trava = threading.Lock()
+
+    def _listar_arquivos(self, diretorio):
+        return sorted(os.path.abspath(os.path.join(diretorio, arquivo)) for arquivo in os.listdir(diretorio)
+                      if arquivo.endswith(".py") and arquivo != "__init__.py")
+
+    def _precisa_recarregar(self, caminho, info):
+        """Retorna (precisa, sha256 do conteúdo ou None se nem foi lido)."""
+        # Compara com a última versão vista do arquivo: a que falhou, se houver
+        entrada = self._falhas.get(caminho) or self._entradas.get(caminho)
+        if entrada and entrada.mtime_ns == info.st_mtime_ns and entrada.tamanho == info.st_size:
+            return False, None
+        with open(caminho, 'rb') as f:
+            sha256 = hashlib.sha256(f.read()).hexdigest()
+        if entrada and entrada.sha256 == sha256:
+            entrada.mtime_ns, entrada.tamanho = info.st_mtime_ns, info.st_size
+            return False, sha256
+        return True, sha256
+
+    def _executar_arquivo(self, caminho, info, sha256):
+        """Executado em uma thread: importa um arquivo e retorna (entrada ou None, segundos, erro)."""
+        nome_modulo = PREFIXO_MODULO_PLUGIN + os.path.basename(caminho)[:-3]
+        inicio = time.perf_counter()
+        try:
+            spec = importlib.util.spec_from_file_location(nome_modulo, caminho)
+            if not spec or not spec.loader:
+                raise ImportError("Arquivo não pode ser importado.")
+            modulo = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(modulo)
+            classes = {}
+            for nome, obj in inspect.getmembers(modulo, inspect.isclass):
+                # Como no carregador original, vale qualquer escalonador visível no módulo,
+                # inclusive os reexportados de um módulo auxiliar
+                if issubclass(obj, Scheduler) and obj not in (Scheduler, EscalonadorIncremental):
+                    classes[nome.upper()] = obj
+            entrada = _EntradaPlugin(caminho, info.st_mtime_ns, info.st_size, sha256, modulo, classes)
+            return entrada, time.perf_counter() - inicio, None
+        except BaseException:
+            erro = traceback.format_exc(limit=-1).strip().splitlines()[-1]
+            return None, time.perf_counter() - inicio, erro
+
+    def carregar(self, diretorio_plugins=DIRETORIO_PLUGINS_PADRAO):
+        """
+        Sincroniza o cache com a pasta. Retorna (plugins, relatorio), onde plugins
+        é {NOME: classe} de todos os arquivos ativos e relatorio é uma lista de
+        dicts com 'arquivo', 'situacao', 'tempo', 'classes' e 'erro'.
+        """
+        with self._trava:
+            if not os.path.isdir(diretorio_plugins):
+                arquivos = []
+            else:
+                abs_path = os.path.abspath(diretorio_plugins)
+                if abs_path not in sys.path: sys.path.append(abs_path)
+                arquivos = self._listar_arquivos(diretorio_plugins)
+
+            relatorio = []
+            pendentes = []
+            for caminho in arquivos:
+                info = os.stat(caminho)
+                precisa, sha256 = self._precisa_recarregar(caminho, info)
+                if precisa:
+                    pendentes.append((caminho, info, sha256))
+                elif caminho in self._falhas:
+                    anterior = self._entradas.get(caminho)
+                    situacao = 'erro em cache (mantida versão anterior)' if anterior else 'erro em cache'
+                    relatorio.append({'arquivo': caminho, 'situacao': situacao, 'tempo': 0.0,
+                                      'classes': sorted(anterior.classes) if anterior else [],
+                                      'erro': self._falhas[caminho].erro})
+                else:
+                    relatorio.append({'arquivo': caminho, 'situacao': 'em cache', 'tempo': 0.0,
+                                      'classes': sorted(self._entradas[caminho].classes), 'erro': None})
+
+            if pendentes:
+                threads = self.max_threads or min(len(pendentes), (os.cpu_count() or 1) + 4)
+                with ThreadPoolExecutor(max_workers=threads) as executor:
+                    resultados = list(executor.map(lambda p: self._executar_arquivo(*p), pendentes))
+                for (caminho, info, sha256), (entrada, segundos, erro) in zip(pendentes, resultados):
+                    anterior = self._entradas.get(caminho)
+                    if entrada:
+                        self._entradas[caminho] = entrada
+                        self._falhas.pop(caminho, None)
+                        # Registra o módulo (com o __name__ dele, já prefixado) para que o
+                        # pickle (checkpoints) encontre as classes
+                        sys.modules[entrada.modulo.__name__] = entrada.modulo
+                        situacao = 'recarregado' if anterior else 'carregado'
+                    else:
+                        self._falhas[caminho] = _FalhaPlugin(caminho, info.st_mtime_ns, info.st_size, sha256, erro)
+                        situacao = 'erro (mantida versão anterior)' if anterior else 'erro'
+                    relatorio.append({'arquivo': caminho, 'situacao': situacao, 'tempo': segundos,
+                                      'classes': sorted((entrada or anterior).classes) if (entrada or anterior) else [],
+                                      'erro': erro})
+
+            for caminho in set(self._falhas) - set(arquivos):
+                del self._falhas[caminho]
+            for caminho in sorted(set(self._entradas) - set(arquivos)):
+                entrada = self._entradas.pop(caminho)
+                if sys.modules.get(entrada.modulo.__name__) is entrada.modulo:
+                    del sys.modules[entrada.modulo.__name__]
+                relatorio.append({'arquivo': caminho, 'situacao': 'removido', 'tempo': 0.0,
+                                  'classes': sorted(entrada.classes), 'erro': None})
+
+            plugins = {}
+            for caminho in sorted(self._entradas):
+                for nome, cls in self._entradas[caminho].classes.items():
+                    # A mesma classe reexportada por outro arquivo não é conflito
+                    if nome in plugins and (plugins[nome] is cls or
+                                            _arquivo_da_classe(plugins[nome]) == _arquivo_da_classe(cls)):
+                        continue
+                    if nome in plugins:
+                        for item in relatorio:
+                            if item['arquivo'] == caminho and not item['erro']:
+                                item['erro'] = f"Classe {nome} já definida em outro plugin; ignorada."
+                        continue
+                    plugins[nome] = cls
+
+            relatorio.sort(key=lambda item: item['arquivo'])
+            return plugins, relatorio
+
+def formatar_relatorio_plugins(relatorio):
+    """Texto com uma linha por arquivo: situação, tempo de carga, classes e erro."""
+    if not relatorio:
+        return "Nenhum arquivo .py encontrado."
+    linhas = []
+    for item in relatorio:
+        nome = os.path.basename(item['arquivo'])
+        classes = ", ".join(item['classes']) or "-"
+        linhas.append(f"{nome:<24}{item['situacao']:<40}{item['tempo'] * 1000:>9.1f} ms  {classes}")
+        if item['erro']:
+            linhas.append(f"{'':<24}-> {item['erro']}")
+    return "\n".join(linhas)
+
+# Carregador compartilhado pelo menu: mantém o cache entre chamadas da opção [5]
+CARREGADOR_PADRAO = CarregadorPlugins()
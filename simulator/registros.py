@@ -0,0 +1,290 @@
+import os
+import csv
+import json
+import zlib
+import pickle
+import struct
+from itertools import islice
+from abc import ABC, abstractmethod
+
+# Logs do Gantt são append-only: snapshots compactos guardam apenas o tamanho deles
+CAMPOS_LOG = ('gantt_log', 'bloqueio_log', 'io_log', 'mutex_event_log')
+
+FORMATOS_LOG = ('MEMORIA', 'CSV', 'JSONL', 'BINARIO')
+TAMANHO_MAX_PADRAO = 64 * 1024 * 1024  # bytes por arquivo antes da rotação
+TAMANHO_BUFFER_PADRAO = 4096           # entradas acumuladas em memória antes de gravar
+
+def escrever_bloco(f, obj, nivel=6):
+    """Bloco binário: tamanho (4 bytes) + pickle comprimido com zlib (nivel 1 = mais rápido)."""
+    dados = zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), nivel)
+    f.write(struct.pack('<I', len(dados)))
+    f.write(dados)
+
+def ler_bloco(f):
+    cabecalho = f.read(4)
+    if len(cabecalho) < 4: return None
+    (tamanho,) = struct.unpack('<I', cabecalho)
+    return pickle.loads(zlib.decompress(f.read(tamanho)))
+
+class DestinoMemoria(list):
+    """Destino padrão: as entradas ficam em uma lista, como sempre foi."""
+    persistente = False
+
+    def sincronizar(self):
+        pass
+
+    def fechar(self):
+        pass
+
+class DestinoArquivo(ABC):
+    """
+    Base dos destinos em disco. As entradas novas ficam em um buffer de até
+    tamanho_buffer itens e depois são gravadas no segmento atual
+    (<diretorio>/<nome>.<n>.<extensao>); quando o segmento passa de tamanho_max
+    bytes, um novo é aberto. Em memória ficam só o buffer e a lista de segmentos.
+
+    Para o core é uma lista append-only: append/extend, len, iteração (lendo
+    os arquivos), log[-1], fatias e `del log[n:]` (usado ao restaurar snapshots).
+    Com retomar=True os segmentos existentes são reaproveitados; senão são apagados.
+    """
+    persistente = True
+    extensao = ''
+    binario = False
+
+    def __init__(self, diretorio, nome, tamanho_max=TAMANHO_MAX_PADRAO, tamanho_buffer=TAMANHO_BUFFER_PADRAO,
+                 retomar=False):
+        self.diretorio = diretorio
+        self.nome = nome
+        self.tamanho_max = int(tamanho_max)
+        self.tamanho_buffer = max(1, int(tamanho_buffer))
+        self._segmentos = []  # [caminho, índice da primeira entrada, quantidade]
+        self._buffer = []
+        self._ultima = None
+        self._arquivo = None
+        os.makedirs(diretorio, exist_ok=True)
+        for caminho in self._listar_segmentos():
+            if retomar:
+                quantidade = sum(1 for _ in self._ler_segmento(caminho))
+                self._segmentos.append([caminho, self._gravadas(), quantidade])
+            else:
+                os.remove(caminho)
+        if self._gravadas():
+            self._ultima = self._ultima_gravada()
+
+    # --- Formato (implementado pelas subclasses) ---
+
+    @abstractmethod
+    def _escrever(self, f, entradas):
+        pass
+
+    @abstractmethod
+    def _ler(self, f):
+        pass
+
+    # --- Segmentos ---
+
+    def _caminho_segmento(self, numero):
+        return os.path.join(self.diretorio, f"{self.nome}.{numero:04d}.{self.extensao}")
+
+    def _listar_segmentos(self):
+        prefixo, sufixo = f"{self.nome}.", f".{self.extensao}"
+        nomes = [n for n in os.listdir(self.diretorio) if n.startswith(prefixo) and n.endswith(sufixo)
+                 and n[len(prefixo):-len(sufixo)].isdigit()]
+        return [os.path.join(self.diretorio, n) for n in sorted(nomes, key=lambda n: int(n[len(prefixo):-len(sufixo)]))]
+
+    def _abrir(self, caminho, modo):
+        if self.binario:
+            return open(caminho, modo + 'b')
+        return open(caminho, modo, newline='', encoding='utf-8')
+
+    def _ler_segmento(self, caminho):
+        with self._abrir(caminho, 'r') as f:
+            yield from self._ler(f)
+
+    def _gravadas(self):
+        if not self._segmentos: return 0
+        _, primeira, quantidade = self._segmentos[-1]
+        return primeira + quantidade
+
+    def _ultima_gravada(self):
+        ultima = None
+        for ultima in self._ler_segmento(self._segmentos[-1][0]): pass
+        return ultima
+
+    def _fechar_arquivo(self):
+        if self._arquivo:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def _descarregar(self):
+        """Grava o buffer no segmento atual, abrindo um novo se ele já passou do limite."""
+        if not self._buffer: return
+        if self._arquivo is None or self._arquivo.tell() >= self.tamanho_max:
+            self._fechar_arquivo()
+            if not self._segmentos or os.path.getsize(self._segmentos[-1][0]) >= self.tamanho_max:
+                self._segmentos.append([self._caminho_segmento(len(self._segmentos)), self._gravadas(), 0])
+            self._arquivo = self._abrir(self._segmentos[-1][0], 'a')
+        self._escrever(self._arquivo, self._buffer)
+        self._segmentos[-1][2] += len(self._buffer)
+        self._buffer = []
+
+    # --- Interface de lista usada pelo core ---
+
+    def append(self, entrada):
+        self._buffer.append(entrada)
+        self._ultima = entrada
+        if len(self._buffer) >= self.tamanho_buffer:
+            self._descarregar()
+
+    def extend(self, entradas):
+        for entrada in entradas:
+            self.append(entrada)
+
+    def __len__(self):
+        return self._gravadas() + len(self._buffer)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return self._iterar_desde(0)
+
+    def _iterar_desde(self, inicio):
+        self._descarregar()
+        if self._arquivo: self._arquivo.flush()
+        for caminho, primeira, quantidade in list(self._segmentos):
+            if primeira + quantidade <= inicio: continue
+            yield from islice(self._ler_segmento(caminho), max(0, inicio - primeira), None)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fim, passo = indice.indices(len(self))
+            if inicio >= fim: return []
+            return list(islice(self._iterar_desde(inicio), 0, fim - inicio, passo))
+        tamanho = len(self)
+        if indice < 0: indice += tamanho
+        if not 0 <= indice < tamanho:
+            raise IndexError("índice fora do log")
+        if indice == tamanho - 1:
+            return self._ultima
+        return next(self._iterar_desde(indice))
+
+    def __delitem__(self, indice):
+        if not isinstance(indice, slice) or indice.stop is not None or indice.step is not None:
+            raise TypeError("destinos em arquivo só aceitam remover o final (del log[n:])")
+        self.truncar(indice.indices(len(self))[0])
+
+    def truncar(self, tamanho):
+        """Descarta as entradas a partir de 'tamanho' (reescreve só o segmento em que ele cai)."""
+        if tamanho >= len(self): return
+        gravadas = self._gravadas()
+        if tamanho >= gravadas:
+            del self._buffer[tamanho - gravadas:]
+        else:
+            self._buffer = []
+            self._fechar_arquivo()
+            while self._segmentos and self._segmentos[-1][1] >= tamanho:
+                os.remove(self._segmentos.pop()[0])
+            if self._segmentos:
+                caminho, primeira, _ = self._segmentos[-1]
+                mantidas = list(islice(self._ler_segmento(caminho), tamanho - primeira))
+                with self._abrir(caminho, 'w') as f:
+                    self._escrever(f, mantidas)
+                self._segmentos[-1][2] = len(mantidas)
+        if self._buffer:
+            self._ultima = self._buffer[-1]
+        else:
+            self._ultima = self._ultima_gravada() if self._segmentos else None
+
+    def sincronizar(self):
+        """Grava o buffer e força a escrita no disco (usado pelos checkpoints)."""
+        self._descarregar()
+        if self._arquivo:
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+
+    def fechar(self):
+        self._descarregar()
+        self._fechar_arquivo()
+
+    def __getstate__(self):
+        # Vai para outro processo (ou para um pickle) com tudo já gravado e sem o arquivo aberto
+        self.sincronizar()
+        estado = self.__dict__.copy()
+        estado['_arquivo'] = None
+        return estado
+
+class DestinoJSONL(DestinoArquivo):
+    """Uma entrada por linha, em JSON."""
+    extensao = 'jsonl'
+
+    def _escrever(self, f, entradas):
+        f.write(''.join(json.dumps(e, ensure_ascii=False, separators=(',', ':')) + '\n' for e in entradas))
+
+    def _ler(self, f):
+        for linha in f:
+            if linha.strip(): yield json.loads(linha)
+
+def _booleano(valor):
+    return valor == 'True'
+
+class DestinoCSV(DestinoArquivo):
+    """
+    CSV com colunas fixas por log (cada segmento tem seu cabeçalho). Colunas
+    vazias na leitura (ex.: 'cpu' fora do modo SMP) não voltam para a entrada.
+    """
+    extensao = 'csv'
+    COLUNAS = {
+        'gantt_log': (('tick', int), ('task_id', str), ('cor', str), ('sorteio', _booleano), ('cpu', int)),
+        'bloqueio_log': (('tick', int), ('task_id', str)),
+        'io_log': (('tick', int), ('task_id', str)),
+        'mutex_event_log': (('tick', int), ('task_id', str), ('tipo', str), ('mutex', int)),
+    }
+
+    def __init__(self, diretorio, nome, *args, **kwargs):
+        if nome not in self.COLUNAS:
+            raise ValueError(f"Log '{nome}' sem colunas definidas para CSV.")
+        self.colunas = self.COLUNAS[nome]
+        super().__init__(diretorio, nome, *args, **kwargs)
+
+    def _escrever(self, f, entradas):
+        escritor = csv.writer(f)
+        if f.tell() == 0:
+            escritor.writerow([coluna for coluna, _ in self.colunas])
+        escritor.writerows([e.get(coluna, '') for coluna, _ in self.colunas] for e in entradas)
+
+    def _ler(self, f):
+        leitor = csv.reader(f)
+        next(leitor, None)  # cabeçalho
+        for linha in leitor:
+            yield {coluna: converter(valor) for (coluna, converter), valor in zip(self.colunas, linha) if valor != ''}
+
+class DestinoBinario(DestinoArquivo):
+    """Log binário append-only: cada descarga do buffer vira um bloco pickle comprimido."""
+    extensao = 'bin'
+    binario = True
+
+    def _escrever(self, f, entradas):
+        if entradas:
+            escrever_bloco(f, entradas)
+
+    def _ler(self, f):
+        while True:
+            bloco = ler_bloco(f)
+            if bloco is None: return
+            yield from bloco
+
+_CLASSES_DESTINO = {'CSV': DestinoCSV, 'JSONL': DestinoJSONL, 'BINARIO': DestinoBinario}
+
+def criar_destinos_log(formato, diretorio=None, retomar=False, **opcoes):
+    """
+    Um destino por log do Simulator ({campo: destino}), para Simulator.usar_destinos_log.
+    formato: 'MEMORIA', 'CSV', 'JSONL' ou 'BINARIO'. opcoes: tamanho_max, tamanho_buffer.
+    """
+    formato = formato.upper()
+    if formato == 'MEMORIA':
+        return {campo: DestinoMemoria() for campo in CAMPOS_LOG}
+    classe = _CLASSES_DESTINO.get(formato)
+    if classe is None:
+        raise ValueError(f"Formato de log '{formato}' desconhecido (use {', '.join(FORMATOS_LOG)}).")
+    return {campo: classe(diretorio, campo, retomar=retomar, **opcoes) for campo in CAMPOS_LOG}
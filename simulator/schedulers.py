@@ -1,4 +1,6 @@
+import heapq
 import random
+from collections import deque
 from abc import ABC, abstractmethod
 from simulator.core import TaskState
 
@@ -6,6 +8,18 @@ class Scheduler(ABC):
     """
     Interface abstrata para todos os escalonadores.
     """
+    # Gerador do desempate. O Simulator substitui por um random.Random semeado,
+    # então plugins devem sortear com self.rng (ou usar self.desempatar).
+    rng = random
+
+    # Escalonadores com a interface orientada a eventos (EscalonadorIncremental)
+    incremental = False
+
+    # O escalonador lê t.duracao (na métrica ou no desempate)? Se não lê, mudar a
+    # duração de uma tarefa só afeta a simulação quando ela chega ao fim, e a
+    # re-simulação incremental (simulator.incremental) aproveita o que vem antes.
+    usa_duracao = True
+
     @property
     def usar_quantum(self):
         """
@@ -18,7 +32,68 @@ class Scheduler(ABC):
     def decidir(self, fila_prontos, tarefa_atual, mudanca_contexto_obrigatoria):
         pass
 
-def _escolher_com_desempate(candidatos, tarefa_atual, func_metrica_primaria):
+    def desempatar(self, candidatos, tarefa_atual, func_metrica_primaria):
+        """ Aplica as regras globais de desempate usando o gerador semeado. """
+        return _escolher_com_desempate(candidatos, tarefa_atual, func_metrica_primaria, self.rng)
+
+class EscalonadorIncremental(Scheduler):
+    """
+    Interface opcional orientada a eventos. Em vez de receber a fila de prontos
+    inteira a cada decisão, o escalonador é avisado de cada mudança e mantém a
+    sua própria estrutura (heap, filas por nível, árvore...):
+
+    - on_ready(t): t entrou em prontos (ingresso, volta de E/S, desbloqueio de
+      mutex ou preempção da tarefa que estava executando).
+    - on_block(t): a tarefa em execução bloqueou (E/S ou mutex).
+    - on_exit(t): a tarefa em execução terminou.
+    - on_tick(t, relogio): chamado a cada tick em que a tarefa em execução
+      continua na CPU (não terminou nem bloqueou), inclusive quando o quantum
+      estourou; retornar True pede uma troca de contexto obrigatória.
+    - pick_next(tarefa_atual, mudanca_contexto_obrigatoria): escolhe quem executa
+      e retira a escolhida da própria estrutura. Retorna (tarefa, houve_sorteio).
+      Se a escolhida não for a atual, o core devolve a atual com on_ready().
+    - proximo_despertar(relogio): tick em que o escalonador quer ser consultado
+      mesmo sem eventos (ex.: fim da fatia de tempo), ou None. Nesse tick o core
+      chama pick_next com mudança obrigatória, sem precisar de on_tick.
+
+    Com um escalonador incremental o core não mantém a lista fila_prontos nem
+    varre os prontos a cada tick: t.tempo_espera só é acertado quando a tarefa
+    é escolhida (Simulator.tempo_espera dá o valor corrente) e não há aging de
+    prioridade pelo core. Assim o custo de um tick não cresce com a fila.
+
+    O core só usa decidir() no modo SMP; quem quiser rodar com CPUS>1 também
+    implementa decidir(). Escalonadores que só implementam decidir() continuam
+    funcionando através de AdaptadorDecidir (simulator.core).
+    """
+    incremental = True
+
+    # Sem decidir() o escalonador só roda com CPUS=1 (veja suporta_smp)
+    decidir = None
+
+    def on_ready(self, tarefa):
+        pass
+
+    def on_block(self, tarefa):
+        pass
+
+    def on_exit(self, tarefa):
+        pass
+
+    def on_tick(self, tarefa, relogio):
+        return False
+
+    @abstractmethod
+    def pick_next(self, tarefa_atual, mudanca_contexto_obrigatoria):
+        pass
+
+    def proximo_despertar(self, relogio):
+        return None
+
+def suporta_smp(escalonador):
+    """O modo SMP (CPUS>1) sempre chama decidir(), que os só incrementais não têm."""
+    return escalonador.decidir is not None
+
+def _escolher_com_desempate(candidatos, tarefa_atual, func_metrica_primaria, rng=random):
     """
     Função Helper que aplica as regras de desempate globais.
     """
@@ -32,7 +107,7 @@ def _escolher_com_desempate(candidatos, tarefa_atual, func_metrica_primaria):
         nao_eh_atual = 0 if (tarefa_atual and t.id == tarefa_atual.id) else 1
         ingresso = t.ingresso
         duracao = t.duracao
-        fator_sorte = random.random()
+        fator_sorte = rng.random()
         
         score = (metrica, nao_eh_atual, ingresso, duracao, fator_sorte)
         lista_pontuada.append((score, t))
@@ -54,14 +129,14 @@ class FIFO(Scheduler):
     def decidir(self, fila_prontos, tarefa_atual, mudanca_contexto_obrigatoria):
         if tarefa_atual: return tarefa_atual, False
         if not fila_prontos: return None, False
-        return _escolher_com_desempate(fila_prontos, None, lambda t: t.ingresso)
+        return self.desempatar(fila_prontos, None, lambda t: t.ingresso)
 
 class SRTF(Scheduler):
     def decidir(self, fila_prontos, tarefa_atual, mudanca_contexto_obrigatoria):
         candidatos = list(fila_prontos)
         if tarefa_atual and tarefa_atual.estado == TaskState.EXECUTANDO:
             candidatos.append(tarefa_atual)
-        return _escolher_com_desempate(candidatos, tarefa_atual, lambda t: (t.duracao - t.tempo_executado))
+        return self.desempatar(candidatos, tarefa_atual, lambda t: (t.duracao - t.tempo_executado))
 
 class PriorityPreemptive(Scheduler):
     def decidir(self, fila_prontos, tarefa_atual, mudanca_contexto_obrigatoria):
@@ -72,7 +147,7 @@ class PriorityPreemptive(Scheduler):
         # Usar Prioridade Dinâmica
         # Isso permite que a Herança de Prioridade feita no Core tenha efeito.
         # Se não houver herança nem aging, a dinâmica é igual à estática, então não quebra nada.
-        return _escolher_com_desempate(candidatos, tarefa_atual, lambda t: -t.prioridade_dinamica)
+        return self.desempatar(candidatos, tarefa_atual, lambda t: -t.prioridade_dinamica)
 
 class PriorityAging(Scheduler):
     def __init__(self, alpha):
@@ -88,7 +163,7 @@ class PriorityAging(Scheduler):
             p_estatica = t.prioridade
             return (-p_dinamica, -p_estatica)
 
-        return _escolher_com_desempate(candidatos, tarefa_atual, calcular_metricas)
+        return self.desempatar(candidatos, tarefa_atual, calcular_metricas)
 
 class RoundRobin(Scheduler):
     
@@ -104,4 +179,236 @@ class RoundRobin(Scheduler):
             if tarefa_atual and tarefa_atual.estado == TaskState.EXECUTANDO:
                 return tarefa_atual, False
             return None, False
-        return _escolher_com_desempate(fila_prontos, None, lambda t: t.ingresso)
+        return self.desempatar(fila_prontos, None, lambda t: t.ingresso)
+
+NIVEIS_MLFQ_PADRAO = 3
+BOOST_MLFQ_PADRAO = 100  # ticks entre os boosts de prioridade
+
+class MLFQ(EscalonadorIncremental):
+    """
+    Multilevel Feedback Queue pela interface incremental. Cada nível tem uma fila
+    FIFO e o seu quantum; o nível 0 é o de maior prioridade.
+
+    - Tarefas novas (e as que voltam de E/S ou mutex) entram no fim da fila do
+      seu nível atual; quem bloqueia antes do fim da fatia não perde nível.
+    - Esgotar a fatia rebaixa a tarefa um nível (o último é o piso).
+    - Uma tarefa que chega em nível mais alto que o da atual a preempta.
+    - A cada periodo_boost ticks todas as tarefas voltam para o nível 0
+      (periodo_boost=0 desliga o boost).
+
+    A escolha é O(1): um inteiro guarda um bit por nível com fila não vazia e o
+    nível mais alto é o bit menos significativo ligado. O custo do boost é
+    proporcional às tarefas prontas, uma vez por período. Como o core não varre
+    os prontos de um escalonador incremental, os demais ticks ficam O(1)
+    (veja escala.py).
+    """
+    usa_duracao = False
+
+    def __init__(self, quanta, periodo_boost=BOOST_MLFQ_PADRAO):
+        self.quanta = [int(q) for q in quanta]
+        if not self.quanta or min(self.quanta) < 1:
+            raise ValueError("MLFQ precisa de pelo menos um nível e quantum >= 1 em todos.")
+        self.periodo_boost = max(0, int(periodo_boost))
+        self.filas = [deque() for _ in self.quanta]
+        self.mapa_niveis = 0       # bit n ligado = fila do nível n não vazia
+        self.niveis = {}           # tarefa_id -> (nível, geração do boost em que foi definido)
+        self.geracao = 0
+        self.proximo_boost = self.periodo_boost
+        self.usados = 0            # ticks da fatia atual da tarefa em execução
+
+    def nivel(self, tarefa):
+        nivel, geracao = self.niveis.get(tarefa.id, (0, self.geracao))
+        return nivel if geracao == self.geracao else 0
+
+    def _mais_alto(self):
+        return (self.mapa_niveis & -self.mapa_niveis).bit_length() - 1
+
+    def _retirar(self, nivel):
+        fila = self.filas[nivel]
+        tarefa = fila.popleft()
+        if not fila: self.mapa_niveis &= ~(1 << nivel)
+        return tarefa
+
+    def _boost(self, relogio):
+        # Tarefas fora das filas (executando, bloqueadas) voltam ao nível 0 pela geração
+        self.geracao += 1
+        topo = self.filas[0]
+        for fila in self.filas[1:]:
+            topo.extend(fila)
+            fila.clear()
+        self.mapa_niveis = 1 if topo else 0
+        self.usados = 0
+        self.proximo_boost = (relogio // self.periodo_boost + 1) * self.periodo_boost
+
+    def on_ready(self, tarefa):
+        nivel = self.nivel(tarefa)
+        self.filas[nivel].append(tarefa)
+        self.mapa_niveis |= 1 << nivel
+
+    def on_exit(self, tarefa):
+        self.niveis.pop(tarefa.id, None)
+
+    def on_tick(self, tarefa, relogio):
+        if self.periodo_boost and relogio >= self.proximo_boost:
+            self._boost(relogio)
+        self.usados += 1
+        nivel = self.nivel(tarefa)
+        if self.usados < self.quanta[nivel]:
+            return False
+        self.niveis[tarefa.id] = (min(nivel + 1, len(self.quanta) - 1), self.geracao)
+        return True
+
+    def pick_next(self, tarefa_atual, mudanca_contexto_obrigatoria):
+        if tarefa_atual:
+            # Sem troca obrigatória só um nível mais alto preempta; com ela, o mesmo nível também
+            limite = self.nivel(tarefa_atual) - (0 if mudanca_contexto_obrigatoria else 1)
+            if not self.mapa_niveis or self._mais_alto() > limite:
+                if mudanca_contexto_obrigatoria: self.usados = 0
+                return tarefa_atual, False
+        elif not self.mapa_niveis:
+            return None, False
+        self.usados = 0
+        return self._retirar(self._mais_alto()), False
+
+    def proximo_despertar(self, relogio):
+        # on_tick só vê a tarefa que continua executando; aqui o boost não se perde
+        # quando só passam tarefas curtas, e o core consulta de novo no tick do boost
+        if not self.periodo_boost: return None
+        if relogio >= self.proximo_boost:
+            self._boost(relogio)
+        return self.proximo_boost
+
+# Pesos do CFS do Linux por nice (-20..19); nice 0 pesa 1024
+PESOS_NICE = [
+    88761, 71755, 56483, 46273, 36291, 29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906, 3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423, 335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45, 36, 29, 23, 18, 15,
+]
+PESO_NICE_0 = 1024
+UNIDADE_VRUNTIME = 1 << 20   # vruntime de um tick executado com peso 1024 (inteiro: sem erro de arredondamento)
+FATOR_LATENCIA_CFS = 8       # latência alvo padrão = 8 x granularidade mínima (6ms / 0.75ms no Linux)
+
+def peso_cfs(tarefa):
+    """Maior prioridade = nice menor = peso maior. Prioridade 0 equivale a nice 0."""
+    nice = min(19, max(-20, -tarefa.prioridade))
+    return PESOS_NICE[nice + 20]
+
+class CFS(EscalonadorIncremental):
+    """
+    Escalonador justo no estilo do CFS do Linux, pela interface incremental.
+
+    Cada tarefa acumula vruntime = ticks executados * 1024 / peso, com o peso
+    vindo da prioridade (tabela de nice do Linux). Os prontos ficam em um heap
+    ordenado por (vruntime, ordem de chegada): inserir e retirar a de menor
+    vruntime custam O(log n), e o peso total dos executáveis é mantido a cada
+    evento, sem varrer a fila. Como o core também não varre os prontos de um
+    escalonador incremental, o tick inteiro fica O(log n) (veja escala.py).
+
+    - Fatia ideal = período * peso / peso total, com período = max(latencia,
+      executáveis * granularidade); nunca menor que a granularidade mínima.
+    - A tarefa atual só é preemptada depois da granularidade mínima, ao passar
+      da fatia ideal com alguém de vruntime menor esperando.
+    - Quem acorda (ingresso, E/S, mutex) preempta se o seu vruntime for menor
+      que o da atual por mais que a granularidade de despertar.
+    - Tarefas novas começam no min_vruntime; quem volta de um bloqueio recebe
+      no máximo meia latência de crédito, para não monopolizar a CPU.
+    """
+    usa_duracao = False
+
+    def __init__(self, granularidade=1, latencia=None):
+        self.granularidade = max(1, int(granularidade))
+        self.latencia = max(self.granularidade, int(latencia if latencia is not None
+                                                     else FATOR_LATENCIA_CFS * self.granularidade))
+        self.prontos = []          # heap de (vruntime, sequência, tarefa)
+        self.sequencia = 0
+        self.vruntime = {}         # tarefa_id -> vruntime
+        self.min_vruntime = 0
+        self.peso_total = 0        # prontos + a atual
+        self.dormindo = set()      # bloqueadas: voltam por on_ready como despertar
+        self.atual = None
+        self.executado_contabilizado = 0
+        self.executado_na_fatia = 0
+
+    def _contabilizar(self, tarefa):
+        """Soma ao vruntime da atual os ticks executados desde a última contabilização."""
+        if tarefa is not self.atual: return
+        delta = tarefa.tempo_executado - self.executado_contabilizado
+        if delta <= 0: return
+        self.executado_contabilizado = tarefa.tempo_executado
+        self.executado_na_fatia += delta
+        self.vruntime[tarefa.id] += delta * UNIDADE_VRUNTIME * PESO_NICE_0 // peso_cfs(tarefa)
+        self._atualizar_min_vruntime()
+
+    def _atualizar_min_vruntime(self):
+        candidatos = [self.prontos[0][0]] if self.prontos else []
+        if self.atual: candidatos.append(self.vruntime[self.atual.id])
+        if candidatos:
+            self.min_vruntime = max(self.min_vruntime, min(candidatos))
+
+    def _fatia_ideal(self, tarefa):
+        executaveis = len(self.prontos) + (1 if self.atual else 0)
+        periodo = max(self.latencia, executaveis * self.granularidade)
+        return max(self.granularidade, periodo * peso_cfs(tarefa) // max(1, self.peso_total))
+
+    def _despachar(self, tarefa):
+        self.atual = tarefa
+        self.executado_contabilizado = tarefa.tempo_executado if tarefa else 0
+        self.executado_na_fatia = 0
+
+    def _sair_da_cpu(self, tarefa):
+        self._contabilizar(tarefa)
+        if tarefa is self.atual:
+            self.peso_total -= peso_cfs(tarefa)
+            self.atual = None
+
+    def on_ready(self, tarefa):
+        if tarefa.id not in self.vruntime:
+            self.vruntime[tarefa.id] = self.min_vruntime
+        elif tarefa.id in self.dormindo:
+            self.dormindo.discard(tarefa.id)
+            credito = self.latencia * UNIDADE_VRUNTIME // 2
+            self.vruntime[tarefa.id] = max(self.vruntime[tarefa.id], self.min_vruntime - credito)
+        # Preemptada: já saiu do peso total em pick_next e mantém o vruntime
+        self.peso_total += peso_cfs(tarefa)
+        heapq.heappush(self.prontos, (self.vruntime[tarefa.id], self.sequencia, tarefa))
+        self.sequencia += 1
+
+    def on_block(self, tarefa):
+        self._sair_da_cpu(tarefa)
+        self.dormindo.add(tarefa.id)
+
+    def on_exit(self, tarefa):
+        self._sair_da_cpu(tarefa)
+        self.vruntime.pop(tarefa.id, None)
+        self.dormindo.discard(tarefa.id)
+
+    def on_tick(self, tarefa, relogio):
+        self._contabilizar(tarefa)
+        if not self.prontos or self.executado_na_fatia < self.granularidade:
+            return False
+        return (self.executado_na_fatia >= self._fatia_ideal(tarefa) and
+                self.prontos[0][0] < self.vruntime[tarefa.id])
+
+    def pick_next(self, tarefa_atual, mudanca_contexto_obrigatoria):
+        if tarefa_atual:
+            self._contabilizar(tarefa_atual)
+            if not self.prontos:
+                if mudanca_contexto_obrigatoria: self._despachar(tarefa_atual)
+                return tarefa_atual, False
+            vruntime_atual = self.vruntime[tarefa_atual.id]
+            if mudanca_contexto_obrigatoria:
+                troca = self.prontos[0][0] < vruntime_atual
+            else:
+                troca = self.prontos[0][0] + self.granularidade * UNIDADE_VRUNTIME < vruntime_atual
+            if not troca:
+                if mudanca_contexto_obrigatoria: self._despachar(tarefa_atual)
+                return tarefa_atual, False
+            # A atual volta aos prontos pelo on_ready que o core chama em seguida
+            self._sair_da_cpu(tarefa_atual)
+        elif not self.prontos:
+            return None, False
+        _, _, escolhida = heapq.heappop(self.prontos)
+        self._despachar(escolhida)
+        self._atualizar_min_vruntime()
+        return escolhida, False
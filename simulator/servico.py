@@ -0,0 +1,377 @@
+"""
+Serviço local de simulação: HTTP mínimo sobre asyncio (localhost ou socket Unix).
+
+    POST   /simulacoes[?imagem=1&semente=n]   corpo = config no formato do .txt -> {"id", "estado"}
+    GET    /simulacoes/<id>                   estado, métricas e intervalos
+    GET    /simulacoes/<id>/imagem            PNG do Gantt (se pedido no POST)
+    DELETE /simulacoes/<id>                   cancela (na fila ou em execução)
+    GET    /simulacoes                        lista resumida dos trabalhos
+
+Os trabalhos esperam em uma fila limitada e são executados por um número fixo
+de processos de trabalho que já importaram o simulador, o Matplotlib e os
+plugins; cada pedido paga só a simulação. Uso: python -m simulator.servico --help
+"""
+import io
+import os
+import sys
+import json
+import asyncio
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+from itertools import count
+from urllib.parse import urlsplit, parse_qs
+from simulator.parser import carregar_configuracao_arquivo, carregar_plugins
+from simulator.plugins import DIRETORIO_PLUGINS_PADRAO
+from simulator.metricas import calcular_metricas, extrair_intervalos
+from simulator.vetorizado import motivo_inelegivel, simular_simulador, LIMITE_TICKS_GANTT
+
+HOST_PADRAO = '127.0.0.1'
+PORTA_PADRAO = 8765
+LIMITE_FILA_PADRAO = 64        # trabalhos esperando; acima disso o POST responde 503
+LIMITE_HISTORICO = 1000        # trabalhos encerrados mantidos para consulta
+TAMANHO_MAX_CORPO = 64 * 1024 * 1024
+
+# Estados de um trabalho
+NA_FILA, EXECUTANDO, CONCLUIDA, ERRO, CANCELADA = 'NA_FILA', 'EXECUTANDO', 'CONCLUIDA', 'ERRO', 'CANCELADA'
+ENCERRADOS = (CONCLUIDA, ERRO, CANCELADA)
+
+MODULOS_PRE_CARREGADOS = ['simulator.parser', 'simulator.metricas', 'simulator.vetorizado', 'simulator.gantt']
+
+# --- Processo de trabalho ---
+
+def executar_simulacao(texto_config, plugins=None, semente=None, com_imagem=False):
+    """
+    Roda uma carga (texto no formato do config) até o fim, como o Modo Completo:
+    motor vetorizado quando a carga permite, senão tick a tick sem keyframes.
+    Retorna {'metricas', 'intervalos', 'tick_final', 'algoritmo', 'imagem' (bytes ou None)}.
+    Erros de configuração viram ValueError com a mensagem do parser.
+    """
+    from simulator.gantt import gerar_imagem_gantt
+    with tempfile.TemporaryDirectory(prefix='simulacao_') as pasta:
+        caminho = os.path.join(pasta, 'config.txt')
+        with open(caminho, 'w') as f:
+            f.write(texto_config)
+        saida = io.StringIO()
+        with contextlib.redirect_stdout(saida):
+            simulador = carregar_configuracao_arquivo(caminho, plugins, semente)
+        if simulador is None:
+            mensagem = saida.getvalue().strip().removeprefix('Erro:').strip()
+            raise ValueError(mensagem or "Configuração inválida.")
+        if simulador.nivel_registro == 'COMPLETO':
+            simulador.definir_nivel_registro('LINHA_DO_TEMPO')
+
+        if motivo_inelegivel(simulador) is None:
+            resultado = simular_simulador(simulador)
+            resultado.aplicar(simulador, com_gantt=com_imagem and resultado.makespan <= LIMITE_TICKS_GANTT)
+            metricas, intervalos = resultado.metricas(), resultado.intervalos()
+        else:
+            simulador.semear_random_global()
+            while not simulador.terminou():
+                simulador.tick()
+            metricas = calcular_metricas(simulador)
+            intervalos = None if simulador.so_metricas else extrair_intervalos(simulador.gantt_log)
+
+        imagem = None
+        if com_imagem and simulador.gantt_log and simulador.relogio_global <= LIMITE_TICKS_GANTT:
+            caminho_imagem = os.path.join(pasta, 'gantt.png')
+            gerar_imagem_gantt(simulador.gantt_log, simulador.tarefas, caminho_imagem,
+                               simulador.nome_algoritmo_config, simulador.bloqueio_log,
+                               simulador.mutex_event_log, simulador.io_log, simulador.semente)
+            with open(caminho_imagem, 'rb') as f:
+                imagem = f.read()
+
+    return {
+        'metricas': metricas,
+        'intervalos': [list(i) for i in intervalos] if intervalos is not None else None,
+        'tick_final': simulador.relogio_global - 1,
+        'algoritmo': simulador.nome_algoritmo_config,
+        'semente': simulador.semente,
+        'imagem': imagem,
+    }
+
+def _laco_trabalhador(conexao, diretorio_plugins):
+    """Processo de trabalho: carrega os plugins uma vez e atende pedidos até receber None."""
+    import matplotlib
+    matplotlib.use('Agg')
+    plugins = carregar_plugins(diretorio_plugins) if diretorio_plugins and os.path.isdir(diretorio_plugins) else {}
+    while True:
+        try:
+            pedido = conexao.recv()
+        except EOFError:
+            return
+        if pedido is None: return
+        texto_config, semente, com_imagem = pedido
+        try:
+            conexao.send(('ok', executar_simulacao(texto_config, plugins, semente, com_imagem)))
+        except Exception as e:
+            conexao.send(('erro', str(e) or type(e).__name__))
+
+def _contexto_servico():
+    # forkserver: processos novos (inclusive os que substituem um cancelado) saem de um
+    # servidor que já importou tudo, sem herdar as threads do laço asyncio
+    metodos = multiprocessing.get_all_start_methods()
+    if 'forkserver' in metodos:
+        contexto = multiprocessing.get_context('forkserver')
+        contexto.set_forkserver_preload(MODULOS_PRE_CARREGADOS)
+        return contexto
+    return multiprocessing.get_context('spawn')
+
+class Trabalhador:
+    """Um processo de trabalho e a ponta da conexão com ele."""
+    def __init__(self, contexto, diretorio_plugins):
+        self.conexao, ponta = contexto.Pipe()
+        self.processo = contexto.Process(target=_laco_trabalhador, args=(ponta, diretorio_plugins), daemon=True)
+        self.processo.start()
+        ponta.close()
+
+    def executar(self, pedido):
+        """Bloqueante (roda em uma thread): envia o pedido e espera a resposta."""
+        self.conexao.send(pedido)
+        return self.conexao.recv()
+
+    def encerrar(self, forcar=False):
+        if forcar:
+            self.processo.terminate()
+        else:
+            with contextlib.suppress(OSError):
+                self.conexao.send(None)
+        self.processo.join(timeout=5)
+        self.conexao.close()
+
+# --- Trabalhos e fila ---
+
+class Trabalho:
+    def __init__(self, id, texto_config, semente, com_imagem):
+        self.id = id
+        self.texto_config = texto_config
+        self.semente = semente
+        self.com_imagem = com_imagem
+        self.estado = NA_FILA
+        self.resultado = None
+        self.erro = None
+
+    def resumo(self, detalhes=False):
+        dados = {'id': self.id, 'estado': self.estado}
+        if self.erro: dados['erro'] = self.erro
+        if self.resultado:
+            dados['algoritmo'] = self.resultado['algoritmo']
+            dados['tem_imagem'] = self.resultado['imagem'] is not None
+            if detalhes:
+                dados.update({campo: self.resultado[campo]
+                              for campo in ('semente', 'tick_final', 'metricas', 'intervalos')})
+        return dados
+
+class ServicoSimulacao:
+    """
+    Fila (asyncio.Queue) atendida por 'processos' tarefas asyncio, cada uma dona
+    de um processo de trabalho. O limite conta só os trabalhos que ainda esperam:
+    cancelar um trabalho na fila o marca e libera a vaga na hora (o atendente o
+    descarta ao retirá-lo). Cancelar um em execução encerra o processo, que é
+    substituído por um novo.
+    """
+    def __init__(self, processos=None, diretorio_plugins=DIRETORIO_PLUGINS_PADRAO, limite_fila=LIMITE_FILA_PADRAO):
+        self.processos = max(1, processos or os.cpu_count() or 1)
+        self.diretorio_plugins = diretorio_plugins
+        self.limite_fila = limite_fila
+        self.trabalhos = {}
+        self.ids = count(1)
+        self.fila = None
+        self.esperando = 0        # trabalhos na fila não cancelados (é o que limite_fila conta)
+        self.contexto = None
+        self.em_execucao = {}     # trabalho_id -> Trabalhador
+        self.atendentes = []
+
+    async def iniciar(self):
+        self.fila = asyncio.Queue()
+        self.contexto = _contexto_servico()
+        self.atendentes = [asyncio.create_task(self._atender()) for _ in range(self.processos)]
+
+    async def parar(self):
+        for atendente in self.atendentes:
+            atendente.cancel()
+        await asyncio.gather(*self.atendentes, return_exceptions=True)
+
+    def enviar(self, texto_config, semente=None, com_imagem=False):
+        """Enfileira uma carga. Retorna o Trabalho ou None se a fila estiver cheia."""
+        if self.esperando >= self.limite_fila: return None
+        trabalho = Trabalho(str(next(self.ids)), texto_config, semente, com_imagem)
+        self.fila.put_nowait(trabalho)
+        self.esperando += 1
+        self.trabalhos[trabalho.id] = trabalho
+        self._limpar_historico()
+        return trabalho
+
+    def cancelar(self, trabalho_id):
+        trabalho = self.trabalhos.get(trabalho_id)
+        if trabalho is None or trabalho.estado in ENCERRADOS: return trabalho
+        if trabalho.estado == NA_FILA:
+            self.esperando -= 1
+            trabalho.texto_config = None
+        trabalho.estado = CANCELADA
+        trabalhador = self.em_execucao.get(trabalho_id)
+        if trabalhador:
+            # A thread que espera a resposta recebe EOFError; se a resposta já tinha
+            # chegado, _atender vê o trabalho CANCELADA e troca o processo do mesmo jeito
+            trabalhador.processo.terminate()
+        return trabalho
+
+    def _limpar_historico(self):
+        encerrados = [t.id for t in self.trabalhos.values() if t.estado in ENCERRADOS]
+        for trabalho_id in encerrados[:max(0, len(encerrados) - LIMITE_HISTORICO)]:
+            del self.trabalhos[trabalho_id]
+
+    async def _atender(self):
+        trabalhador = Trabalhador(self.contexto, self.diretorio_plugins)
+        try:
+            while True:
+                trabalho = await self.fila.get()
+                if trabalho.estado == CANCELADA: continue
+                self.esperando -= 1
+                trabalho.estado = EXECUTANDO
+                self.em_execucao[trabalho.id] = trabalhador
+                try:
+                    situacao, dados = await asyncio.to_thread(
+                        trabalhador.executar, (trabalho.texto_config, trabalho.semente, trabalho.com_imagem))
+                except (EOFError, OSError):
+                    # Processo encerrado (cancelamento ou falha): substitui por um novo
+                    trabalhador.encerrar(forcar=True)
+                    trabalhador = Trabalhador(self.contexto, self.diretorio_plugins)
+                    if trabalho.estado != CANCELADA:
+                        trabalho.estado, trabalho.erro = ERRO, "O processo de trabalho terminou inesperadamente."
+                    continue
+                finally:
+                    self.em_execucao.pop(trabalho.id, None)
+                if trabalho.estado == CANCELADA:
+                    # Cancelado depois da resposta: o processo já recebeu terminate()
+                    trabalhador.encerrar(forcar=True)
+                    trabalhador = Trabalhador(self.contexto, self.diretorio_plugins)
+                    continue
+                if situacao == 'ok':
+                    trabalho.estado, trabalho.resultado = CONCLUIDA, dados
+                else:
+                    trabalho.estado, trabalho.erro = ERRO, dados
+                trabalho.texto_config = None
+        finally:
+            trabalhador.encerrar(forcar=True)
+
+# --- HTTP ---
+
+MENSAGENS_HTTP = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found',
+                  405: 'Method Not Allowed', 413: 'Payload Too Large', 503: 'Service Unavailable'}
+
+async def _responder(writer, status, corpo, tipo='application/json; charset=utf-8'):
+    if not isinstance(corpo, bytes):
+        corpo = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+    cabecalho = (f"HTTP/1.1 {status} {MENSAGENS_HTTP.get(status, '')}\r\n"
+                 f"Content-Type: {tipo}\r\nContent-Length: {len(corpo)}\r\nConnection: close\r\n\r\n")
+    writer.write(cabecalho.encode('latin-1') + corpo)
+    await writer.drain()
+
+async def _ler_requisicao(reader):
+    """Retorna (metodo, caminho, parametros, corpo) ou None se a conexão fechou."""
+    linha = await reader.readline()
+    if not linha: return None
+    metodo, alvo, _ = linha.decode('latin-1').split(' ', 2)
+    cabecalhos = {}
+    while True:
+        linha = await reader.readline()
+        if linha in (b'\r\n', b'\n', b''): break
+        chave, _, valor = linha.decode('latin-1').partition(':')
+        cabecalhos[chave.strip().lower()] = valor.strip()
+    tamanho = int(cabecalhos.get('content-length', 0))
+    if tamanho > TAMANHO_MAX_CORPO:
+        raise OverflowError
+    corpo = await reader.readexactly(tamanho) if tamanho else b''
+    url = urlsplit(alvo)
+    return metodo.upper(), url.path.rstrip('/'), parse_qs(url.query), corpo
+
+def _verdadeiro(parametros, nome):
+    return parametros.get(nome, ['0'])[0].lower() in ('1', 'sim', 's', 'true')
+
+async def _rotear(servico, metodo, caminho, parametros, corpo):
+    """Retorna (status, corpo, tipo)."""
+    partes = [p for p in caminho.split('/') if p]
+    if not partes or partes[0] != 'simulacoes':
+        return 404, {'erro': 'Rota desconhecida.'}, None
+
+    if len(partes) == 1:
+        if metodo == 'GET':
+            return 200, [t.resumo() for t in servico.trabalhos.values()], None
+        if metodo != 'POST':
+            return 405, {'erro': 'Use GET ou POST em /simulacoes.'}, None
+        try:
+            semente = int(parametros['semente'][0]) if 'semente' in parametros else None
+            texto = corpo.decode('utf-8')
+        except (ValueError, UnicodeDecodeError):
+            return 400, {'erro': 'Semente ou corpo inválido (o corpo é o config em UTF-8).'}, None
+        trabalho = servico.enviar(texto, semente, _verdadeiro(parametros, 'imagem'))
+        if trabalho is None:
+            return 503, {'erro': f'Fila cheia ({servico.limite_fila} trabalhos esperando).'}, None
+        return 202, trabalho.resumo(), None
+
+    trabalho = servico.trabalhos.get(partes[1])
+    if trabalho is None:
+        return 404, {'erro': f"Trabalho '{partes[1]}' não encontrado."}, None
+    if len(partes) == 3 and partes[2] == 'imagem' and metodo == 'GET':
+        if not trabalho.resultado or trabalho.resultado['imagem'] is None:
+            return 404, {'erro': 'Sem imagem para este trabalho.'}, None
+        return 200, trabalho.resultado['imagem'], 'image/png'
+    if len(partes) == 2 and metodo == 'GET':
+        return 200, trabalho.resumo(detalhes=True), None
+    if len(partes) == 2 and metodo == 'DELETE':
+        return 200, servico.cancelar(trabalho.id).resumo(), None
+    return 405, {'erro': 'Método não suportado nesta rota.'}, None
+
+def criar_atendimento(servico):
+    async def atender(reader, writer):
+        try:
+            requisicao = await _ler_requisicao(reader)
+            if requisicao is None: return
+            status, corpo, tipo = await _rotear(servico, *requisicao)
+            if tipo: await _responder(writer, status, corpo, tipo)
+            else: await _responder(writer, status, corpo)
+        except OverflowError:
+            await _responder(writer, 413, {'erro': 'Corpo grande demais.'})
+        except (ValueError, asyncio.IncompleteReadError):
+            await _responder(writer, 400, {'erro': 'Requisição HTTP inválida.'})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    return atender
+
+async def servir(host=HOST_PADRAO, porta=PORTA_PADRAO, socket_unix=None, **opcoes):
+    servico = ServicoSimulacao(**opcoes)
+    await servico.iniciar()
+    if socket_unix:
+        servidor = await asyncio.start_unix_server(criar_atendimento(servico), path=socket_unix)
+        endereco = socket_unix
+    else:
+        servidor = await asyncio.start_server(criar_atendimento(servico), host, porta)
+        endereco = f"http://{host}:{porta}"
+    print(f"Serviço de simulação em {endereco} ({servico.processos} processos de trabalho).")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await servico.parar()
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Serviço local de simulação (HTTP sobre asyncio)")
+    parser.add_argument('--host', default=HOST_PADRAO)
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO)
+    parser.add_argument('--socket', dest='socket_unix', default=None, help="Caminho de um socket Unix (em vez de TCP)")
+    parser.add_argument('--processos', type=int, default=None, help="Processos de trabalho (padrão: CPUs)")
+    parser.add_argument('--plugins', default=DIRETORIO_PLUGINS_PADRAO, help="Pasta de plugins carregada por processo")
+    parser.add_argument('--fila', type=int, default=LIMITE_FILA_PADRAO, help="Máximo de trabalhos esperando")
+    args = parser.parse_args(argumentos)
+    try:
+        asyncio.run(servir(args.host, args.porta, args.socket_unix, processos=args.processos,
+                           diretorio_plugins=args.plugins, limite_fila=args.fila))
+    except KeyboardInterrupt:
+        print("\nServiço encerrado.", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
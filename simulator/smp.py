@@ -0,0 +1,225 @@
+from simulator.core import Simulator, TaskState, INTERVALO_KEYFRAME_PADRAO, SEMENTE_PADRAO
+from simulator.schedulers import suporta_smp
+
+def _exigir_decidir(escalonador):
+    if not suporta_smp(escalonador):
+        raise ValueError(f"{type(escalonador).__name__} só implementa a interface incremental; use CPUS=1.")
+
+class SimuladorSMP(Simulator):
+    """
+    Simulação com N CPUs. Cada CPU tem o seu slot de execução e a fila de prontos
+    pode ser global (compartilhada) ou local por CPU, com roubo de trabalho opcional.
+
+    Mutex, E/S e Banqueiro continuam globais: dentro de um tick as CPUs são
+    processadas em ordem (CPU0, CPU1, ...), então o estado compartilhado nunca
+    é visto pela metade. Com 1 CPU e fila global a linha do tempo é a mesma do
+    Simulator de CPU única.
+
+    Cada CPU decide sobre a sua própria lista de candidatas, então aqui o
+    escalonador é sempre chamado por decidir(); os eventos da interface
+    incremental não são emitidos.
+    """
+    def __init__(self, escalonador, quantum, num_cpus, fila_global=True, roubo_trabalho=False,
+                 intervalo_keyframe=INTERVALO_KEYFRAME_PADRAO, semente=SEMENTE_PADRAO):
+        _exigir_decidir(escalonador)
+        super().__init__(escalonador, quantum, intervalo_keyframe, semente)
+        self.num_cpus = int(num_cpus)
+        self.fila_global = fila_global
+        self.roubo_trabalho = roubo_trabalho and not fila_global
+        self.cpus = [None] * self.num_cpus
+        self.filas_cpu = [[] for _ in range(self.num_cpus)]
+        self.migracoes = 0
+        self._cpus_com_chegada = set()
+
+    # --- Filas ---
+
+    def _pode_rodar(self, t, cpu):
+        return t.afinidade is None or cpu in t.afinidade
+
+    def _fila_da_cpu(self, cpu):
+        return self.fila_prontos if self.fila_global else self.filas_cpu[cpu]
+
+    def _escolher_fila_local(self, t):
+        """Prefere a última CPU da tarefa (cache quente); senão a CPU permitida menos carregada."""
+        permitidas = [c for c in range(self.num_cpus) if self._pode_rodar(t, c)]
+        if t.ultima_cpu in permitidas:
+            return t.ultima_cpu
+        return min(permitidas, key=lambda c: (len(self.filas_cpu[c]) + (self.cpus[c] is not None), c))
+
+    def _enfileirar_pronta(self, t):
+        if self.fila_global:
+            self.fila_prontos.append(t)
+            self._cpus_com_chegada.update(range(self.num_cpus))
+        else:
+            cpu = self._escolher_fila_local(t)
+            self.filas_cpu[cpu].append(t)
+            self._cpus_com_chegada.add(cpu)
+
+    def _avisar_saida(self, t):
+        pass
+
+    def _roubar_trabalho(self, cpu):
+        """CPU ociosa e sem fila: pega a tarefa mais recente da fila local mais cheia."""
+        vitimas = sorted(range(self.num_cpus), key=lambda c: -len(self.filas_cpu[c]))
+        for vitima in vitimas:
+            if vitima == cpu: continue
+            fila = self.filas_cpu[vitima]
+            for i in range(len(fila) - 1, -1, -1):
+                if self._pode_rodar(fila[i], cpu):
+                    t = fila.pop(i)
+                    self.filas_cpu[cpu].append(t)
+                    return f" [CPU{cpu} Roubou {t.id} da CPU{vitima}] "
+        return ""
+
+    # --- Tick ---
+
+    def _escalonar_cpu(self, cpu, mudanca_obrigatoria, tem_alpha):
+        """Chama o escalonador para uma CPU. Retorna (log, houve_sorteio)."""
+        log_cpu = ""
+        atual = self.cpus[cpu]
+        fila = self._fila_da_cpu(cpu)
+        if self.roubo_trabalho and atual is None and not fila:
+            log_cpu += self._roubar_trabalho(cpu)
+        candidatos = [t for t in fila if self._pode_rodar(t, cpu)] if self.fila_global else fila
+
+        self.scheduler_called_last_tick = True
+        # O escalonador pode ter sido trocado depois do construtor (ex.: na comparação)
+        _exigir_decidir(self.escalonador)
+        proxima_tarefa, houve_sorteio = self.escalonador.decidir(candidatos, atual, mudanca_obrigatoria)
+
+        if proxima_tarefa and tem_alpha:
+            proxima_tarefa.prioridade_dinamica = proxima_tarefa.prioridade
+
+        if houve_sorteio: log_cpu += f" [SORTEIO CPU{cpu}] "
+
+        if proxima_tarefa != atual:
+            if atual and atual.estado == TaskState.EXECUTANDO:
+                atual.estado = TaskState.PRONTA
+                atual.quantum_utilizado = 0
+                self.cpus[cpu] = None
+                self._enfileirar_pronta(atual)
+                log_cpu += f" [{atual.id} -> Prontos (CPU{cpu})] "
+
+            self.cpus[cpu] = proxima_tarefa
+            if proxima_tarefa:
+                if proxima_tarefa in fila:
+                    fila.remove(proxima_tarefa)
+                proxima_tarefa.estado = TaskState.EXECUTANDO
+                proxima_tarefa.quantum_utilizado = 0
+                if proxima_tarefa.ultima_cpu is not None and proxima_tarefa.ultima_cpu != cpu:
+                    proxima_tarefa.migracoes += 1
+                    self.migracoes += 1
+                    log_cpu += f" [{proxima_tarefa.id} Migrou CPU{proxima_tarefa.ultima_cpu}->CPU{cpu}] "
+                proxima_tarefa.ultima_cpu = cpu
+                log_cpu += f" [CPU{cpu} escolheu {proxima_tarefa.id}] "
+
+                log_acoes_nova, bloqueou_nova = self.processar_acoes_da_tarefa(proxima_tarefa)
+                log_cpu += log_acoes_nova
+                if bloqueou_nova:
+                    self.cpus[cpu] = None
+        return log_cpu, houve_sorteio
+
+    def tick(self):
+        self._registrar_keyframe()
+        self.scheduler_called_last_tick = False
+
+        # 1. e 2. Retornos de E/S e Ingressos (marcam as CPUs cujas filas mudaram)
+        self._cpus_com_chegada = set()
+        log_eventos_tick, _ = self._processar_chegadas()
+        reescalonar = set(self._cpus_com_chegada)
+
+        # Aging (cada fila só concorre com as CPUs que a atendem)
+        tem_alpha = hasattr(self.escalonador, 'alpha')
+        if self.fila_global:
+            filas = [(range(self.num_cpus), self.fila_prontos)]
+        else:
+            filas = [([cpu], self.filas_cpu[cpu]) for cpu in range(self.num_cpus)]
+        for cpus_da_fila, fila in filas:
+            for t in fila:
+                t.tempo_espera += 1
+                if not tem_alpha: continue
+                t.prioridade_dinamica += self.escalonador.alpha
+                for cpu in cpus_da_fila:
+                    atual = self.cpus[cpu]
+                    if atual and self._pode_rodar(t, cpu) and t.prioridade_dinamica > atual.prioridade_dinamica:
+                        reescalonar.add(cpu)
+                        log_eventos_tick += f" [Aging: {t.id} > {atual.id}] "
+
+        # 3. Ações das tarefas em execução, CPU a CPU
+        preemptar_quantum = [False] * self.num_cpus
+        for cpu in range(self.num_cpus):
+            t = self.cpus[cpu]
+            if t is None:
+                if self._fila_da_cpu(cpu) or self.roubo_trabalho:
+                    reescalonar.add(cpu)
+                continue
+
+            log_acoes, bloqueou = self.processar_acoes_da_tarefa(t)
+            log_eventos_tick += log_acoes
+            if bloqueou:
+                self.cpus[cpu] = None
+                reescalonar.add(cpu)
+            elif t.tempo_executado == t.duracao:
+                t.estado = TaskState.TERMINADA
+                t.tick_conclusao = self.relogio_global
+                self.tarefas_concluidas += 1
+                log_eventos_tick += f" [{t.id} Terminou (CPU{cpu})] "
+                log_eventos_tick += self.liberar_recursos_da_tarefa(t)
+                self.cpus[cpu] = None
+                reescalonar.add(cpu)
+            elif t.quantum_utilizado == self.quantum and self.escalonador.usar_quantum:
+                preemptar_quantum[cpu] = True
+                log_eventos_tick += f" [{t.id} Estourou Quantum (CPU{cpu})] "
+                reescalonar.add(cpu)
+
+        # 4. Escalonador, CPU a CPU
+        sorteios = [False] * self.num_cpus
+        for cpu in sorted(reescalonar):
+            log_cpu, sorteios[cpu] = self._escalonar_cpu(cpu, preemptar_quantum[cpu], tem_alpha)
+            log_eventos_tick += log_cpu
+
+        # LOGS DE ESTADO (Para o Gantt)
+        self._registrar_bloqueios()
+
+        for cpu in range(self.num_cpus):
+            t = self.cpus[cpu]
+            if t:
+                t.tempo_executado += 1
+                t.quantum_utilizado += 1
+                if self.so_metricas:
+                    self._contar_execucao(t, sorteios[cpu], cpu)
+                else:
+                    self.gantt_log.append({'tick': self.relogio_global, 'task_id': t.id, 'cor': t.cor,
+                                           'sorteio': sorteios[cpu], 'cpu': cpu})
+                log_eventos_tick += f" [{t.id} Executou (CPU{cpu})] "
+            elif not self.so_metricas:
+                self.gantt_log.append({'tick': self.relogio_global, 'task_id': 'idle', 'cor': '#FFFFFF',
+                                       'sorteio': False, 'cpu': cpu})
+
+        self.relogio_global += 1
+        self.ultimo_log = log_eventos_tick
+        return log_eventos_tick
+
+    def get_debug_info(self):
+        status_scheduler = "ATIVO" if self.scheduler_called_last_tick else "INATIVO"
+        header = f"--- [TICK: {self.relogio_global}] | ESCALONADOR: {status_scheduler} | CPUs: {self.num_cpus} ---"
+        log_info = f"EVENTOS DO ÚLTIMO TICK:\n >> {self.ultimo_log}"
+        exec_info = " | ".join(f"CPU{cpu}: [ {t.id if t else 'Nenhuma'} ]" for cpu, t in enumerate(self.cpus))
+
+        if self.fila_global:
+            fila_info = f"FILA DE PRONTOS (GLOBAL): {[t.id for t in self.fila_prontos]}"
+        else:
+            fila_info = "\n".join(f"FILA CPU{cpu}: {[t.id for t in fila]}" for cpu, fila in enumerate(self.filas_cpu))
+        fila_info += f"\nMIGRAÇÕES: {self.migracoes}"
+
+        if self.mutex_fila:
+            bloq_str = ", ".join([f"M{k}:{[t.id for t in v]}" for k,v in self.mutex_fila.items() if v])
+            if bloq_str: fila_info += f"\nBLOQUEADOS EM MUTEX: {bloq_str}"
+        if self.io_wait:
+            io_str = ", ".join([f"{tid}({rest}t)" for tid, rest in self.io_wait.items()])
+            fila_info += f"\nEM E/S (WAIT): {io_str}"
+
+        tasks_info = "\nESTADO DAS TAREFAS:\n" + "\n".join(
+            [t.to_debug_str() for t in self.tarefas if t.estado != TaskState.NOVA]
+        )
+        return "\n".join([header, log_info, exec_info, fila_info, tasks_info])
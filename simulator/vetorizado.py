@@ -0,0 +1,260 @@
+import heapq
+import random
+import numpy as np
+from simulator import analitico
+from simulator.core import Simulator, TaskState
+from simulator.registros import DestinoMemoria
+from simulator.schedulers import FIFO, SRTF, PriorityPreemptive, RoundRobin
+
+# Acima disso o Gantt tick a tick não é montado (a figura ficaria ilegível de qualquer forma)
+LIMITE_TICKS_GANTT = 20000
+# Acima disso o RR analítico só calcula conclusões e contagens, sem a lista de fatias
+LIMITE_INTERVALOS = 2_000_000
+
+class ResultadoVetorizado:
+    """
+    Linha do tempo calculada pelo motor vetorizado: conclusão de cada tarefa
+    (na ordem do arquivo) e os intervalos de execução em ordem de início,
+    os mesmos que extrair_intervalos() obteria do gantt_log do Simulator.
+    Os intervalos podem faltar (None) quando a carga é grande demais para listá-los;
+    nesse caso 'despachos' traz a contagem. 'ticks_sorteio' são os despachos
+    decididos por sorteio.
+    """
+    def __init__(self, ids, ingresso, duracao, conclusao, inicio_intervalos, duracao_intervalos, tarefa_intervalos,
+                 despachos=None, ticks_sorteio=()):
+        self.ids = ids
+        self.ingresso = ingresso
+        self.duracao = duracao
+        self.conclusao = conclusao
+        self.inicio_intervalos = inicio_intervalos
+        self.duracao_intervalos = duracao_intervalos
+        self.tarefa_intervalos = tarefa_intervalos  # índice em ids
+        self.despachos = len(inicio_intervalos) if despachos is None else despachos
+        self.ticks_sorteio = set(ticks_sorteio)
+        self.makespan = int(conclusao.max()) if len(conclusao) else 0
+
+    def intervalos(self):
+        """[(inicio, duracao, task_id)] como em metricas.extrair_intervalos, ou None se não foram calculados."""
+        if self.inicio_intervalos is None: return None
+        ids = self.ids
+        return [(inicio, duracao, ids[i]) for inicio, duracao, i in
+                zip(self.inicio_intervalos.tolist(), self.duracao_intervalos.tolist(), self.tarefa_intervalos.tolist())]
+
+    def metricas(self):
+        """Mesmo dicionário de metricas.calcular_metricas (sem ações não há bloqueios)."""
+        turnaround = self.conclusao - self.ingresso
+        espera = turnaround - self.duracao
+        por_tarefa = {}
+        for task_id, ing, fim, ta, exe, esp in zip(self.ids, self.ingresso.tolist(), self.conclusao.tolist(),
+                                                   turnaround.tolist(), self.duracao.tolist(), espera.tolist()):
+            por_tarefa[task_id] = {'ingresso': ing, 'conclusao': fim, 'turnaround': ta,
+                                   'executado': exe, 'bloqueado': 0, 'espera': esp}
+        qtd = len(self.ids)
+        ocupados = int(self.duracao.sum())
+        globais = {
+            'tarefas_concluidas': qtd,
+            'makespan': self.makespan,
+            'num_cpus': 1,
+            'ticks_ocupados': ocupados,
+            'utilizacao_cpu': ocupados / self.makespan if self.makespan else 0.0,
+            'despachos': self.despachos,
+            'sorteios': len(self.ticks_sorteio),
+            'espera_media': int(espera.sum()) / qtd if qtd else 0.0,
+            'turnaround_medio': int(turnaround.sum()) / qtd if qtd else 0.0,
+        }
+        return {'global': globais, 'tarefas': por_tarefa}
+
+    def gantt_log(self, cores):
+        """Expande os intervalos no gantt_log tick a tick do Simulator (inclui os ticks ociosos)."""
+        if self.inicio_intervalos is None: return []
+        log = []
+        tick = 0
+        for inicio, duracao, i in zip(self.inicio_intervalos.tolist(), self.duracao_intervalos.tolist(),
+                                      self.tarefa_intervalos.tolist()):
+            for t in range(tick, inicio):
+                log.append({'tick': t, 'task_id': 'idle', 'cor': '#FFFFFF', 'sorteio': False})
+            task_id, cor = self.ids[i], cores[i]
+            for t in range(inicio, inicio + duracao):
+                log.append({'tick': t, 'task_id': task_id, 'cor': cor, 'sorteio': t in self.ticks_sorteio})
+            tick = inicio + duracao
+        # No tick da última conclusão a CPU fica ociosa antes de a simulação parar
+        log.append({'tick': self.makespan, 'task_id': 'idle', 'cor': '#FFFFFF', 'sorteio': False})
+        return log
+
+    def aplicar(self, simulador, com_gantt=True):
+        """Deixa o Simulator no estado final, como se tivesse rodado até terminar."""
+        for t, fim in zip(simulador.tarefas, self.conclusao.tolist()):
+            t.estado = TaskState.TERMINADA
+            t.tempo_executado = t.duracao
+            t.tick_conclusao = fim
+            t.tempo_espera = fim - t.ingresso - t.duracao + 1
+        simulador.tarefas_concluidas = len(simulador.tarefas)
+        simulador.tarefa_executando = None
+        simulador.fila_prontos = []
+        simulador.relogio_global = self.makespan + 1
+        if com_gantt:
+            simulador.gantt_log = DestinoMemoria(self.gantt_log([t.cor for t in simulador.tarefas]))
+        simulador.ultimo_log = "Simulação concluída pelo motor vetorizado."
+
+def _fifo(ingresso, duracao, rng=None):
+    """
+    Sem preempção a ordem de execução é a ordem por (ingresso, duracao) e os
+    tempos saem da forma fechada de analitico.fim_fifo. Com rng, os empates de
+    (ingresso, duracao) são resolvidos pelos mesmos sorteios do Simulator; sem
+    rng ficam na ordem do arquivo.
+    """
+    ordem = np.lexsort((duracao, ingresso))
+    sorteados = []
+    if rng is not None:
+        ordem, sorteados = analitico.desempatar_fifo(ingresso, duracao, ordem, rng)
+    a = ingresso[ordem]
+    d = duracao[ordem]
+    fim = analitico.fim_fifo(a, d)
+    conclusao = np.empty_like(fim)
+    conclusao[ordem] = fim
+    inicios = fim - d
+    return conclusao, inicios, d, ordem, inicios[sorteados].tolist()
+
+def _preemptivo(a, d, prioridade, por_restante):
+    """
+    SRTF (por_restante=True) e Prioridade Preemptiva, dirigidos por eventos: só há
+    decisão em chegadas e conclusões. A tarefa atual só perde a CPU para uma chave
+    estritamente menor (no desempate ela vence por ser a atual).
+    Recebe as tarefas já ordenadas por (ingresso, duracao): o índice é o próprio
+    desempate, então cada chave do heap é um único inteiro.
+    """
+    n = len(a)
+    chegada = a.tolist()
+    restante = d.tolist()
+    if not por_restante:
+        # (-prioridade, índice) empacotado em um inteiro não negativo
+        fixa = ((int(prioridade.max()) - prioridade) * n + np.arange(n)).tolist()
+    conclusao = [0] * n
+    inicios, duracoes, tarefas = [], [], []
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    heap = []
+    prox = 0
+    t = 0
+    atual = -1
+    chave_atual = 0
+    inicio_atual = 0
+    while True:
+        if atual < 0:
+            if not heap:
+                if prox == n: break
+                t = max(t, chegada[prox])
+            while prox < n and chegada[prox] <= t:
+                heappush(heap, restante[prox] * n + prox if por_restante else fixa[prox])
+                prox += 1
+            chave_atual = heappop(heap)
+            atual = chave_atual % n
+            inicio_atual = t
+        else:
+            while prox < n and chegada[prox] <= t:
+                heappush(heap, restante[prox] * n + prox if por_restante else fixa[prox])
+                prox += 1
+            if por_restante:
+                chave_atual = restante[atual] * n + atual
+            if heap and heap[0] // n < chave_atual // n:
+                inicios.append(inicio_atual); duracoes.append(t - inicio_atual); tarefas.append(atual)
+                chave_atual = heapq.heapreplace(heap, chave_atual)
+                atual = chave_atual % n
+                inicio_atual = t
+
+        fim = t + restante[atual]
+        if prox == n or fim <= chegada[prox]:
+            restante[atual] = 0
+            conclusao[atual] = fim
+            inicios.append(inicio_atual); duracoes.append(fim - inicio_atual); tarefas.append(atual)
+            atual = -1
+            t = fim
+        else:
+            restante[atual] -= chegada[prox] - t
+            t = chegada[prox]
+    return conclusao, inicios, duracoes, tarefas
+
+def simular_vetorizado(algoritmo, quantum, ids, ingresso, duracao, prioridade=None, rng=None):
+    """
+    Simula uma carga sem ações (sem E/S e sem mutex) em uma CPU a partir de arrays.
+    algoritmo: 'FIFO', 'RR', 'SRTF' ou 'PRIORIDADEP' (RR com quantum <= 0 equivale ao FIFO).
+    No FIFO, rng (o gerador do escalonador) reproduz os sorteios de empate; os demais
+    pressupõem que não há empates de (ingresso, duracao) — veja motivo_inelegivel().
+    """
+    ingresso = np.asarray(ingresso, dtype=np.int64)
+    duracao = np.asarray(duracao, dtype=np.int64)
+    prioridade = np.zeros_like(ingresso) if prioridade is None else np.asarray(prioridade, dtype=np.int64)
+    algoritmo = algoritmo.upper()
+
+    if algoritmo == 'FIFO' or (algoritmo == 'RR' and quantum <= 0):
+        conclusao, inicios, duracoes, tarefas, ticks_sorteio = _fifo(ingresso, duracao, rng)
+        return ResultadoVetorizado(list(ids), ingresso, duracao, conclusao, inicios, duracoes, tarefas,
+                                   ticks_sorteio=ticks_sorteio)
+
+    # Os motores por eventos trabalham na ordem (ingresso, duracao) e voltam para a do arquivo no fim
+    ordem = np.lexsort((duracao, ingresso))
+    a, d = ingresso[ordem], duracao[ordem]
+    despachos = None
+    if algoritmo == 'RR':
+        conclusao, despachos, intervalos = analitico.round_robin(a, d, quantum)
+        if despachos <= LIMITE_INTERVALOS:
+            conclusao, despachos, intervalos = analitico.round_robin(a, d, quantum, com_intervalos=True)
+    elif algoritmo in ('SRTF', 'PRIORIDADEP'):
+        conclusao, *intervalos = _preemptivo(a, d, prioridade[ordem], algoritmo == 'SRTF')
+    else:
+        raise ValueError(f"Algoritmo '{algoritmo}' não suportado pelo motor vetorizado.")
+    conclusao_arquivo = np.empty(len(ordem), dtype=np.int64)
+    conclusao_arquivo[ordem] = conclusao
+    if intervalos is None:
+        return ResultadoVetorizado(list(ids), ingresso, duracao, conclusao_arquivo, None, None, None, despachos)
+    inicios, duracoes, tarefas = intervalos
+    return ResultadoVetorizado(list(ids), ingresso, duracao, conclusao_arquivo, np.array(inicios, dtype=np.int64),
+                               np.array(duracoes, dtype=np.int64), ordem[np.array(tarefas, dtype=np.int64)])
+
+# Classe do escalonador -> nome usado por simular_vetorizado (só as classes nativas, sem subclasses)
+_ALGORITMOS = {FIFO: 'FIFO', RoundRobin: 'RR', SRTF: 'SRTF', PriorityPreemptive: 'PRIORIDADEP'}
+
+def motivo_inelegivel(simulador):
+    """None se o motor vetorizado reproduz exatamente o Simulator; senão, o motivo."""
+    if type(simulador) is not Simulator:
+        return "modo SMP"
+    algoritmo = _ALGORITMOS.get(type(simulador.escalonador))
+    if algoritmo is None:
+        return f"algoritmo {type(simulador.escalonador).__name__}"
+    if simulador.relogio_global != 0:
+        return "simulação já iniciada"
+    # FIFO (e RR sem quantum) reproduz os sorteios de empate; os demais exigem chaves únicas
+    sorteia = algoritmo == 'FIFO' or (algoritmo == 'RR' and simulador.quantum <= 0)
+    chaves = set()
+    for t in simulador.tarefas:
+        if t.acoes:
+            return f"tarefa {t.id} tem ações (E/S ou mutex)"
+        if t.ingresso < 0 or t.duracao < 1:
+            return f"tarefa {t.id} com ingresso negativo ou duração nula"
+        if sorteia: continue
+        # Chaves repetidas podem empatar no desempate e exigir sorteio
+        chave = (t.ingresso, t.duracao, t.prioridade if algoritmo == 'PRIORIDADEP' else 0)
+        if chave in chaves:
+            return f"empate possível de ingresso/duração na tarefa {t.id}"
+        chaves.add(chave)
+    if sorteia and simulador.tarefas:
+        ingresso, duracao = _arrays(simulador.tarefas)[:2]
+        ordem = np.lexsort((duracao, ingresso))
+        if analitico.sorteios_necessarios_fifo(ingresso[ordem], duracao[ordem]) > analitico.LIMITE_SORTEIOS_EMULADOS:
+            return "empates demais para reproduzir os sorteios"
+    return None
+
+def _arrays(tarefas):
+    return tuple(np.fromiter((getattr(t, campo) for t in tarefas), dtype=np.int64, count=len(tarefas))
+                 for campo in ('ingresso', 'duracao', 'prioridade'))
+
+def simular_simulador(simulador):
+    """
+    Roda a carga de um Simulator elegível no motor vetorizado (não altera o Simulator).
+    Os sorteios usam uma cópia do gerador do escalonador, com o mesmo estado.
+    """
+    rng = random.Random()
+    rng.setstate(simulador.escalonador.rng.getstate())
+    ingresso, duracao, prioridade = _arrays(simulador.tarefas)
+    return simular_vetorizado(_ALGORITMOS[type(simulador.escalonador)], simulador.quantum,
+                              [t.id for t in simulador.tarefas], ingresso, duracao, prioridade, rng)